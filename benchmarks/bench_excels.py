@@ -0,0 +1,82 @@
+"""
+Benchmarks for reading and saving the Excel files
+"""
+import shutil
+
+import pytest
+
+import excels2vensim as e2v
+
+from conftest import make_subscripts, make_workbook, make_config
+
+
+@pytest.mark.parametrize("n_rows", [100, 1000, 10000])
+def bench_read_rows(benchmark, _tmp, n_rows):
+    file = _tmp / f"read_rows_{n_rows}.xlsx"
+    make_workbook(file, 1, n_rows, 20)
+
+    def read():
+        e2v.Excels.read(file)
+        e2v.Excels.close()
+
+    benchmark.pedantic(read, rounds=5)
+
+
+@pytest.mark.parametrize("n_sheets", [1, 10, 50])
+def bench_read_sheets(benchmark, _tmp, n_sheets):
+    file = _tmp / f"read_sheets_{n_sheets}.xlsx"
+    make_workbook(file, n_sheets, 200, 20)
+
+    def read():
+        e2v.Excels.read(file)
+        e2v.Excels.close()
+
+    benchmark.pedantic(read, rounds=5)
+
+
+@pytest.mark.parametrize("n_rows", [100, 1000, 10000])
+def bench_save_and_close(benchmark, _tmp, n_rows):
+    file = _tmp / f"save_{n_rows}.xlsx"
+    make_workbook(file, 1, n_rows, 20)
+
+    def setup():
+        e2v.Excels.read(file)
+
+    benchmark.pedantic(e2v.Excels.save_and_close, setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize("n_vars", [10, 100, 1000])
+def bench_execute_variables(benchmark, _tmp, n_vars):
+    original = _tmp / f"execute_{n_vars}_original.xlsx"
+    file = str(_tmp / f"execute_{n_vars}.xlsx")
+    make_workbook(original, 1, 100, 20)
+    e2v.Subscripts.set(make_subscripts(3, 5))
+    config = make_config(n_vars, ["dim0", "dim1", "dim2"], file, "Sheet0")
+
+    def setup():
+        shutil.copy2(original, file)
+
+    benchmark.pedantic(e2v.execute, args=(config,), setup=setup, rounds=3)
+
+
+@pytest.mark.parametrize("n_files", [1, 5, 20])
+def bench_execute_files(benchmark, _tmp, n_files):
+    originals, files = [], []
+    for i in range(n_files):
+        originals.append(_tmp / f"files_{n_files}_{i}_original.xlsx")
+        files.append(str(_tmp / f"files_{n_files}_{i}.xlsx"))
+        make_workbook(originals[-1], 1, 100, 20)
+
+    subscripts = make_subscripts(3, 5)
+    subscripts["files"] = [f"file{i}" for i in range(n_files)]
+    e2v.Subscripts.set(subscripts)
+    config = make_config(10, ["dim0", "dim1", "dim2"], None, "Sheet0")
+    for info in config.values():
+        info["dims"].append("files")
+        info["dimensions"]["files"] = ["file", files]
+
+    def setup():
+        for original, file in zip(originals, files):
+            shutil.copy2(original, file)
+
+    benchmark.pedantic(e2v.execute, args=(config,), setup=setup, rounds=3)
@@ -0,0 +1,86 @@
+"""
+Benchmarks for the planning of the cellranges and the equations
+"""
+import numpy as np
+import pytest
+
+import excels2vensim as e2v
+from excels2vensim.excels2vensim import _create_object
+
+from conftest import make_subscripts, make_config
+
+
+def _constants(dims, separated):
+    """
+    Constants object with two dimensions with step 1 and the given
+    number of separated dimensions.
+    """
+    dims = dims[:2+separated]
+    obj = e2v.Constants(
+        "var", dims, "B2", "", "", "inputs.xlsx", "Sheet0")
+    obj.add_dimension(dims[0], "row", 1)
+    obj.add_dimension(dims[1], "col", 1)
+    step = len(e2v.Subscripts.get(dims[0]))
+    for dim in dims[2:]:
+        obj.add_dimension(dim, "row", step)
+        step *= len(e2v.Subscripts.get(dim))
+    return obj
+
+
+def _reset_elements(obj):
+    obj.elements = {
+        'row': [np.array([obj.ref_row, obj.ref_row], dtype=int)],
+        'col': [np.array([obj.ref_col, obj.ref_col], dtype=int)],
+        'subs': [[]],
+        'sheet': [[]],
+        'file': [[]],
+        'cellname': [obj.base_name]
+    }
+    return (obj, []), {}
+
+
+@pytest.mark.parametrize("cardinality", [5, 50, 500])
+def bench_build_boxes_cardinality(benchmark, cardinality):
+    e2v.Subscripts.set(make_subscripts(3, cardinality))
+    obj = _constants(["dim0", "dim1", "dim2"], 1)
+
+    benchmark.pedantic(
+        lambda obj, visited: obj._build_boxes(visited),
+        setup=lambda: _reset_elements(obj), rounds=20)
+
+
+@pytest.mark.parametrize("separated", [1, 2, 3])
+def bench_build_boxes_dimensions(benchmark, separated):
+    e2v.Subscripts.set(make_subscripts(5, 10))
+    obj = _constants([f"dim{i}" for i in range(5)], separated)
+
+    benchmark.pedantic(
+        lambda obj, visited: obj._build_boxes(visited),
+        setup=lambda: _reset_elements(obj), rounds=20)
+
+
+@pytest.mark.parametrize("cardinality", [5, 50, 500])
+@pytest.mark.parametrize("var_type", ["constants", "data", "lookups"])
+def bench_get_vensim(benchmark, var_type, cardinality):
+    e2v.Subscripts.set(make_subscripts(3, cardinality))
+    info = make_config(
+        1, ["dim0", "dim1", "dim2"], "inputs.xlsx", "Sheet0",
+        var_type)["var0"]
+    obj = _create_object("var0", info)
+
+    benchmark(obj.get_vensim)
+
+
+@pytest.mark.parametrize("n_vars", [10, 100, 1000])
+def bench_plan_variables(benchmark, n_vars):
+    e2v.Subscripts.set(make_subscripts(3, 10))
+    config = make_config(
+        n_vars, ["dim0", "dim1", "dim2"], "inputs.xlsx", "Sheet0")
+
+    def plan():
+        for var, info in config.items():
+            obj = _create_object(var, info)
+            obj.get_vensim()
+            obj._get_cellranges()
+
+    benchmark(plan)
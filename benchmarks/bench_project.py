@@ -0,0 +1,55 @@
+"""
+Benchmarks with synthetic projects
+"""
+import os
+import shutil
+
+import pytest
+
+import excels2vensim as e2v
+from excels2vensim.excels2vensim import _create_object
+
+
+@pytest.mark.parametrize("n_vars", [100, 1000, 10000])
+def bench_project_validate(benchmark, monkeypatch, _projects, n_vars):
+    paths = _projects(n_vars)
+    e2v.Subscripts.read(paths['model'])
+    monkeypatch.chdir(paths['model'].parent)
+    config = list(e2v.read_config(paths['config']))
+
+    benchmark(e2v.validate_config, config)
+
+
+@pytest.mark.parametrize("n_vars", [100, 1000, 10000])
+def bench_project_plan(benchmark, _projects, n_vars):
+    paths = _projects(n_vars)
+    e2v.Subscripts.read(paths['model'])
+    config = list(e2v.read_config(paths['config']))
+
+    def plan():
+        for var, info in config:
+            obj = _create_object(var, info)
+            obj.get_vensim()
+            obj._get_cellranges()
+
+    benchmark(plan)
+
+
+@pytest.mark.parametrize("n_vars", [100, 1000])
+def bench_project_execute(benchmark, monkeypatch, _tmp, _projects,
+                          n_vars):
+    paths = _projects(n_vars)
+    e2v.Subscripts.read(paths['model'])
+    # work in a copy to keep the original files without cellranges
+    directory = _tmp / f"project_{n_vars}_run"
+    # restore the working directory after the benchmark
+    monkeypatch.chdir(_tmp)
+
+    def setup():
+        shutil.rmtree(directory, ignore_errors=True)
+        shutil.copytree(paths['model'].parent, directory)
+        os.chdir(directory)
+
+    benchmark.pedantic(
+        e2v.load_from_json, args=(paths['config'].name,), setup=setup,
+        rounds=3)
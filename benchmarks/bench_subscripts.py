@@ -0,0 +1,39 @@
+"""
+Benchmarks for reading the subscripts
+"""
+import json
+
+import pytest
+
+import excels2vensim as e2v
+from excels2vensim.utils.subscript_parser import _translate_vensim
+from excels2vensim.utils.generator import write_mdl
+
+from conftest import make_subscripts
+
+
+@pytest.mark.parametrize("n_ranges", [10, 100, 1000])
+def bench_translate_vensim(benchmark, _tmp, n_ranges):
+    mdl_file = _tmp / f"subscripts_{n_ranges}.mdl"
+    write_mdl(mdl_file, make_subscripts(n_ranges, 10))
+
+    subscripts = benchmark(_translate_vensim, mdl_file)
+
+    assert len(subscripts) == n_ranges
+
+
+@pytest.mark.parametrize("cardinality", [10, 100, 1000])
+def bench_translate_vensim_cardinality(benchmark, _tmp, cardinality):
+    mdl_file = _tmp / f"subscripts_c{cardinality}.mdl"
+    write_mdl(mdl_file, make_subscripts(10, cardinality))
+
+    benchmark(_translate_vensim, mdl_file)
+
+
+@pytest.mark.parametrize("n_ranges", [10, 100, 1000])
+def bench_read_json(benchmark, _tmp, n_ranges):
+    json_file = _tmp / f"subscripts_{n_ranges}.json"
+    with open(json_file, "w") as file:
+        json.dump(make_subscripts(n_ranges, 10), file)
+
+    benchmark(e2v.Subscripts.read, json_file)
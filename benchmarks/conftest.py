@@ -0,0 +1,97 @@
+import pytest
+from openpyxl import Workbook
+
+import excels2vensim as e2v
+from excels2vensim.utils.generator import generate_project
+
+
+def make_subscripts(n_ranges, cardinality):
+    """
+    Subscripts dictionary with n_ranges ranges of cardinality elements.
+    """
+    return {
+        f"dim{i}": [f"dim{i}_el{j}" for j in range(cardinality)]
+        for i in range(n_ranges)
+    }
+
+
+def make_workbook(path, n_sheets, n_rows, n_cols):
+    """
+    Excel file with n_sheets sheets of n_rows x n_cols numeric values.
+    """
+    wb = Workbook(write_only=True)
+    for sheet in range(n_sheets):
+        ws = wb.create_sheet(f"Sheet{sheet}")
+        for row in range(n_rows):
+            ws.append([row * n_cols + col for col in range(n_cols)])
+    wb.save(path)
+
+
+def make_config(n_vars, dims, file, sheet, var_type="constants"):
+    """
+    Configuration of n_vars variables of the given dimensions stacked
+    along the rows. For constants the second dimension is read along
+    columns, for data and lookups the columns are used for the series.
+    The rest of dimensions are read along rows, the first one with
+    step 1 and the others with the step needed for not overlapping.
+    """
+    dimensions, height = {}, 1
+    for i, dim in enumerate(dims):
+        if i == 1 and var_type == "constants":
+            dimensions[dim] = ["col", 1]
+        else:
+            dimensions[dim] = ["row", height]
+            height *= len(e2v.Subscripts.get(dim))
+
+    config = {}
+    for var in range(n_vars):
+        config[f"var{var}"] = {
+            "type": var_type,
+            "dims": list(dims),
+            "cell": f"B{var * height + 2}",
+            "file": file,
+            "sheet": sheet,
+            "description": f"Variable {var}",
+            "units": "dmnl",
+            "dimensions": dimensions,
+        }
+        if var_type != "constants":
+            # series along columns in the first row
+            series = {"data": "time", "lookups": "x"}[var_type]
+            config[f"var{var}"][series] = {
+                "name": "time", "cell": "B1", "read_along": "col",
+                "length": 5}
+
+    return config
+
+
+@pytest.fixture(scope="session")
+def _tmp(tmp_path_factory):
+    return tmp_path_factory.mktemp("benchmarks")
+
+
+@pytest.fixture(scope="session")
+def _projects(_tmp):
+    """
+    Synthetic projects of the given number of variables, generated only
+    once per session.
+    """
+    projects = {}
+
+    def get_project(n_vars):
+        if n_vars not in projects:
+            projects[n_vars] = generate_project(
+                _tmp / f"project_{n_vars}", n_vars=n_vars, n_ranges=10,
+                n_subranges=3, n_files=4, n_sheets=5, seed=0)
+        return projects[n_vars]
+
+    return get_project
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    # do not share opened Excel files and subscripts between benchmarks
+    e2v.Excels.close()
+    yield
+    e2v.Excels.close()
+    e2v.Subscripts.clean()
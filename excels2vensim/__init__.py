@@ -1,3 +1,18 @@
 from .excels2vensim import Lookups, Data, Constants, load_from_json,\
-                           Subscripts, Excels, execute
+                           read_config, Subscripts, Excels, execute,\
+                           write_values
+from .utils.cache import Cache
+from .utils.manifest import Manifest
+from .utils.stats import Stats
+from .utils.validation import ConfigError, validate_config
+from .utils.writer import EquationsWriter
+from .utils.estimator import estimate
+from .utils.exporter import export, load_export
+from .utils.patcher import patch_model
+from .utils.names import read_defined_names
+from .utils.catalog import Catalog
+from .utils.checker import check_names
+from .utils.garbage import collect_garbage
+from .utils.progress import CancelToken, Cancelled, Progress
+from .utils.watcher import Watcher
 from ._version import __version__
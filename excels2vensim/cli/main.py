@@ -1,11 +1,24 @@
+import io
 import sys
 import os
+import json
+import warnings
 from pathlib import Path
+from itertools import chain
+from contextlib import nullcontext
 
-from .parser import parser
+from .parser import parser, estimate_parser, export_parser, index_parser,\
+                    gc_parser, check_parser
 
-from excels2vensim import Subscripts, load_from_json
+from excels2vensim import Subscripts, Cache, Manifest, Stats, Excels,\
+                          EquationsWriter, ConfigError, load_from_json,\
+                          read_config, validate_config, estimate, export,\
+                          patch_model, collect_garbage, check_names
 from excels2vensim.gui import start_gui
+from excels2vensim.utils.watcher import Watcher
+from excels2vensim.utils.profiler import Profiler
+from excels2vensim.utils.catalog import Catalog
+from excels2vensim.utils.names import plan_names
 
 
 def main(args):
@@ -23,29 +36,426 @@ def main(args):
     None
 
     """
+    if args and args[0] in COMMANDS:
+        COMMANDS[args[0]](args[1:])
+        sys.exit()
+
     options = parser.parse_args(args)
 
     if options.gui:  # pragma: no cover
-        start_gui(options.subscript_file, options.output_file)
+        start_gui(options.subscript_file, options.output_file,
+                  options.profile)
         sys.exit()
 
-    # read the subscripts
     original_wd = Path.cwd()
+    if options.profile:
+        profiler = Profiler(original_wd.joinpath(options.profile))
+    else:
+        profiler = nullcontext()
+
+    if options.cache_dir:
+        Cache.set_directory(original_wd.joinpath(options.cache_dir))
+
+    if options.max_workbooks is not None:
+        if options.max_workbooks < 1:
+            parser.error("the maximum number of workbooks must be at "
+                         "least 1")
+        Excels.set_max_open(options.max_workbooks)
+
+    if options.watch and "-" in options.config_file:
+        parser.error("the standard input cannot be watched")
+
+    if options.manifest:
+        if options.watch:
+            parser.error("the manifest cannot be saved when watching")
+        Manifest.set_file(original_wd.joinpath(options.manifest))
+
+    if options.patch_model:
+        if options.watch:
+            parser.error("the model cannot be patched when watching")
+        if options.subscript_file.suffix.lower() != ".mdl":
+            parser.error("only Vensim models (.mdl) can be patched")
+
+    stats = Stats(memory=options.memory_report)
+    try:
+        with profiler, stats:
+            if options.watch:
+                watch(options, original_wd)
+            else:
+                run(options, original_wd)
+    finally:
+        if options.stats or options.memory_report:
+            print(stats.summary(), file=sys.stderr)
+        if options.stats_file:
+            with open(original_wd.joinpath(options.stats_file), 'w')\
+                 as file:
+                json.dump(stats.to_dict(), file, indent=4)
+
+    sys.exit()
+
+
+def run(options, original_wd):
+    """
+    Reads the subscripts and writes the equations of the variables
+    in the configuration files.
+
+    Parameters
+    ----------
+    options: argparse.Namespace
+        User arguments.
+
+    original_wd: pathlib.Path
+        Original working directory.
+
+    Returns
+    -------
+    None
+
+    """
+    # read the subscripts
     Subscripts.read(options.subscript_file)
     model_dir = options.subscript_file.parent
     print(f"Setting current working directory to: {model_dir}")
     os.chdir(model_dir)
 
-    eqs = ""
-    # execute json files
-    for json_file in options.config_file:
-        eqs += load_from_json(original_wd.joinpath(json_file))
+    if options.patch_model:
+        # keep the equations to patch them in the model
+        output = io.StringIO()
+    elif options.output_file:
+        output = original_wd.joinpath(options.output_file)
+    else:
+        output = sys.stdout
+
+    # validate all the json files before writing any Excel file
+    try:
+        validate_config(chain.from_iterable(
+            read_config(original_wd.joinpath(json_file))
+            for json_file in options.config_file if json_file != "-"))
+    except ConfigError as err:
+        sys.exit(str(err))
+
+    # execute json files writing the equations of each variable
+    with EquationsWriter(output) as writer:
+        for json_file in options.config_file:
+            if json_file != "-":
+                json_file = original_wd.joinpath(json_file)
+            load_from_json(json_file, writer=writer)
+
+    if options.patch_model:
+        equations = output.getvalue()
+        if options.output_file:
+            with open(original_wd.joinpath(options.output_file), 'w')\
+                 as file:
+                file.write(equations)
+        patched = patch_model(
+            original_wd.joinpath(options.subscript_file), equations)
+        print(f"Patched model: {len(patched['replaced'])} replaced, "
+              f"{len(patched['added'])} added", file=sys.stderr)
+
+
+def watch(options, original_wd):
+    """
+    Regenerates the equations each time that the model, the
+    configuration files or the Excel files change.
+
+    Parameters
+    ----------
+    options: argparse.Namespace
+        User arguments.
+
+    original_wd: pathlib.Path
+        Original working directory.
+
+    Returns
+    -------
+    None
+
+    """
+    watcher = Watcher(
+        original_wd.joinpath(options.subscript_file),
+        [original_wd.joinpath(json_file)
+         for json_file in options.config_file])
+
+    model_dir = options.subscript_file.parent
+    print(f"Setting current working directory to: {model_dir}")
+    os.chdir(model_dir)
+
+    def save(eqs):
+        if options.output_file:
+            with open(original_wd.joinpath(options.output_file), 'w')\
+                 as file:
+                file.write(eqs)
+        else:
+            print(eqs)
+
+    try:
+        watcher.watch(save)
+    except KeyboardInterrupt:
+        pass
+
+
+def estimate_command(args):
+    """
+    Estimate command. Prints the estimated number of equations,
+    cellrange names, Excel files and bytes of each variable and warns
+    about the variables that exceed the thresholds.
+
+    Parameters
+    ----------
+    args: list
+        User arguments after the command name.
+
+    Returns
+    -------
+    None
+
+    """
+    options = estimate_parser.parse_args(args)
+
+    original_wd = Path.cwd()
+    Subscripts.read(options.subscript_file)
+    # the Excel files are relative to the model directory
+    os.chdir(options.subscript_file.parent)
+
+    thresholds = {
+        key: getattr(options, f"max_{key}")
+        for key in ["equations", "names", "workbooks", "bytes"]}
+
+    try:
+        with warnings.catch_warnings(record=True) as warns:
+            warnings.simplefilter("always")
+            estimation = estimate(chain.from_iterable(
+                read_config(json_file if json_file == "-"
+                            else original_wd.joinpath(json_file))
+                for json_file in options.config_file), thresholds)
+    except ConfigError as err:
+        sys.exit(str(err))
+
+    header = ["equations", "names", "workbooks", "bytes"]
+    rows = list(estimation['variables'].items())\
+        + [("Total", estimation['total'])]
+    width = max(len("Variable"), *(len(str(var)) for var, _ in rows))
+    print(f"{'Variable':<{width}}"
+          + "".join(f"{key.capitalize():>12}" for key in header))
+    for var, values in rows:
+        if var == "Total":
+            print("-" * (width + 12 * len(header)))
+        print(f"{str(var):<{width}}"
+              + "".join(f"{values[key]:>12}" for key in header))
+
+    for warn in warns:
+        print(f"Warning: {warn.message}", file=sys.stderr)
 
     if options.output_file:
-        with open(original_wd.joinpath(options.output_file), 'w')\
-             as file:
-            file.write(eqs)
+        with open(original_wd.joinpath(options.output_file), 'w') as file:
+            json.dump(estimation, file, indent=4)
+
+
+def export_command(args):
+    """
+    Export command. Reads the values of the cellranges of each variable
+    and saves them in a compressed NumPy file with a JSON manifest.
+
+    Parameters
+    ----------
+    args: list
+        User arguments after the command name.
+
+    Returns
+    -------
+    None
+
+    """
+    options = export_parser.parse_args(args)
+
+    original_wd = Path.cwd()
+    output_file = original_wd.joinpath(options.output_file)
+    if options.manifest_file:
+        manifest_file = original_wd.joinpath(options.manifest_file)
     else:
-        print(eqs)
+        manifest_file = output_file.with_suffix(".json")
 
-    sys.exit()
+    Subscripts.read(options.subscript_file)
+    # the Excel files are relative to the model directory
+    os.chdir(options.subscript_file.parent)
+
+    try:
+        manifest = export(chain.from_iterable(
+            read_config(json_file if json_file == "-"
+                        else original_wd.joinpath(json_file))
+            for json_file in options.config_file),
+            output_file, manifest_file)
+    except ConfigError as err:
+        sys.exit(str(err))
+
+    print(f"Exported {len(manifest['variables'])} variables from "
+          f"{len(manifest['sources'])} Excel files to {output_file}")
+
+
+def index_command(args):
+    """
+    Index command. Updates the catalog with the defined names of the
+    Excel files and the variables that own them, and prints the names
+    matching the query.
+
+    Parameters
+    ----------
+    args: list
+        User arguments after the command name.
+
+    Returns
+    -------
+    None
+
+    """
+    options = index_parser.parse_args(args)
+    query = {
+        key: getattr(options, key)
+        for key in ["sheet", "column", "variable", "name"]
+        if getattr(options, key) is not None}
+    if options.subscript_file is None and not query:
+        index_parser.error("the model or a query must be given")
+    if options.subscript_file is not None and not options.config_file:
+        index_parser.error("the configuration files must be given")
+
+    original_wd = Path.cwd()
+    with Catalog(original_wd.joinpath(options.database)) as catalog:
+        if options.subscript_file is not None:
+            workbooks = [original_wd.joinpath(workbook)
+                         for workbook in options.workbooks]
+            Subscripts.read(options.subscript_file)
+            # the Excel files are relative to the model directory
+            os.chdir(options.subscript_file.parent)
+            owners = []
+            try:
+                for json_file in options.config_file:
+                    if json_file != "-":
+                        json_file = original_wd.joinpath(json_file)
+                    owners += [
+                        (var, name, file, sheet, json_file)
+                        for var, name, file, sheet, _
+                        in plan_names(read_config(json_file))]
+            except ConfigError as err:
+                sys.exit(str(err))
+
+            result = catalog.update(
+                workbooks + [file for _, _, file, _, _ in owners],
+                options.jobs)
+            catalog.set_owners(owners)
+            print(f"Indexed {len(result['read'])} Excel files, "
+                  f"{len(result['unchanged'])} unchanged, "
+                  f"{len(result['removed'])} removed", file=sys.stderr)
+
+        if query:
+            for row in catalog.query(**query):
+                print("\t".join(
+                    str(row[key]) if row[key] is not None else "-"
+                    for key in ['file', 'scope', 'name', 'reference',
+                                'variable']))
+
+
+def gc_command(args):
+    """
+    Gc command. Lists the cellrange names of the Excel files that are
+    not planned by the configuration and removes them if requested.
+
+    Parameters
+    ----------
+    args: list
+        User arguments after the command name.
+
+    Returns
+    -------
+    None
+
+    """
+    options = gc_parser.parse_args(args)
+    if options.remove and not options.patterns:
+        gc_parser.error("the names can only be removed with --pattern")
+
+    original_wd = Path.cwd()
+    workbooks = [original_wd.joinpath(workbook)
+                 for workbook in options.workbooks]
+    Subscripts.read(options.subscript_file)
+    # the Excel files are relative to the model directory
+    os.chdir(options.subscript_file.parent)
+
+    try:
+        orphans = collect_garbage(chain.from_iterable(
+            read_config(json_file if json_file == "-"
+                        else original_wd.joinpath(json_file))
+            for json_file in options.config_file),
+            workbooks, options.patterns, options.remove, options.jobs)
+    except ConfigError as err:
+        sys.exit(str(err))
+
+    for file, names in orphans.items():
+        for sheet, name, reference in names:
+            print(f"{file}\t{sheet}\t{name}\t{reference}")
+
+    n_names = sum(len(names) for names in orphans.values())
+    print(f"{'Removed' if options.remove else 'Found'} {n_names} orphan "
+          f"names in {len(orphans)} Excel files", file=sys.stderr)
+
+
+def check_command(args):
+    """
+    Check command. Prints the cellrange names that are missing, moved
+    or extra in the Excel files and exits with status 1 if any.
+
+    Parameters
+    ----------
+    args: list
+        User arguments after the command name.
+
+    Returns
+    -------
+    None
+
+    """
+    options = check_parser.parse_args(args)
+
+    original_wd = Path.cwd()
+    workbooks = [original_wd.joinpath(workbook)
+                 for workbook in options.workbooks]
+    Subscripts.read(options.subscript_file)
+    # the Excel files are relative to the model directory
+    os.chdir(options.subscript_file.parent)
+
+    try:
+        diff = check_names(chain.from_iterable(
+            read_config(json_file if json_file == "-"
+                        else original_wd.joinpath(json_file))
+            for json_file in options.config_file),
+            workbooks, options.jobs)
+    except ConfigError as err:
+        sys.exit(str(err))
+    if options.ignore_extra:
+        diff['extra'] = []
+
+    for file, sheet, name, cellrange in diff['missing']:
+        print(f"- {file}\t{sheet}\t{name}\t{cellrange}")
+    for file, sheet, name, cellrange, reference in diff['moved']:
+        print(f"~ {file}\t{sheet}\t{name}\t{reference} -> {cellrange}")
+    for file, sheet, name, reference in diff['extra']:
+        print(f"+ {file}\t{sheet}\t{name}\t{reference}")
+
+    print(", ".join(f"{len(names)} {kind}" for kind, names in diff.items())
+          + " names", file=sys.stderr)
+
+    if options.output_file:
+        with open(original_wd.joinpath(options.output_file), 'w') as file:
+            json.dump(diff, file, indent=4)
+
+    if any(diff.values()):
+        sys.exit(1)
+
+
+# commands given as first argument
+COMMANDS = {
+    'estimate': estimate_command,
+    'export': export_command,
+    'index': index_command,
+    'gc': gc_command,
+    'check': check_command,
+}
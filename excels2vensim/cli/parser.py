@@ -2,7 +2,7 @@
 cmdline parser
 """
 from pathlib import Path
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 
 from excels2vensim import __version__
 
@@ -10,8 +10,43 @@ from excels2vensim import __version__
 parser = ArgumentParser(
     description="Easy generate Vensim GET XLS/DIRECT equations with "
                 "cellrange names.",
+    epilog="commands: 'estimate' estimates the size of the outputs "
+           "without executing, 'export' saves the values of the "
+           "cellranges in a binary file, 'index' updates and queries a "
+           "catalog of the defined names, 'gc' lists or removes the "
+           "orphan names, 'check' compares the names of the Excel files "
+           "with the configuration, use 'python -m excels2vensim "
+           "COMMAND -h' for their arguments",
     prog="excels2vensim")
 
+estimate_parser = ArgumentParser(
+    description="Estimate the number of equations, cellrange names, Excel "
+                "files and bytes of each variable without executing.",
+    prog="excels2vensim estimate")
+
+export_parser = ArgumentParser(
+    description="Read the values of the cellranges of each variable and "
+                "save them in a compressed NumPy file with a JSON manifest.",
+    prog="excels2vensim export")
+
+index_parser = ArgumentParser(
+    description="Update a SQLite catalog with the defined names of the "
+                "Excel files and the variables that own them, and query "
+                "it. The catalog is only updated if the model is given.",
+    prog="excels2vensim index")
+
+gc_parser = ArgumentParser(
+    description="List or remove the cellrange names of the Excel files "
+                "that are not planned by the configuration files.",
+    prog="excels2vensim gc")
+
+check_parser = ArgumentParser(
+    description="Check that the Excel files have the cellrange names "
+                "planned by the configuration files without writing them. "
+                "Exits with status 1 if any name is missing, moved or "
+                "extra.",
+    prog="excels2vensim check")
+
 
 #########################
 # functions and actions #
@@ -20,18 +55,19 @@ parser = ArgumentParser(
 
 def check_file(string):
     """
-    Checks that subscripts file ends with .mdl or .json and that exists.
+    Checks that subscripts file ends with .mdl, .py or .json and that
+    exists. The errors are reported by the parser using it.
 
     """
     file_path = Path(string)
-    if not file_path.suffix.lower() in [".json", ".mdl"]:
-        parser.error(
+    if not file_path.suffix.lower() in [".json", ".mdl", ".py"]:
+        raise ArgumentTypeError(
             f"when parsing '{string}'"
-            "\nThe subscript file name must be Vensim model (.mdl)"
-            " or JSON (.json) file...")
+            "\nThe subscript file name must be Vensim model (.mdl),"
+            " PySD model (.py) or JSON (.json) file...")
 
     if not file_path.is_file():
-        parser.error(
+        raise ArgumentTypeError(
             f"when parsing '{string}'"
             "\nThe model/subscripts file does not exist...")
 
@@ -40,17 +76,23 @@ def check_file(string):
 
 def check_config(string):
     """
-    Checks that config file ends with .json and that exists.
+    Checks that config file ends with .json, .ndjson or .jsonl and that
+    exists. '-' is used for reading from the standard input. The errors
+    are reported by the parser using it.
 
     """
+    if string == "-":
+        return string
+
     file_path = Path(string)
-    if not file_path.suffix.lower() == ".json":
-        parser.error(
+    if not file_path.suffix.lower() in [".json", ".ndjson", ".jsonl"]:
+        raise ArgumentTypeError(
             f"when parsing '{string}'"
-            "\nThe config file name must be a JSON (.json) file...")
+            "\nThe config file name must be a JSON (.json) or newline "
+            "delimited JSON (.ndjson, .jsonl) file...")
 
     if not file_path.is_file():
-        parser.error(
+        raise ArgumentTypeError(
             f"when parsing '{string}'"
             "\nThe config file does not exist...")
 
@@ -76,6 +118,65 @@ parser.add_argument(
     action="store_true", default=False,
     help="start the GUI")
 
+parser.add_argument(
+    "-c", "--cache-dir", dest="cache_dir",
+    type=str, metavar="DIR", default=None,
+    help="directory to cache the results of each variable, the variables"
+         " whose configuration, subscripts and Excel files did not change"
+         " since the last run will not be executed again")
+
+parser.add_argument(
+    "--max-workbooks", dest="max_workbooks",
+    type=int, metavar="N", default=None,
+    help="maximum number of Excel files kept open, the least recently "
+         "used file is saved and closed when the limit is reached, by "
+         "default all the files are saved at the end of the run")
+
+parser.add_argument(
+    "--manifest", dest="manifest",
+    type=str, metavar="FILE", default=None,
+    help="save a JSON manifest with the file, sheet, cellrange, variable"
+         " and subscripts of each written cellrange name and the SHA-256"
+         " of each Excel file after saving it")
+
+parser.add_argument(
+    "-w", "--watch", dest="watch",
+    action="store_true", default=False,
+    help="watch the model, configuration and Excel files and regenerate "
+         "the equations of the modified variables each time they change")
+
+parser.add_argument(
+    "--patch-model", dest="patch_model",
+    action="store_true", default=False,
+    help="patch the equations in the Vensim model file (.mdl), the"
+         " equations of the variables already in the model are replaced"
+         " and the new ones are added before the sketch")
+
+parser.add_argument(
+    "-s", "--stats", dest="stats",
+    action="store_true", default=False,
+    help="print in the standard error a summary table with the time spent"
+         " in each phase and the number of written names and equations")
+
+parser.add_argument(
+    "-p", "--profile", dest="profile",
+    type=str, metavar="FILE", default=None,
+    help="profile the whole run with cProfile and save the stats in FILE"
+         " (.prof recommended) and a summary of the functions with the"
+         " largest cumulative time in FILE.txt")
+
+parser.add_argument(
+    "--memory-report", dest="memory_report",
+    action="store_true", default=False,
+    help="measure the memory peak of each phase, Excel file and variable "
+         "and print it with the --stats summary table, the run is slower")
+
+parser.add_argument(
+    "--stats-file", dest="stats_file",
+    type=str, metavar="FILE", default=None,
+    help="save the time spent in each phase and the number of written"
+         " names and equations as JSON")
+
 
 ########################
 # Positional arguments #
@@ -83,12 +184,175 @@ parser.add_argument(
 
 parser.add_argument("subscript_file", metavar="subscript_file",
                     type=check_file, default=None, nargs="?",
-                    help="Vensim, Xmile or PySD model file")
+                    help="Vensim model (.mdl), PySD model (.py) or JSON file"
+                         " with the subscripts")
 
 parser.add_argument("config_file", metavar="FILE",
                     type=check_config, nargs="*", default=None,
-                    help="configuration json file")
+                    help="configuration json file, newline delimited json"
+                         " files (.ndjson, .jsonl) are processed one variable"
+                         " at a time, use '-' for reading newline delimited"
+                         " json from the standard input")
+
+
+####################
+# Estimate command #
+####################
+
+estimate_parser.add_argument(
+    "-o", "--output-file", dest="output_file",
+    type=str, metavar="FILE", default=None,
+    help="save the estimation of each variable and the totals as JSON")
+
+for key, default in [("equations", 1000), ("names", 1000),
+                     ("workbooks", 10), ("bytes", 1000000)]:
+    estimate_parser.add_argument(
+        f"--max-{key}", dest=f"max_{key}",
+        type=int, metavar="N", default=default,
+        help=f"warn for the variables with more than N {key}, "
+             f"default is {default}")
+
+estimate_parser.add_argument(
+    "subscript_file", metavar="subscript_file", type=check_file,
+    help="Vensim model, PySD model or JSON file with the subscripts")
+
+estimate_parser.add_argument(
+    "config_file", metavar="FILE", type=check_config, nargs="+",
+    help="configuration json file, newline delimited json files (.ndjson,"
+         " .jsonl) or '-' for reading from the standard input")
+
+##################
+# Export command #
+##################
 
+export_parser.add_argument(
+    "-o", "--output-file", dest="output_file",
+    type=str, metavar="FILE", required=True,
+    help="compressed NumPy file (.npz) to save the values in")
+
+export_parser.add_argument(
+    "-m", "--manifest-file", dest="manifest_file",
+    type=str, metavar="FILE", default=None,
+    help="JSON file to save the manifest in, by default the output file "
+         "with the .json suffix")
+
+export_parser.add_argument(
+    "subscript_file", metavar="subscript_file", type=check_file,
+    help="Vensim model, PySD model or JSON file with the subscripts")
+
+export_parser.add_argument(
+    "config_file", metavar="FILE", type=check_config, nargs="+",
+    help="configuration json file, newline delimited json files (.ndjson,"
+         " .jsonl) or '-' for reading from the standard input")
+
+#################
+# Index command #
+#################
+
+index_parser.add_argument(
+    "-d", "--database", dest="database",
+    type=str, metavar="FILE", default="excels2vensim.sqlite",
+    help="SQLite file of the catalog, default is excels2vensim.sqlite")
+
+index_parser.add_argument(
+    "-w", "--workbook", dest="workbooks",
+    type=str, metavar="FILE", action="append", default=[],
+    help="other Excel file to include in the catalog, it can be given "
+         "several times")
+
+index_parser.add_argument(
+    "-j", "--jobs", dest="jobs",
+    type=int, metavar="N", default=None,
+    help="number of Excel files read at the same time")
+
+for key, text in [("sheet", "the names that reference the sheet"),
+                  ("column", "the names that reference the column, "
+                             "e.g., AB"),
+                  ("variable", "the names owned by the variable"),
+                  ("name", "the names with the given name")]:
+    index_parser.add_argument(
+        f"--{key}", dest=key, type=str, metavar=key.upper(), default=None,
+        help=f"query {text}")
+
+index_parser.add_argument(
+    "subscript_file", metavar="subscript_file", type=check_file,
+    nargs="?", default=None,
+    help="Vensim model, PySD model or JSON file with the subscripts")
+
+index_parser.add_argument(
+    "config_file", metavar="FILE", type=check_config, nargs="*",
+    help="configuration json file, newline delimited json files (.ndjson,"
+         " .jsonl) or '-' for reading from the standard input")
+
+##############
+# Gc command #
+##############
+
+gc_parser.add_argument(
+    "-w", "--workbook", dest="workbooks",
+    type=str, metavar="FILE", action="append", default=[],
+    help="other Excel file to look for orphan names in, it can be given "
+         "several times")
+
+gc_parser.add_argument(
+    "-p", "--pattern", dest="patterns",
+    type=str, metavar="PATTERN", action="append", default=None,
+    help="only consider the names matching the shell-style pattern, "
+         "e.g., 'my_var_*', it can be given several times")
+
+gc_parser.add_argument(
+    "-j", "--jobs", dest="jobs",
+    type=int, metavar="N", default=None,
+    help="number of Excel files read at the same time")
+
+gc_parser.add_argument(
+    "--remove", dest="remove",
+    action="store_true", default=False,
+    help="remove the orphan names matching the patterns, by default "
+         "they are only listed")
+
+gc_parser.add_argument(
+    "subscript_file", metavar="subscript_file", type=check_file,
+    help="Vensim model, PySD model or JSON file with the subscripts")
+
+gc_parser.add_argument(
+    "config_file", metavar="FILE", type=check_config, nargs="+",
+    help="configuration json file, newline delimited json files (.ndjson,"
+         " .jsonl) or '-' for reading from the standard input")
+
+#################
+# Check command #
+#################
+
+check_parser.add_argument(
+    "-o", "--output-file", dest="output_file",
+    type=str, metavar="FILE", default=None,
+    help="save the missing, moved and extra names as JSON")
+
+check_parser.add_argument(
+    "-w", "--workbook", dest="workbooks",
+    type=str, metavar="FILE", action="append", default=[],
+    help="other Excel file to look for extra names in, it can be given "
+         "several times")
+
+check_parser.add_argument(
+    "-j", "--jobs", dest="jobs",
+    type=int, metavar="N", default=None,
+    help="number of Excel files read at the same time")
+
+check_parser.add_argument(
+    "--ignore-extra", dest="ignore_extra",
+    action="store_true", default=False,
+    help="do not report the names that are not planned")
+
+check_parser.add_argument(
+    "subscript_file", metavar="subscript_file", type=check_file,
+    help="Vensim model, PySD model or JSON file with the subscripts")
+
+check_parser.add_argument(
+    "config_file", metavar="FILE", type=check_config, nargs="+",
+    help="configuration json file, newline delimited json files (.ndjson,"
+         " .jsonl) or '-' for reading from the standard input")
 
 #########
 # Usage #
@@ -96,3 +360,18 @@ parser.add_argument("config_file", metavar="FILE",
 
 parser.usage = parser.format_usage().replace(
     "usage: excels2vensim", "python -m excels2vensim")
+
+estimate_parser.usage = estimate_parser.format_usage().replace(
+    "usage: excels2vensim", "python -m excels2vensim")
+
+export_parser.usage = export_parser.format_usage().replace(
+    "usage: excels2vensim", "python -m excels2vensim")
+
+index_parser.usage = index_parser.format_usage().replace(
+    "usage: excels2vensim", "python -m excels2vensim")
+
+gc_parser.usage = gc_parser.format_usage().replace(
+    "usage: excels2vensim", "python -m excels2vensim")
+
+check_parser.usage = check_parser.format_usage().replace(
+    "usage: excels2vensim", "python -m excels2vensim")
@@ -1,20 +1,35 @@
 """
 Functions for parsing the subscript from a .mdl file using PySD.
 """
+import sys
 import warnings
 import re
 import textwrap
 import string
 import json
+from pathlib import Path
 
 import numpy as np
+import xarray as xr
 from openpyxl.workbook.defined_name import DefinedName
 
 from .utils.excels import Excels
 from .utils.subscripts import Subscripts
+from .utils.cache import Cache
+from .utils.manifest import Manifest
+from .utils.stats import Stats
+from .utils.progress import Progress
+from .utils.reader import read_cellranges, _boundaries
+from .utils.validation import validate_config
+
+# suffixes of the newline delimited JSON configuration files
+NDJSON_SUFFIXES = ['.ndjson', '.jsonl']
 
 
 class ExternalVariable(object):
+    # dimension of the series in the arrays of values
+    series_dim = None
+
     def __init__(self, var_name, dims, cell, description, units, file, sheet):
         self.var_name = var_name.strip()
         self.base_name = self._clean_identifier(self.var_name)
@@ -239,6 +254,348 @@ class ExternalVariable(object):
 
         return visited
 
+    def _get_cellranges(self):
+        """
+        Get the planned cellranges of the object. The get_vensim method
+        must be called before.
+
+        Returns
+        -------
+        cellranges: list of tuples
+            List of the (name, file, sheet, cellrange) of each cellrange
+            to write. The series cellranges of DATA and LOOKUPS are
+            given first.
+
+        """
+        cellranges = []
+        if hasattr(self, 'series'):
+            cellranges += zip(self.series['name'], self.series['file'],
+                              self.series['sheet'], self.series['cellrange'])
+
+        cellranges += zip(self.elements['cellname'], self.elements['file'],
+                          self.elements['sheet'], self.elements['cellrange'])
+
+        return cellranges
+
+    def _get_n_equations(self):
+        """
+        Get the number of planned equations of the object, one for each
+        cellrange with values. The get_vensim method must be called
+        before.
+
+        Returns
+        -------
+        int
+
+        """
+        return len(self.elements['subs'])
+
+    def _get_subscripts(self):
+        """
+        Get the subscripts of the planned cellranges of the object, in
+        the same order as _get_cellranges. The get_vensim method must be
+        called before.
+
+        Returns
+        -------
+        subscripts: list of lists
+            The subscripts of each cellrange, as in the equations. The
+            series cellranges have no subscripts.
+
+        """
+        subscripts = []
+        if hasattr(self, 'series'):
+            subscripts += [[]] * len(self.series['cellrange'])
+
+        return subscripts + [list(subs) for subs in self.elements['subs']]
+
+    def read(self):
+        """
+        Read the values of the variable from the Excel files without
+        writing any cellrange name. The values are read from the same
+        cellranges that are written by execute, opening each Excel file
+        once in read-only mode.
+
+        Returns
+        -------
+        xarray.DataArray
+            The values with the dimensions of the variable and their
+            subscripts as coordinates. For DATA and LOOKUPS the first
+            dimension is the series, named 'time' or 'lookup_dim', with
+            the values of the time or x series as coordinates. The empty
+            cells are NaN.
+
+        """
+        if not hasattr(self, 'elements'):
+            # plan the cellranges
+            self.get_vensim()
+
+        values = read_cellranges(
+            (file, sheet, cellrange)
+            for _, file, sheet, cellrange in self._get_cellranges())
+        dims, coords, data = self._get_array(values)
+
+        return xr.DataArray(
+            data, dims=dims, coords=coords, name=self.var_name,
+            attrs={'units': self.units, 'description': self.description})
+
+    def write(self, values, force=False, loading='DIRECT'):
+        """
+        Write the values of the variable in the Excel files and the
+        cellrange names, as execute. The values are written in the same
+        cellranges that are read by read. For DATA and LOOKUPS, the
+        coordinates of the series dimension, if given, are written in
+        the series cells. Each Excel file is loaded and saved once.
+
+        Parameters
+        ----------
+        values: xarray.DataArray, pandas.DataFrame, pandas.Series or array
+            The values to write. The DataArray, DataFrame and Series must
+            have the dimensions of the variable as dimensions, index or
+            columns names, and the subscripts as labels, the series
+            dimension of DATA and LOOKUPS is named 'time' or
+            'lookup_dim'. Other arrays must have the shape of the array
+            returned by read. NaN values are written as empty cells.
+
+        force: bool (optional)
+            If True and trying and tryting to write a cell range name
+            that already exist in other positions it will overwrite it
+            (not recommended). If False it will return and error when
+            trying to write the new cellrange name. Default is False.
+
+        loading: str (optional)
+            Vensing GET loading type it can be 'DIRECT' or 'XLS'.
+            Default is 'DIRECT'.
+
+        Returns
+        -------
+        vensim_eqs: str
+            The string of Vensim equations to copy in the model .mdl file.
+
+        """
+        vensim_eqs = self.get_vensim(loading=loading)
+        try:
+            self._write_values(values)
+            for name, file, sheet, cellrange in self._get_cellranges():
+                self._write_cellrange(name, file, sheet, cellrange, force)
+            Excels.save_and_close()
+        except BaseException:
+            Excels.close()
+            raise
+
+        return vensim_eqs
+
+    def _get_boxes(self):
+        """
+        Get the position of the planned cellranges in the array of the
+        variable values. The get_vensim method must be called before.
+
+        Returns
+        -------
+        boxes: list of tuples
+            List of the (file, sheet, cellrange, index, axes) of each
+            cellrange with values, where index is the position of the
+            cellrange in the array, with a slice for the dimensions read
+            inside the cellrange, and axes is the 'row' or 'col' along
+            which each of these dimensions is read.
+
+        """
+        boxes = []
+        for subs, file, sheet, cellrange in zip(self.elements['subs'],
+                                                self.elements['file'],
+                                                self.elements['sheet'],
+                                                self.elements['cellrange']):
+            index, axes = [], []
+            if hasattr(self, 'series'):
+                index.append(slice(None))
+                axes.append(self.series['read_along'])
+            for dim, sub in zip(self.dims, subs):
+                read_along, step = self.dims_dict[dim]
+                if step == 1:
+                    # the whole subscript range is in the cellrange
+                    index.append(slice(None))
+                    axes.append(read_along)
+                else:
+                    index.append(Subscripts.get(dim).index(sub))
+            boxes.append((file, sheet, cellrange, tuple(index), axes))
+
+        return boxes
+
+    def _get_array(self, values):
+        """
+        Build the array of the variable from the values of its planned
+        cellranges. The get_vensim method must be called before.
+
+        Parameters
+        ----------
+        values: dict
+            The values of each (file, sheet, cellrange) of the variable
+            as a list of rows.
+
+        Returns
+        -------
+        dims: list
+            The dimensions of the array. The series dimension of DATA
+            and LOOKUPS is the first one.
+
+        coords: dict
+            The coordinates of each dimension.
+
+        data: numpy.ndarray
+            The values, the empty cells are NaN.
+
+        """
+        dims = list(self.dims)
+        coords = {dim: list(Subscripts.get(dim)) for dim in dims}
+        if hasattr(self, 'series'):
+            series = None
+            for file, sheet, cellrange in zip(self.series['file'],
+                                              self.series['sheet'],
+                                              self.series['cellrange']):
+                new_series = self._to_float(
+                    values[file, sheet, cellrange], file, cellrange).ravel()
+                if series is None:
+                    series = new_series
+                elif not np.array_equal(series, new_series, equal_nan=True):
+                    raise ValueError(
+                        f"\nThe values of the series '{self.series['name'][0]}"
+                        f"' of '{self.var_name}' are different in '{file}' "
+                        f"'{sheet}'.")
+            dims.insert(0, self.series_dim)
+            coords[self.series_dim] = series.tolist()
+
+        data = np.full([len(coords[dim]) for dim in dims], np.nan)
+        for file, sheet, cellrange, index, axes in self._get_boxes():
+            box = self._to_float(values[file, sheet, cellrange],
+                                 file, cellrange)
+            # move the axes of the box to the order of the dimensions
+            order = [0 if along == 'row' else 1 for along in axes]
+            order += [axis for axis in [0, 1] if axis not in order]
+            data[index] = box.transpose(order).reshape(data[index].shape)
+
+        return dims, coords, data
+
+    def _align_values(self, values):
+        """
+        Align the values to write with the array of the variable.
+
+        Returns
+        -------
+        data: numpy.ndarray
+            The values with the dimensions of the variable.
+
+        series: list or None
+            The coordinates of the series dimension, None if they are not
+            given or if the variable has no series.
+
+        """
+        dims = list(self.dims)
+        if hasattr(self, 'series'):
+            dims.insert(0, self.series_dim)
+        shape = [
+            self.series['length'] if dim == self.series_dim
+            else len(Subscripts.get(dim)) for dim in dims]
+
+        if hasattr(values, 'index') and not isinstance(values, xr.DataArray):
+            # pandas objects
+            values = xr.DataArray(values)
+
+        if not isinstance(values, xr.DataArray):
+            data = np.asarray(values, dtype=float)
+            if list(data.shape) != shape:
+                raise ValueError(
+                    f"\nThe shape of the values of '{self.var_name}' is "
+                    f"{data.shape}, expected {tuple(shape)} for the "
+                    f"dimensions {dims}.")
+            return data, None
+
+        if set(values.dims) != set(dims):
+            raise ValueError(
+                f"\nThe dimensions of the values of '{self.var_name}' are "
+                f"{list(values.dims)}, expected {dims}.")
+        values = values.transpose(*dims)
+        for dim, size in zip(dims, shape):
+            if dim in values.coords and dim != self.series_dim:
+                missing = set(Subscripts.get(dim)).difference(
+                    values.coords[dim].values.tolist())
+                if missing:
+                    raise ValueError(
+                        f"\nMissing subscripts {sorted(missing)} of '{dim}'"
+                        f" in the values of '{self.var_name}'.")
+                values = values.sel({dim: Subscripts.get(dim)})
+            elif values.sizes[dim] != size:
+                raise ValueError(
+                    f"\nThe length of '{dim}' in the values of "
+                    f"'{self.var_name}' is {values.sizes[dim]}, expected "
+                    f"{size}.")
+
+        series = None
+        if hasattr(self, 'series') and self.series_dim in values.coords:
+            series = values.coords[self.series_dim].values.tolist()
+
+        return values.values.astype(float), series
+
+    def _write_values(self, values):
+        """
+        Write the values in the planned cellranges of the opened Excel
+        files. The files are not saved. The get_vensim method must be
+        called before.
+        """
+        data, series = self._align_values(values)
+
+        if series is not None:
+            for file, sheet, cellrange in zip(self.series['file'],
+                                              self.series['sheet'],
+                                              self.series['cellrange']):
+                self._write_box(file, sheet, cellrange, np.array(series))
+
+        for file, sheet, cellrange, index, axes in self._get_boxes():
+            min_row, min_col, max_row, max_col = _boundaries(cellrange)
+            box_shape = [max_row - min_row + 1, max_col - min_col + 1]
+            # inverse of the transposition done when reading
+            order = [0 if along == 'row' else 1 for along in axes]
+            order += [axis for axis in [0, 1] if axis not in order]
+            box = data[index].reshape([box_shape[axis] for axis in order])
+            self._write_box(
+                file, sheet, cellrange, box.transpose(np.argsort(order)))
+
+    @staticmethod
+    def _write_box(file, sheet, cellrange, values):
+        """
+        Write the values of a cellrange in an opened Excel file. The sheet
+        is created if it does not exist.
+        """
+        wb = Excels.read(file)
+        with Stats.span('write', str(file)):
+            for sheet_name in wb.sheetnames:
+                if sheet_name.lower() == sheet.lower():
+                    ws = wb[sheet_name]
+                    break
+            else:
+                ws = wb.create_sheet(sheet)
+
+            min_row, min_col, max_row, max_col = _boundaries(cellrange)
+            values = np.asarray(values).reshape(
+                max_row - min_row + 1, max_col - min_col + 1)
+            for i, row in enumerate(values.tolist()):
+                for j, value in enumerate(row):
+                    if isinstance(value, float) and np.isnan(value):
+                        value = None
+                    ws.cell(row=min_row+i, column=min_col+j, value=value)
+
+    def _to_float(self, values, file, cellrange):
+        """
+        Convert the values of a cellrange to a float array.
+        """
+        try:
+            return np.array(
+                [[np.nan if value is None else value for value in row]
+                 for row in values], dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"\nNon-numeric values in '{cellrange}' of '{file}' "
+                f"when reading '{self.var_name}'.")
+
     def _add_info(self, subs, read_along, steps=None):
         """
         Combine several list with elements of a given list
@@ -376,27 +733,34 @@ class ExternalVariable(object):
 
         """
         wb = Excels.read(file)
-        for sheetId, sheet1 in enumerate(wb.sheetnames):
-            if sheet1.lower() == sheet.lower():
-                local_cellranges = wb[sheet1].defined_names
-                break
-
-        if name in local_cellranges:
-            if local_cellranges.get(name).attr_text == cellrange:
-                # cellrange already defined with same name and coordinates
-                return
-            elif force:
-                del local_cellranges[name]
+        with Stats.span('write', str(file)):
+            for sheetId, sheet1 in enumerate(wb.sheetnames):
+                if sheet1.lower() == sheet.lower():
+                    local_cellranges = wb[sheet1].defined_names
+                    break
+
+            if name in local_cellranges:
+                if local_cellranges.get(name).attr_text == cellrange:
+                    # cellrange already defined with same name and
+                    # coordinates
+                    Stats.count('names_skipped')
+                    return
+                elif force:
+                    del local_cellranges[name]
+                    Stats.count('names_replaced')
+                else:
+                    raise ValueError(
+                        f"\nTrying to write a cellrange with name '{name}' "
+                        + f"at '{cellrange}'. However, '{name}' already "
+                        + "exist in "
+                        + f"'{local_cellranges.get(name).attr_text}'\n"
+                        + "Use force=True to overwrite it.")
             else:
-                raise ValueError(
-                    f"\nTrying to write a cellrange with name '{name}' at "
-                    + f"'{cellrange}'. However, '{name}' already exist in "
-                    + f"'{local_cellranges.get(name).attr_text}'\n"
-                    + "Use force=True to overwrite it.")
+                Stats.count('names_added')
 
-        new_range = DefinedName(
-            name, attr_text=cellrange, localSheetId=sheetId)
-        local_cellranges.add(new_range)
+            new_range = DefinedName(
+                name, attr_text=cellrange, localSheetId=sheetId)
+            local_cellranges.add(new_range)
 
     @staticmethod
     def _col_to_num(col):
@@ -544,6 +908,9 @@ class Lookups(ExternalVariable):
         subscript range is defined across several sheets. Default is None.
 
     """
+    # dimension of the series in the arrays of values
+    series_dim = 'lookup_dim'
+
     def __init__(self, var_name, dims, cell, description='', units='',
                  file=None, sheet=None, **kwargs):
         super().__init__(var_name, dims, cell, description, units, file, sheet)
@@ -598,7 +965,7 @@ class Lookups(ExternalVariable):
         # force removal of conflicting cellrange names
         self.force = force
 
-        vensim_eqs = self.get_vensim(loading)
+        vensim_eqs = self.get_vensim(force=force, loading=loading)
 
         # write series cellranges
         super()._write_cellranges(
@@ -639,6 +1006,8 @@ class Lookups(ExternalVariable):
         """
         # force removal of conflicting cellrange names
         self.force = force
+        # the GET function names are uppercase
+        loading = loading.upper()
 
         self.elements = {
             'row': [np.array([self.ref_row, self.ref_row], dtype=int)],
@@ -725,6 +1094,9 @@ class Data(ExternalVariable):
             Default is None.
 
     """
+    # dimension of the series in the arrays of values
+    series_dim = 'time'
+
     def __init__(self, var_name, dims, cell, description='', units='',
                  file=None, sheet=None, interp=None, **kwargs):
         super().__init__(var_name, dims, cell, description, units, file, sheet)
@@ -790,7 +1162,7 @@ class Data(ExternalVariable):
         # force removal of conflicting cellrange names
         self.force = force
 
-        vensim_eqs = self.get_vensim(loading)
+        vensim_eqs = self.get_vensim(force=force, loading=loading)
 
         # write series cellranges
         super()._write_cellranges(
@@ -831,6 +1203,8 @@ class Data(ExternalVariable):
         """
         # force removal of conflicting cellrange names
         self.force = force
+        # the GET function names are uppercase
+        loading = loading.upper()
 
         self.elements = {
             'row': [np.array([self.ref_row, self.ref_row], dtype=int)],
@@ -946,7 +1320,7 @@ class Constants(ExternalVariable):
         # force removal of conflicting cellrange names
         self.force = force
 
-        vensim_eqs = self.get_vensim(loading)
+        vensim_eqs = self.get_vensim(loading=loading)
 
         # write data cellranges
         super()._write_cellranges(
@@ -974,6 +1348,9 @@ class Constants(ExternalVariable):
             The string of Vensim equations to copy in the model .mdl file.
 
         """
+        # the GET function names are uppercase
+        loading = loading.upper()
+
         self.elements = {
             'row': [np.array([self.ref_row, self.ref_row], dtype=int)],
             'col': [np.array([self.ref_col, self.ref_col], dtype=int)],
@@ -1016,79 +1393,432 @@ class Constants(ExternalVariable):
         return vensim_eqs
 
 
-def load_from_json(json_file):
+def load_from_json(json_file, writer=None, progress=None, cancel=None):
     """
     Run the features using a JSON file.
 
     Prameters
     ---------
     json_file: str
-        Name of the JSON file with the needed information.
+        Name of the JSON file with the needed information. Newline
+        delimited JSON files (.ndjson or .jsonl) are read and executed
+        one variable at a time. If '-' the configuration will be read
+        from the standard input as newline delimited JSON.
+
+    writer: EquationsWriter or None (optional)
+        If given, the equations of each variable are written with it
+        as soon as they are generated. Default is None.
+
+    progress: callable or None (optional)
+        Function called with a Progress object after executing each
+        variable and after saving each Excel file. Default is None.
+
+    cancel: CancelToken or None (optional)
+        Token to cancel the run, checked before executing each variable
+        and before saving each Excel file. Default is None.
 
     Returns
     -------
-    str
-        The equations to copy in the Vensim model file.
+    str or None
+        The equations to copy in the Vensim model file. None if a writer
+        is given.
 
     """
-    with open(json_file) as file:
-        vars_dict = json.load(file)
+    return execute(read_config(json_file), writer=writer,
+                   progress=progress, cancel=cancel)
 
-    return execute(vars_dict)
 
+def read_config(json_file):
+    """
+    Read the variables configuration from a JSON file.
+
+    Prameters
+    ---------
+    json_file: str
+        Name of the JSON file with the needed information. Newline
+        delimited JSON files (.ndjson or .jsonl) have in each line an
+        object with the configuration of one or several variables, they
+        are parsed line by line. If '-' the configuration will be read
+        from the standard input as newline delimited JSON.
+
+    Yields
+    ------
+    (str, dict)
+        The name and the configuration of each variable.
 
-def execute(vars_dict):
+    """
+    if str(json_file) == '-':
+        yield from _read_ndjson(sys.stdin, '<stdin>')
+    elif Path(json_file).suffix.lower() in NDJSON_SUFFIXES:
+        with open(json_file) as file:
+            yield from _read_ndjson(file, json_file)
+    else:
+        with open(json_file) as file:
+            vars_dict = json.load(file)
+
+        yield from vars_dict.items()
+
+
+def _read_ndjson(file, file_name):
+    """
+    Read a newline delimited JSON configuration line by line.
+
+    Parameters
+    ----------
+    file: file object
+        The opened file.
+
+    file_name: str
+        The name of the file for the error messages.
+
+    Yields
+    ------
+    (str, dict)
+        The name and the configuration of each variable.
+
+    """
+    for n_line, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            vars_dict = json.loads(line)
+        except ValueError as err:
+            raise ValueError(
+                f"\nInvalid JSON in line {n_line} of '{file_name}':\n\t"
+                + str(err))
+
+        yield from vars_dict.items()
+
+
+def execute(vars_dict, writer=None, progress=None, cancel=None):
     """
     Run the features using a dictionary.
 
     Prameters
     ---------
-    vars_dict
-        Python dictionary with the needed information.
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable, e.g., the output
+        of read_config. The iterables are consumed one variable at a
+        time.
+
+    writer: EquationsWriter or None (optional)
+        If given, the equations of each variable are written with it
+        as soon as they are generated. Default is None.
+
+    progress: callable or None (optional)
+        Function called with a Progress object after executing each
+        variable and after saving each Excel file. Default is None.
+
+    cancel: CancelToken or None (optional)
+        Token to cancel the run, checked before executing each variable
+        and before saving each Excel file. If it is cancelled, Cancelled
+        is raised and no Excel file is modified, except the ones already
+        saved because of Excels.set_max_open. Default is None.
+
+    Returns
+    -------
+    str or None
+        The equations to copy in the Vensim model file. None if a writer
+        is given.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is not valid. Dictionaries are validated
+        before executing any variable, while the iterables are validated
+        one variable at a time.
+
+    Cancelled
+        If the run is cancelled with the cancel token.
+
+    """
+    if hasattr(vars_dict, 'items'):
+        # validate the whole configuration before writing any file
+        validate_config(vars_dict)
+        state = Progress(len(vars_dict))
+        vars_dict = vars_dict.items()
+    else:
+        # validate each variable before executing it
+        state = Progress()
+        vars_dict = _validate_each(vars_dict)
+
+    def execute_each():
+        for var, info in vars_dict:
+            if cancel is not None:
+                cancel.check()
+            vensim_eqs = _execute_variable(var, info)
+            state.variables += 1
+            state.current = var
+            if progress is not None:
+                progress(state)
+            yield vensim_eqs
+
+    def on_save(file, n_bytes):
+        state.workbooks += 1
+        state.bytes += n_bytes
+        state.current = str(file)
+        if progress is not None:
+            progress(state)
+
+    try:
+        if writer is None:
+            eqs = list(execute_each())
+        else:
+            for vensim_eqs in execute_each():
+                writer.write(vensim_eqs)
+
+        # save changes and close Excel files
+        state.phase = 'save'
+        state.total_workbooks = len(Excels._Excels)
+        Excels.save_and_close(callback=on_save, cancel=cancel)
+    except BaseException:
+        # do not keep partially modified Excel files for future calls
+        Excels.close()
+        Cache.discard()
+        Manifest.discard()
+        raise
+
+    Cache.commit()
+    Manifest.commit()
+
+    if writer is None:
+        return '\n'.join(eqs)
+
+
+def write_values(vars_dict, values, progress=None, cancel=None):
+    """
+    Write the values of the variables in the Excel files and their
+    cellrange names. Each Excel file is loaded and saved once, after
+    writing all the variables.
+
+    Parameters
+    ----------
+    vars_dict: dict
+        Python dictionary with the needed information of each variable.
+
+    values: dict
+        The values of each variable, as accepted by the write method of
+        the variable classes.
+
+    progress: callable or None (optional)
+        Function called with a Progress object after writing each
+        variable and after saving each Excel file. Default is None.
+
+    cancel: CancelToken or None (optional)
+        Token to cancel the run. Default is None.
 
     Returns
     -------
     str
-        The equations to copy in the Vensim model file.
+        The Vensim equations of all the variables.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration of any variable is not valid.
+
+    Cancelled
+        If the run is cancelled with the cancel token.
 
     """
+    validate_config(vars_dict)
+    missing = [var for var in vars_dict if var not in values]
+    if missing:
+        raise ValueError(
+            f"\nMissing values for the variables {missing}.")
+
+    state = Progress(len(vars_dict))
+
+    def on_save(file, n_bytes):
+        state.workbooks += 1
+        state.bytes += n_bytes
+        state.current = str(file)
+        if progress is not None:
+            progress(state)
+
     eqs = []
+    try:
+        for var, info in vars_dict.items():
+            if cancel is not None:
+                cancel.check()
+            Stats.count('variables')
+            with Stats.span('plan', var):
+                obj = _create_object(var, info)
+                eqs.append(obj.get_vensim(loading=info.get('loading',
+                                                           'DIRECT')))
+            Stats.count('equations', obj._get_n_equations())
+            obj._write_values(values[var])
+            cellranges = obj._get_cellranges()
+            for name, file, sheet, cellrange in cellranges:
+                obj._write_cellrange(
+                    name, file, sheet, cellrange, info.get('force', False))
+            Manifest.add(var, cellranges, obj._get_subscripts())
+            state.variables += 1
+            state.current = var
+            if progress is not None:
+                progress(state)
+
+        state.phase = 'save'
+        state.total_workbooks = len(Excels._Excels)
+        Excels.save_and_close(callback=on_save, cancel=cancel)
+    except BaseException:
+        Excels.close()
+        Manifest.discard()
+        raise
+
+    Manifest.commit()
 
-    for var, info in vars_dict.items():
+    return '\n'.join(eqs)
 
-        if info['type'].lower() == 'constants':
-            # create object
-            obj = Constants(var, **info)
 
-        elif info['type'].lower() == 'lookups':
-            # create object
-            obj = Lookups(var, **info)
-            # add x series
-            obj.add_x(**info['x'])
+def _validate_each(vars_dict):
+    """
+    Validate the configuration of each variable before yielding it.
 
-        elif info['type'].lower() == 'data':
-            # create object
-            obj = Data(var, **info)
-            # add time series
-            obj.add_time(**info['time'])
+    Parameters
+    ----------
+    vars_dict: iterable
+        Iterable of (name, configuration) pairs of each variable.
 
-        else:
-            raise ValueError(
-                f"\n Invalid type of variable '{info['type']}' for '{var}'."
-                + " It must be 'constants', 'lookups' or 'data'.")
+    Yields
+    ------
+    (str, dict)
+        The name and the configuration of each variable.
 
-        # add dimensions
-        for dimension, along in info['dimensions'].items():
-            obj.add_dimension(dimension, *along)
+    """
+    for var, info in vars_dict:
+        validate_config([(var, info)])
+        yield var, info
 
-        if 'force' in info:
-            force = info['force']
-        else:
-            force = False
-        if 'loading' in info:
-            loading = info['loading']
-        else:
-            loading = 'DIRECT'
-        eqs.append(obj.execute(force=force, loading=loading))
 
-    return '\n'.join(eqs)
+def _create_object(var, info):
+    """
+    Create the object of a variable from its configuration.
+
+    Parameters
+    ----------
+    var: str
+        Name of the variable.
+
+    info: dict
+        Configuration of the variable.
+
+    Returns
+    -------
+    obj: Constants, Lookups or Data
+        The object with the dimensions already added.
+
+    """
+    if info['type'].lower() == 'constants':
+        # create object
+        obj = Constants(var, **info)
+
+    elif info['type'].lower() == 'lookups':
+        # create object
+        obj = Lookups(var, **info)
+        # add x series
+        obj.add_x(**info['x'])
+
+    elif info['type'].lower() == 'data':
+        # create object
+        obj = Data(var, **info)
+        # add time series
+        obj.add_time(**info['time'])
+
+    else:
+        raise ValueError(
+            f"\n Invalid type of variable '{info['type']}' for '{var}'."
+            + " It must be 'constants', 'lookups' or 'data'.")
+
+    # add dimensions
+    for dimension, along in info['dimensions'].items():
+        obj.add_dimension(dimension, *along)
+
+    return obj
+
+
+def _execute_variable(var, info):
+    """
+    Get the Vensim equations of a variable and write its cellranges in
+    the opened Excel files. The files are not saved, the caller is in
+    charge of calling Excels.save_and_close and Cache.commit. If the
+    variable is in the Cache the cached equations are returned instead.
+
+    Parameters
+    ----------
+    var: str
+        Name of the variable.
+
+    info: dict
+        Configuration of the variable.
+
+    Returns
+    -------
+    str
+        The equations of the variable.
+
+    """
+    Stats.count('variables')
+    files = _get_files(info)
+    key = Cache.key(var, info, files)
+    cached = Cache.get(key, files)
+    if cached is not None:
+        Stats.count('cache_hits')
+        Stats.count('equations', cached['n_equations'])
+        if Manifest.enabled():
+            # the cellranges are already written, only plan them
+            obj = _create_object(var, info)
+            obj.get_vensim(loading=info.get('loading', 'DIRECT'))
+            Manifest.add(var, obj._get_cellranges(), obj._get_subscripts())
+        return cached['equations']
+
+    if 'force' in info:
+        force = info['force']
+    else:
+        force = False
+    if 'loading' in info:
+        loading = info['loading']
+    else:
+        loading = 'DIRECT'
+
+    with Stats.span('plan', var):
+        obj = _create_object(var, info)
+        vensim_eqs = obj.get_vensim(loading=loading)
+        cellranges = obj._get_cellranges()
+
+    n_equations = obj._get_n_equations()
+    Stats.count('equations', n_equations)
+    for name, file, sheet, cellrange in cellranges:
+        obj._write_cellrange(name, file, sheet, cellrange, force)
+
+    Cache.add(key, var, vensim_eqs, n_equations, cellranges, files)
+    Manifest.add(var, cellranges, obj._get_subscripts())
+
+    return vensim_eqs
+
+
+def _get_files(info):
+    """
+    Get the Excel files used by a variable from its configuration.
+
+    Parameters
+    ----------
+    info: dict
+        Configuration of the variable.
+
+    Returns
+    -------
+    files: set
+        The set of the files.
+
+    """
+    files = set()
+    for read_along, *sep in info.get('dimensions', {}).values():
+        if read_along == 'file' and sep:
+            files.update(sep[0])
+
+    if not files and info.get('file'):
+        files.add(info['file'])
+
+    return files
@@ -0,0 +1,322 @@
+"""
+Table editor to load, edit and save whole configurations in the GUI.
+"""
+import json
+import tkinter as tkk
+from tkinter.filedialog import askopenfilename, asksaveasfilename
+from tkinter.messagebox import showerror
+
+from excels2vensim import read_config
+from excels2vensim.gui.worker import Worker
+from excels2vensim.gui.table import (
+    COLUMNS, KEYS, config_to_rows, rows_to_config, parse_table, check_rows)
+
+# milliseconds without editing before validating the modified rows
+VALIDATE_DELAY = 300
+# milliseconds between the checks of the validation worker
+POLL_INTERVAL = 100
+# width of the entries of each column
+WIDTHS = {'name': 20, 'dimensions': 28, 'description': 30}
+
+
+class TableEditor(tkk.Toplevel):
+    """
+    Window to edit the configuration of all the variables in a table.
+    Only the visible rows are rendered, so it can be used with configs
+    with hundreds of variables. The modified rows are validated in the
+    background, planning their cellranges as execute.
+
+    Parameters
+    ----------
+    master: tkinter widget
+        Parent widget.
+
+    config: dict
+        Configuration of the variables to edit.
+
+    on_apply: callable
+        Function called with the new configuration when applying the
+        changes.
+
+    height: int (optional)
+        Number of visible rows. Default is 15.
+
+    """
+    def __init__(self, master, config, on_apply, height=15):
+        super().__init__(master)
+        self.title("excels2vensim - table editor")
+        self.on_apply = on_apply
+        self.height = height
+        self.rows = config_to_rows(config)
+        self.offset = 0
+        self.errors = {}
+        self.dirty = set(range(len(self.rows)))
+        self.worker = None
+        self._validate_job = None
+        self._rendering = False
+        self.create_widgets()
+        self.render()
+        self.schedule_validation()
+
+    def create_widgets(self):
+        buttons = tkk.Frame(self)
+        buttons.grid(row=0, column=0, columnspan=2, sticky="w", padx=10)
+        for column, (text, command) in enumerate([
+                ('load', self.load), ('save', self.save),
+                ('paste', self.paste), ('add row', self.add_row),
+                ('delete row', self.delete_row), ('apply', self.apply)]):
+            tkk.Button(buttons, text=text, command=command).grid(
+                row=0, column=column, padx=5, pady=10)
+
+        table = tkk.Frame(self)
+        table.grid(row=1, column=0, padx=10)
+        tkk.Label(table, text="").grid(row=0, column=0)
+        for column, (key, header) in enumerate(COLUMNS):
+            tkk.Label(table, text=header).grid(row=0, column=column+1)
+
+        self.var_status = []
+        self.cells = []
+        for row in range(self.height):
+            status = tkk.StringVar(self)
+            tkk.Label(table, textvariable=status, width=3).grid(
+                row=row+1, column=0)
+            self.var_status.append(status)
+            cells = {}
+            for column, key in enumerate(KEYS):
+                var = tkk.StringVar(self)
+                var.trace("w", lambda name, index, mode, row=row, key=key:
+                          self.update_cell(row, key))
+                entry = tkk.Entry(
+                    table, textvariable=var, width=WIDTHS.get(key, 10))
+                entry.grid(row=row+1, column=column+1)
+                entry.bind('<FocusIn>', lambda event, row=row:
+                           self.show_errors(row))
+                for event in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+                    entry.bind(event, self._on_wheel)
+                cells[key] = var
+            self.cells.append(cells)
+
+        self.scrollbar = tkk.Scrollbar(
+            self, orient=tkk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.var_info = tkk.StringVar(self)
+        tkk.Label(self, textvariable=self.var_info, justify=tkk.LEFT).grid(
+            row=2, column=0, columnspan=2, sticky="w", padx=10, pady=10)
+        self.selected = None
+
+    def render(self):
+        """
+        Show the visible rows.
+        """
+        self._rendering = True
+        names = [row['name'].strip() for row in self.rows]
+        for row in range(self.height):
+            index = self.offset + row
+            if index < len(self.rows):
+                for key, var in self.cells[row].items():
+                    var.set(self.rows[index][key])
+                if index in self.dirty:
+                    status = "..."
+                elif self.errors.get(index)\
+                        or names.count(names[index]) > 1:
+                    status = "!"
+                else:
+                    status = "ok"
+            else:
+                for var in self.cells[row].values():
+                    var.set("")
+                status = ""
+            self.var_status[row].set(status)
+        self._rendering = False
+
+        if self.rows:
+            self.scrollbar.set(
+                self.offset / len(self.rows),
+                min(self.offset + self.height, len(self.rows))
+                / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
+        self.show_errors(self.selected)
+
+    def update_cell(self, row, key):
+        """
+        Save the value of an edited cell.
+        """
+        if self._rendering:
+            return
+        index = self.offset + row
+        if index >= len(self.rows):
+            # editing an empty row adds a new one
+            self.rows += [dict.fromkeys(KEYS, "")
+                          for _ in range(index - len(self.rows) + 1)]
+        self.rows[index][key] = self.cells[row][key].get()
+        self.dirty.add(index)
+        self.var_status[row].set("...")
+        self.schedule_validation()
+
+    def show_errors(self, row):
+        """
+        Show the errors of a visible row.
+        """
+        self.selected = row
+        if row is None or self.offset + row >= len(self.rows):
+            self.var_info.set("")
+            return
+        index = self.offset + row
+        name = self.rows[index]['name'].strip()
+        messages = list(self.errors.get(index, []))
+        names = [row['name'].strip() for row in self.rows]
+        if name and names.count(name) > 1:
+            messages.append(f"The variable '{name}' is repeated.")
+        self.var_info.set(
+            f"Row {index+1}: " + ("\n".join(messages) or "valid"))
+
+    def yview(self, *args):
+        if args[0] == tkk.MOVETO:
+            offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == tkk.SCROLL:
+            step = self.height if args[2] == tkk.PAGES else 1
+            offset = self.offset + int(args[1]) * step
+        else:
+            return
+        self._scroll_to(offset)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self._scroll_to(self.offset - 1)
+        else:
+            self._scroll_to(self.offset + 1)
+        return "break"
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.rows) - self.height + 1))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def schedule_validation(self):
+        """
+        Validate the modified rows once the user stops editing.
+        """
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+        self._validate_job = self.after(VALIDATE_DELAY, self.validate)
+
+    def validate(self):
+        """
+        Validate the modified rows in the background.
+        """
+        self._validate_job = None
+        if self.worker is not None:
+            # wait until the current validation finishes
+            self.schedule_validation()
+            return
+        if not self.dirty:
+            return
+        rows = {index: dict(self.rows[index]) for index in self.dirty
+                if index < len(self.rows)}
+        self.dirty = set()
+        self.worker = Worker(check_rows, rows)
+        self.worker.start()
+        self.after(POLL_INTERVAL, self.poll_validation, rows)
+
+    def poll_validation(self, rows):
+        for kind, value in self.worker.poll():
+            self.worker = None
+            if kind == 'done':
+                for index, errors in value.items():
+                    # ignore the rows modified while validating them
+                    if index < len(self.rows) and index not in self.dirty\
+                       and self.rows[index] == rows[index]:
+                        self.errors[index] = errors
+            else:
+                self.dirty.update(rows)
+            self.render()
+            return
+
+        self.after(POLL_INTERVAL, self.poll_validation, rows)
+
+    def set_rows(self, rows):
+        """
+        Replace all the rows and validate them.
+        """
+        self.rows = rows
+        self.offset = 0
+        self.errors = {}
+        self.dirty = set(range(len(self.rows)))
+        self.render()
+        self.schedule_validation()
+
+    def load(self):
+        file = askopenfilename(
+            parent=self, title="Load configuration",
+            filetypes=(('.json files', '*.json *.JSON *.ndjson *.jsonl'),
+                       ("All files", '*')))
+        if not file:
+            return
+        try:
+            self.set_rows(config_to_rows(dict(read_config(file))))
+        except Exception as err:
+            showerror(parent=self, title="Error when loading",
+                      message=f"{type(err).__name__}: {err}")
+
+    def save(self):
+        try:
+            config = rows_to_config(self.rows)
+        except ValueError as err:
+            showerror(parent=self, title="Error when saving",
+                      message=str(err).strip())
+            return
+        outname = asksaveasfilename(
+            parent=self, title="Save configuration",
+            filetypes=(('.json files', '*.json *.JSON'),))
+        if not outname:
+            return
+        if not outname.lower().endswith('.json'):
+            outname += '.json'
+        with open(outname, 'w') as outfile:
+            json.dump(config, outfile, indent=4)
+
+    def paste(self):
+        """
+        Add the rows copied from a CSV file or a spreadsheet.
+        """
+        try:
+            rows = parse_table(self.clipboard_get())
+        except tkk.TclError:
+            rows = []
+        if not rows:
+            showerror(parent=self, title="Error when pasting",
+                      message="The clipboard has no rows.")
+            return
+        self.dirty.update(range(len(self.rows), len(self.rows) + len(rows)))
+        self.rows += rows
+        self.render()
+        self.schedule_validation()
+
+    def add_row(self):
+        self.rows.append(dict.fromkeys(KEYS, ""))
+        self.dirty.add(len(self.rows) - 1)
+        self._scroll_to(len(self.rows))
+        self.render()
+
+    def delete_row(self):
+        if self.selected is None or self.offset + self.selected\
+           >= len(self.rows):
+            return
+        offset = self.offset
+        del self.rows[self.offset + self.selected]
+        # the indexes have changed
+        self.set_rows(self.rows)
+        self._scroll_to(offset)
+
+    def apply(self):
+        try:
+            config = rows_to_config(self.rows)
+        except ValueError as err:
+            showerror(parent=self, title="Error when applying",
+                      message=str(err).strip())
+            return
+        self.on_apply(config)
+        self.destroy()
@@ -2,9 +2,23 @@ import os
 import sys
 import json
 import tkinter as tkk
+from tkinter import ttk
+from contextlib import nullcontext
 from tkinter.filedialog import askopenfilename, asksaveasfilename
 from tkinter.messagebox import showerror, showwarning
-from excels2vensim import Subscripts, execute
+from excels2vensim import Subscripts, execute, Cancelled
+from excels2vensim.utils.profiler import Profiler
+from excels2vensim.gui.worker import Worker
+from excels2vensim.gui.search import SearchIndex, VirtualListbox
+from excels2vensim.gui.editor import TableEditor
+from excels2vensim.gui.preview import get_preview, format_preview
+
+# milliseconds between the checks of the background worker messages
+POLL_INTERVAL = 100
+# milliseconds without typing before updating the subscripts search
+SEARCH_DELAY = 150
+# milliseconds without typing before updating the preview
+PREVIEW_DELAY = 300
 
 
 class Application(tkk.Frame):
@@ -19,8 +33,14 @@ class Application(tkk.Frame):
         self.element_dict = dict()
         self.output_file = output_file
         self.create_vars()
+        self.worker = None
+        self.search_index = SearchIndex([])
+        self._search_job = None
+        self.preview_worker = None
+        self._preview_job = None
+        self._preview_traces = []
+        # the main window is opened once the subscripts are read
         self.subscript_selector(subscript_file)
-        self.main_window()
 
     def create_vars(self):
 
@@ -52,8 +72,7 @@ class Application(tkk.Frame):
         # Subscript name
         self.var_sub = tkk.StringVar(self)
         self.var_sub.trace(
-            "w", lambda name, index, mode: self.update_list(
-                self.non_selected_subs))
+            "w", lambda name, index, mode: self.schedule_update_list())
 
         self.var_subs_info = tkk.StringVar(self)
 
@@ -88,32 +107,55 @@ class Application(tkk.Frame):
 
         if not subscript_file:
             mdl_types = '*.mdl *.MDL'
+            py_types = '*.py'
             json_types = '*.json *.JSON'
 
             subscript_file = askopenfilename(
                     title="Select external data file",
-                    filetypes=(('.mdl and .json files',
-                                ' '.join([mdl_types, json_types])),
+                    filetypes=(('.mdl, .py and .json files',
+                                ' '.join([mdl_types, py_types, json_types])),
                                ('.mdl files', mdl_types),
+                               ('.py files', py_types),
                                ('.json files', json_types),
                                ("All files", '*'))
             )
 
-        if subscript_file.lower().endswith('.mdl'):
-            tkk.Label(self,
-                      text=f"Reading {subscript_file}...\n"
-                           + "This may take some seconds").grid(
-                row=0, column=0, padx=10, pady=10)
-
-        Subscripts.read(subscript_file)
-
-        cwd = os.path.dirname(subscript_file)
-        print(f"Setting current working directory to: {cwd}")
-        os.chdir(cwd)
-
-        self.clean()
-        self.all_subs = list(Subscripts.get_ranges())
-        self.non_selected_subs = self.all_subs.copy()
+        tkk.Label(self,
+                  text=f"Reading {subscript_file}...\n"
+                       + "This may take some seconds").grid(
+            row=0, column=0, padx=10, pady=10)
+        progress_bar = ttk.Progressbar(self, mode="indeterminate", length=300)
+        progress_bar.grid(row=1, column=0, padx=10, pady=10)
+        progress_bar.start()
+
+        # parse the model in the background to keep the window responsive
+        self.worker = Worker(Subscripts.read, subscript_file)
+        self.worker.start()
+        self.after(POLL_INTERVAL, self.poll_subscripts, subscript_file)
+
+    def poll_subscripts(self, subscript_file):
+        for kind, value in self.worker.poll():
+            if kind == 'error':
+                self.worker = None
+                showerror(
+                    title="Error when reading the subscripts",
+                    message=f"{type(value).__name__}: {value}")
+                self.master.destroy()
+                return
+            elif kind == 'done':
+                self.worker = None
+                cwd = os.path.dirname(subscript_file)
+                print(f"Setting current working directory to: {cwd}")
+                os.chdir(cwd)
+
+                self.clean()
+                self.all_subs = list(Subscripts.get_ranges())
+                self.non_selected_subs = self.all_subs.copy()
+                self.search_index = SearchIndex(self.all_subs)
+                self.main_window()
+                return
+
+        self.after(POLL_INTERVAL, self.poll_subscripts, subscript_file)
 
     def main_window(self):
 
@@ -156,15 +198,10 @@ class Application(tkk.Frame):
         self.entry_subs = tkk.Entry(self, textvariable=self.var_sub)
         self.entry_subs.grid(row=subs_start+3, column=0)
 
-        self.right_scrollbar = tkk.Scrollbar(self, orient=tkk.VERTICAL)
-        self.lstbox = tkk.Listbox(
-            self, yscrollcommand=self.right_scrollbar.set, height=6)
-        self.right_scrollbar.grid(
-            row=subs_start, column=1, rowspan=4, padx=10)
+        self.lstbox = VirtualListbox(self, height=6)
         self.lstbox.grid(
             row=subs_start, column=1, rowspan=4, padx=10)
-        self.right_scrollbar.config(command=self.lstbox.yview)
-        self.lstbox.bind('<<ListboxSelect>>', self.add_subs)
+        self.lstbox.bind_select(self.add_subs)
         self.populate_list()
 
         tkk.Label(self, textvariable=self.var_subs_info).grid(
@@ -221,6 +258,11 @@ class Application(tkk.Frame):
 
         # next
         next_start = 13
+        self.next_button = tkk.Button(self)
+        self.next_button['text'] = 'table editor'
+        self.next_button['command'] = self.table_editor
+        self.next_button.grid(row=next_start, column=3, padx=10, pady=10)
+
         self.next_button = tkk.Button(self)
         self.next_button['text'] = 'next'
         self.next_button['command'] = self.next
@@ -302,6 +344,26 @@ class Application(tkk.Frame):
         self.next_button['command'] = self.add
         self.next_button.grid(row=end_start, column=4, padx=10, pady=10)
 
+        # preview of the equations and cellranges
+        tkk.Label(self, text="Preview").grid(
+            row=0, column=5, padx=10, pady=10)
+        self.preview_text = tkk.Text(self, width=70, height=25)
+        self.preview_text.grid(
+            row=1, column=5, rowspan=end_start, padx=10, pady=10)
+        self.preview_text['state'] = tkk.DISABLED
+
+        preview_vars = [*self.var_along.values(), *self.var_sep.values()]\
+            if self.subs else []
+        if self.var_type.get() != "Constants":
+            preview_vars += [self.series_name, self.series_along,
+                             self.series_cell, self.series_len]
+        # the traces are removed when leaving the window
+        self._preview_traces = [
+            (var, var.trace_add(
+                "write", lambda name, index, mode: self.schedule_preview()))
+            for var in preview_vars]
+        self.schedule_preview()
+
     def last_window(self):
         tkk.Label(self, text="Current elements:").grid(
                 row=0, column=0, columnspan=4, padx=10, pady=10)
@@ -311,6 +373,11 @@ class Application(tkk.Frame):
 
         # go
         end_start = i + 2
+        self.next_button = tkk.Button(self)
+        self.next_button['text'] = 'table editor'
+        self.next_button['command'] = self.table_editor
+        self.next_button.grid(row=end_start, column=1, padx=10, pady=10)
+
         self.next_button = tkk.Button(self)
         self.next_button['text'] = 'new element'
         self.next_button['command'] = self.new_element
@@ -355,31 +422,31 @@ class Application(tkk.Frame):
         elif self.force_warning:
             self.force_warning.destroy()
 
+    def schedule_update_list(self):
+        """
+        Update the list of subscripts once the user stops typing
+        """
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY, self.update_list)
+
     def update_list(self, *args):
         """
         Updates the list of variables in lstbox based on the user input
-        :param list_:
-        :return:
         """
-        search_term = self.var_sub.get()
-
-        self.lstbox.delete(0, tkk.END)
-
-        for item in self.non_selected_subs:
-            if search_term.lower() in item.lower():
-                self.lstbox.insert(tkk.END, item)
+        self._search_job = None
+        try:
+            self.lstbox.set_items(self.search_index.search(
+                self.var_sub.get(), exclude=self.subs))
+        except tkk.TclError:
+            # the list is not shown
+            pass
 
     def populate_list(self):
-        self.lstbox.delete(0, tkk.END)
-        for item in self.non_selected_subs:
-            self.lstbox.insert(tkk.END, item)
+        self.lstbox.set_items(
+            self.search_index.search('', exclude=self.subs))
 
-    def add_subs(self, sub):
-        w = sub.widget
-        try:
-            new_sub = w.get(w.curselection()[0])
-        except IndexError:
-            return
+    def add_subs(self, new_sub):
         self.subs.append(new_sub)
         self.non_selected_subs.remove(new_sub)
         self.entry_subs.delete(0, 'end')
@@ -513,10 +580,20 @@ class Application(tkk.Frame):
                 warn += 1
         if warn:
             return
+        name, element = self.get_element()
+        self.element_dict[name] = element
+
+        self.clean_all()
+        self.last_window()
+
+    def get_element(self):
+        """
+        Get the name and the configuration of the current element
+        """
         name = self.var_name.get()
         var_type = self.var_type.get()
 
-        self.element_dict[name] = {
+        element = {
             "type": var_type,
             "force": self.var_force.get(),
             "loading": self.var_loading.get(),
@@ -532,33 +609,82 @@ class Application(tkk.Frame):
             }
         }
 
-        for sub, (along, _) in self.element_dict[name]["dimensions"].items():
+        for sub, (along, _) in element["dimensions"].items():
             if along in ['row', 'col']:
-                self.element_dict[name]["dimensions"][sub][1] =\
+                element["dimensions"][sub][1] =\
                     int(self.var_sep[sub].get())
             else:
-                self.element_dict[name]["dimensions"][sub][1] =\
+                element["dimensions"][sub][1] =\
                     [el.strip() for el in self.var_sep[sub].get().split(',')]
 
         if var_type == 'Lookups':
-            self.element_dict[name]['x'] = {
+            element['x'] = {
                 "name": self.series_name.get(),
                 "cell": self.series_cell.get(),
                 "read_along": self.series_along.get(),
                 "length": self.series_len.get()
                 }
         elif var_type == 'Data':
-            self.element_dict[name]['time'] = {
+            element['time'] = {
                 "name": self.series_name.get(),
                 "cell": self.series_cell.get(),
                 "read_along": self.series_along.get(),
                 "length": self.series_len.get()
                 }
             if self.var_type_data.get() != "none":
-                self.element_dict[name]['interp'] = self.var_type_data.get()
+                element['interp'] = self.var_type_data.get()
 
-        self.clean_all()
-        self.last_window()
+        return name, element
+
+    def schedule_preview(self):
+        """
+        Update the preview once the user stops typing
+        """
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+        self._preview_job = self.after(PREVIEW_DELAY, self.update_preview)
+
+    def update_preview(self):
+        """
+        Compute the preview of the current element in the background
+        """
+        self._preview_job = None
+        if self.preview_worker is not None:
+            # wait until the current preview finishes
+            self.schedule_preview()
+            return
+        try:
+            name, element = self.get_element()
+        except (ValueError, tkk.TclError):
+            self.show_preview("Incomplete information...")
+            return
+
+        self.show_preview("Computing preview...")
+        self.preview_worker = Worker(
+            get_preview, name, json.loads(json.dumps(element)))
+        self.preview_worker.start()
+        self.after(POLL_INTERVAL, self.poll_preview)
+
+    def poll_preview(self):
+        for kind, value in self.preview_worker.poll():
+            self.preview_worker = None
+            if kind == 'done':
+                self.show_preview(format_preview(value))
+            else:
+                self.show_preview(f"{type(value).__name__}: {value}")
+            return
+
+        self.after(POLL_INTERVAL, self.poll_preview)
+
+    def show_preview(self, text):
+        try:
+            self.preview_text['state'] = tkk.NORMAL
+            self.preview_text.delete("1.0", tkk.END)
+            self.preview_text.insert("1.0", text)
+            self.preview_text['state'] = tkk.DISABLED
+        except (AttributeError, tkk.TclError):
+            # the preview is not shown
+            pass
 
     def new_element(self):
         self.clean()
@@ -574,11 +700,30 @@ class Application(tkk.Frame):
         with open(outname, 'w') as outfile:
             json.dump(self.element_dict, outfile, indent=4)
 
+    def table_editor(self):
+        TableEditor(self, self.element_dict, self.apply_table)
+
+    def apply_table(self, config):
+        self.element_dict = config
+        self.clean_all()
+        if self.element_dict:
+            self.last_window()
+        else:
+            self.main_window()
+
     def previous(self):
         self.clean()
         self.main_window()
 
     def clean(self):
+        # stop updating the preview of the second window
+        for var, trace in self._preview_traces:
+            var.trace_remove("write", trace)
+        self._preview_traces = []
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+            self._preview_job = None
+
         for slave in self.grid_slaves():
             slave.destroy()
 
@@ -599,32 +744,94 @@ class Application(tkk.Frame):
         self.clean()
 
     def execute(self):
-        try:
-            vensim_eqs = execute(self.element_dict)
-            if self.output_file:
-                outname = self.output_file
-            else:
-                outname = asksaveasfilename(
-                        title="Save vensim equations",
-                        filetypes=(('.txt files', '*.txt'),
-                                   ('All files', '*'))
-                        )
-            if not outname.lower().endswith('.txt'):
-                outname += '.txt'
-            with open(outname, 'w') as file:
-                file.write(vensim_eqs)
-        except Exception as err:
-            showerror(
-                title="Error when executing",
-                message=type(err).__name__) + ":" + err.args[0]
-            raise err
-        self.destroy()
-        sys.exit()
-
-
-def start_gui(subscript_file=None, output_file=None):
-    root = tkk.Tk()
-    root.title("excels2vensim")
-    app = Application(
-        master=root, subscript_file=subscript_file, output_file=output_file)
-    app.mainloop()
+        if self.output_file:
+            outname = self.output_file
+        else:
+            outname = asksaveasfilename(
+                    title="Save vensim equations",
+                    filetypes=(('.txt files', '*.txt'),
+                               ('All files', '*'))
+                    )
+            if not outname:
+                return
+        if not outname.lower().endswith('.txt'):
+            outname += '.txt'
+
+        self.clean()
+        self.var_progress = tkk.StringVar(self)
+        self.var_progress.set("Executing...")
+        tkk.Label(self, textvariable=self.var_progress).grid(
+            row=0, column=0, columnspan=2, padx=10, pady=10)
+        self.progress_bar = ttk.Progressbar(
+            self, mode="determinate", length=300,
+            maximum=max(len(self.element_dict), 1))
+        self.progress_bar.grid(
+            row=1, column=0, columnspan=2, padx=10, pady=10)
+        self.cancel_button = tkk.Button(self)
+        self.cancel_button['text'] = 'cancel'
+        self.cancel_button['command'] = self.cancel
+        self.cancel_button.grid(row=2, column=1, padx=10, pady=10)
+
+        # execute in the background to keep the window responsive
+        self.worker = Worker(execute, dict(self.element_dict), progress=True)
+        self.worker.start()
+        self.after(POLL_INTERVAL, self.poll_execute, outname)
+
+    def poll_execute(self, outname):
+        for kind, value in self.worker.poll():
+            if kind == 'progress':
+                self.update_progress(value)
+            elif kind == 'done':
+                self.worker = None
+                with open(outname, 'w') as file:
+                    file.write(value)
+                self.destroy()
+                sys.exit()
+            elif kind == 'error':
+                self.worker = None
+                if isinstance(value, Cancelled):
+                    showwarning(
+                        title="Execution cancelled",
+                        message="The execution has been cancelled, "
+                                + "the Excel files have not been modified.")
+                else:
+                    showerror(
+                        title="Error when executing",
+                        message=f"{type(value).__name__}: {value}")
+                self.clean()
+                self.last_window()
+                return
+
+        self.after(POLL_INTERVAL, self.poll_execute, outname)
+
+    def update_progress(self, progress):
+        if progress['phase'] == 'save':
+            self.progress_bar.configure(
+                maximum=max(progress['total_workbooks'] or 1, 1),
+                value=progress['workbooks'])
+            self.var_progress.set(
+                f"Saving {progress['current']} "
+                f"({progress['workbooks']}/{progress['total_workbooks']})")
+        else:
+            self.progress_bar.configure(value=progress['variables'])
+            self.var_progress.set(
+                f"Executing {progress['current']} "
+                f"({progress['variables']}/{progress['total_variables']})")
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button['state'] = tkk.DISABLED
+            self.var_progress.set("Cancelling...")
+
+
+def start_gui(subscript_file=None, output_file=None, profile=None):
+    # profile the whole session, from the subscripts parsing
+    profiler = Profiler(profile) if profile else nullcontext()
+    with profiler:
+        root = tkk.Tk()
+        root.title("excels2vensim")
+        app = Application(
+            master=root, subscript_file=subscript_file,
+            output_file=output_file)
+        app.mainloop()
@@ -0,0 +1,118 @@
+"""
+Preview of the equations and cellranges of a variable in the GUI.
+"""
+from openpyxl.utils.cell import get_column_letter
+
+from excels2vensim.excels2vensim import _create_object
+from excels2vensim.utils.reader import read_cellranges, _boundaries
+
+# number of equations and cellranges shown in the preview
+N_PREVIEW = 10
+
+
+def get_preview(var, info, n=N_PREVIEW, values=True):
+    """
+    Plan the equations and cellranges of a variable as execute without
+    writing any Excel file.
+
+    Parameters
+    ----------
+    var: str
+        Name of the variable.
+
+    info: dict
+        Configuration of the variable.
+
+    n: int (optional)
+        Number of equations and cellranges to include. Default is 10.
+
+    values: bool (optional)
+        If True, the values of the corner cells of the included
+        cellranges are read from the Excel files. Default is True.
+
+    Returns
+    -------
+    dict
+        The first n 'equations' and 'cellranges', as (name, file, sheet,
+        cellrange), the total number of equations and cellranges,
+        'n_equations' and 'n_cellranges', and if values is True, the
+        (top-left, bottom-right) values of each included cellrange in
+        'corners' or the error when reading them in 'values_error'.
+
+    """
+    obj = _create_object(var, info)
+    vensim_eqs = obj.get_vensim(loading=info.get('loading', 'DIRECT'))
+    cellranges = obj._get_cellranges()
+    equations = [eq.strip() for eq in vensim_eqs.split("~~|")]
+
+    preview = {
+        'equations': equations[:n],
+        'n_equations': obj._get_n_equations(),
+        'cellranges': cellranges[:n],
+        'n_cellranges': len(cellranges)
+    }
+    if not values:
+        return preview
+
+    # only read the corner cells of the shown cellranges
+    corners = [
+        (file, sheet, *_corners(cellrange))
+        for _, file, sheet, cellrange in preview['cellranges']]
+    try:
+        read = read_cellranges(
+            ((file, sheet, cell) for file, sheet, *cells in corners
+             for cell in cells), single_pass=False)
+    except Exception as err:
+        preview['values_error'] = f"{type(err).__name__}: {err}".strip()
+    else:
+        preview['corners'] = [
+            (read[file, sheet, first][0][0], read[file, sheet, last][0][0])
+            for file, sheet, first, last in corners]
+
+    return preview
+
+
+def format_preview(preview):
+    """
+    Format a preview as text.
+
+    Parameters
+    ----------
+    preview: dict
+        Preview returned by get_preview.
+
+    Returns
+    -------
+    str
+
+    """
+    lines = [f"Equations ({len(preview['equations'])} of "
+             f"{preview['n_equations']}):"]
+    lines += preview['equations']
+    if len(preview['equations']) < preview['n_equations']:
+        lines.append("...")
+
+    lines += ["", f"Cellranges ({len(preview['cellranges'])} of "
+                  f"{preview['n_cellranges']}):"]
+    corners = preview.get('corners', [None] * len(preview['cellranges']))
+    for (name, file, _, cellrange), values in zip(
+            preview['cellranges'], corners):
+        line = f"{name}: '{file}' {cellrange}"
+        if values is not None:
+            line += f" [{values[0]} ... {values[1]}]"
+        lines.append(line)
+    if len(preview['cellranges']) < preview['n_cellranges']:
+        lines.append("...")
+    if 'values_error' in preview:
+        lines += ["", "Cannot read the values:", preview['values_error']]
+
+    return "\n".join(lines)
+
+
+def _corners(cellrange):
+    """
+    Get the top-left and bottom-right cells of a cellrange.
+    """
+    min_row, min_col, max_row, max_col = _boundaries(cellrange)
+    return (f"{get_column_letter(min_col)}{min_row}",
+            f"{get_column_letter(max_col)}{max_row}")
@@ -0,0 +1,197 @@
+"""
+Search index and virtualized listbox for the subscript selector.
+"""
+import tkinter as tkk
+from bisect import bisect_left
+
+
+class SearchIndex():
+    """
+    Case insensitive index to search a list of names by prefix or
+    substring. The names starting with the search term are returned
+    first and then the ones containing it, both in the original order.
+    When the term extends the previous one, e.g., when typing, only the
+    previous results are searched again.
+
+    Parameters
+    ----------
+    names: iterable
+        Names to index.
+
+    Examples
+    --------
+    >>> index = SearchIndex(['region', 'Subregion', 'age'])
+    >>> index.search('reg')
+    ['region', 'Subregion']
+
+    """
+    def __init__(self, names):
+        self.names = list(names)
+        self._lower = [name.lower() for name in self.names]
+        # (lowered name, position) sorted for the prefix search
+        self._sorted = sorted(
+            (name, position) for position, name in enumerate(self._lower))
+        self._last = ('', None)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, term, exclude=()):
+        """
+        Search the names matching a term.
+
+        Parameters
+        ----------
+        term: str
+            Term to search. All the names are returned if it is empty.
+
+        exclude: iterable (optional)
+            Names to exclude from the results, e.g., already selected
+            ones. Default is ().
+
+        Returns
+        -------
+        list
+            The matching names, the ones starting with the term first.
+
+        """
+        term = term.lower()
+        last_term, last_results = self._last
+        if not term:
+            positions = range(len(self.names))
+        elif last_results is not None and term.startswith(last_term):
+            # narrow the previous results
+            positions = self._narrow(term, last_results)
+        else:
+            positions = self._prefix(term) + sorted(
+                position for position, name in enumerate(self._lower)
+                if term in name and not name.startswith(term))
+
+        self._last = (term, positions if term else None)
+
+        exclude = set(exclude)
+        return [
+            self.names[position] for position in positions
+            if self.names[position] not in exclude]
+
+    def _prefix(self, term):
+        """
+        Get the positions of the names starting with the term, using the
+        sorted names.
+        """
+        start = bisect_left(self._sorted, (term, -1))
+        positions = []
+        for name, position in self._sorted[start:]:
+            if not name.startswith(term):
+                break
+            positions.append(position)
+        return sorted(positions)
+
+    def _narrow(self, term, positions):
+        """
+        Get the positions of the previous results matching the new term,
+        keeping the prefix matches first.
+        """
+        prefix, substring = [], []
+        for position in positions:
+            name = self._lower[position]
+            if name.startswith(term):
+                prefix.append(position)
+            elif term in name:
+                substring.append(position)
+        # previous substring matches cannot become prefix matches
+        return prefix + substring
+
+
+class VirtualListbox(tkk.Frame):
+    """
+    Listbox that only renders the visible rows, so it can show long
+    lists without slowing down the GUI. The scrollbar is computed from
+    the full list of items.
+
+    Parameters
+    ----------
+    master: tkinter widget
+        Parent widget.
+
+    height: int (optional)
+        Number of visible rows. Default is 6.
+
+    """
+    def __init__(self, master, height=6, **kwargs):
+        super().__init__(master, **kwargs)
+        self.height = height
+        self.items = []
+        self.offset = 0
+        self.scrollbar = tkk.Scrollbar(
+            self, orient=tkk.VERTICAL, command=self.yview)
+        self.listbox = tkk.Listbox(self, height=height, exportselection=False)
+        self.listbox.grid(row=0, column=0)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        for event in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.listbox.bind(event, self._on_wheel)
+
+    def bind_select(self, command):
+        """
+        Call the command with the selected item when selecting a row.
+        """
+        def on_select(event):
+            item = self.selection()
+            if item is not None:
+                command(item)
+        self.listbox.bind('<<ListboxSelect>>', on_select)
+
+    def set_items(self, items):
+        """
+        Replace the items of the list and scroll to the top.
+        """
+        self.items = list(items)
+        self.offset = 0
+        self._render()
+
+    def selection(self):
+        """
+        Get the selected item, None if there is no selection.
+        """
+        selected = self.listbox.curselection()
+        if not selected:
+            return None
+        return self.items[self.offset + selected[0]]
+
+    def yview(self, *args):
+        """
+        Scroll the list, used as the command of the scrollbar.
+        """
+        if args[0] == tkk.MOVETO:
+            offset = int(float(args[1]) * len(self.items))
+        elif args[0] == tkk.SCROLL:
+            step = self.height if args[2] == tkk.PAGES else 1
+            offset = self.offset + int(args[1]) * step
+        else:
+            return
+        self._scroll_to(offset)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self._scroll_to(self.offset - 1)
+        else:
+            self._scroll_to(self.offset + 1)
+        return "break"
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.items) - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        self.listbox.delete(0, tkk.END)
+        visible = self.items[self.offset:self.offset+self.height]
+        if visible:
+            self.listbox.insert(tkk.END, *visible)
+        if self.items:
+            self.scrollbar.set(
+                self.offset / len(self.items),
+                (self.offset + len(visible)) / len(self.items))
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,310 @@
+"""
+Conversion between the configuration of the variables and the rows of
+the table editor of the GUI.
+"""
+import csv
+import io
+
+from excels2vensim.excels2vensim import _create_object
+from excels2vensim.utils.validation import get_errors, SERIES
+
+
+# (key, header) of each column of the table
+COLUMNS = [
+    ('name', "Name"),
+    ('type', "Type"),
+    ('dims', "Dims"),
+    ('dimensions', "Dimensions"),
+    ('cell', "Cell"),
+    ('file', "File"),
+    ('sheet', "Sheet"),
+    ('series_name', "Series name"),
+    ('series_cell', "Series cell"),
+    ('series_along', "Series along"),
+    ('series_length', "Series length"),
+    ('interp', "Interp"),
+    ('loading', "Loading"),
+    ('force', "Force"),
+    ('units', "Units"),
+    ('description', "Description"),
+]
+KEYS = [key for key, _ in COLUMNS]
+
+# fields that are only added to the configuration if they are given
+OPTIONAL_FIELDS = ['file', 'sheet', 'interp', 'loading', 'units',
+                   'description']
+
+TRUE_VALUES = ['true', 'yes', '1']
+FALSE_VALUES = ['false', 'no', '0']
+
+
+def config_to_rows(config):
+    """
+    Convert the configuration of the variables to table rows.
+
+    Parameters
+    ----------
+    config: dict
+        Configuration of the variables.
+
+    Returns
+    -------
+    list
+        The rows as dictionaries of strings with the KEYS.
+
+    Examples
+    --------
+    >>> config_to_rows({'var': {
+    ...     'type': 'constants', 'dims': ['region', 'age'],
+    ...     'dimensions': {'region': ['row', 1], 'age': ['sheet', ['A', 'B']]},
+    ...     'cell': 'B3', 'file': 'inputs.xlsx'}})[0]['dimensions']
+    'region:row:1; age:sheet:A,B'
+
+    """
+    rows = []
+    for var, info in config.items():
+        row = dict.fromkeys(KEYS, "")
+        row['name'] = var
+        row['type'] = str(info.get('type', ""))
+        row['dims'] = ", ".join(info.get('dims', []))
+        dimensions = []
+        for dim, along in info.get('dimensions', {}).items():
+            read_along, sep = (list(along) + [1])[:2]
+            if isinstance(sep, (list, tuple)):
+                sep = ",".join(sep)
+            dimensions.append(f"{dim}:{read_along}:{sep}")
+        row['dimensions'] = "; ".join(dimensions)
+        row['cell'] = str(info.get('cell', ""))
+        for key in OPTIONAL_FIELDS:
+            row[key] = str(info.get(key, ""))
+        if 'force' in info:
+            row['force'] = str(info['force']).lower()
+
+        series = info.get(SERIES.get(row['type'].lower()), {})
+        row['series_name'] = str(series.get('name', ""))
+        row['series_cell'] = str(series.get('cell', ""))
+        row['series_along'] = str(series.get('read_along', ""))
+        row['series_length'] = str(series.get('length', ""))
+        rows.append(row)
+
+    return rows
+
+
+def row_to_info(row):
+    """
+    Convert a table row to the configuration of a variable. The empty
+    optional fields are not included.
+
+    Parameters
+    ----------
+    row: dict
+        Row with the KEYS, the missing keys are taken as empty.
+
+    Returns
+    -------
+    var: str
+        Name of the variable.
+
+    info: dict
+        Configuration of the variable.
+
+    Raises
+    ------
+    ValueError
+        If the name is missing or a value cannot be converted.
+
+    """
+    def get(key):
+        return str(row.get(key) or "").strip()
+
+    var = get('name')
+    if not var:
+        raise ValueError("\nThe variable name must be given.")
+
+    info = {
+        'type': get('type'),
+        'dims': [dim.strip() for dim in get('dims').split(",")
+                 if dim.strip()],
+        'dimensions': {},
+        'cell': get('cell')
+    }
+    for dimension in get('dimensions').split(";"):
+        if not dimension.strip():
+            continue
+        try:
+            dim, read_along, sep = [
+                value.strip() for value in dimension.split(":", 2)]
+        except ValueError:
+            raise ValueError(
+                f"\nInvalid dimension '{dimension.strip()}' for '{var}'. "
+                "It must be given as 'dim:read_along:sep'.")
+        if read_along in ['row', 'col']:
+            info['dimensions'][dim] = [read_along, _to_int(sep, var, dim)]
+        else:
+            info['dimensions'][dim] = [
+                read_along, [value.strip() for value in sep.split(",")]]
+
+    for key in OPTIONAL_FIELDS:
+        if get(key):
+            info[key] = get(key)
+
+    if get('force'):
+        if get('force').lower() in TRUE_VALUES:
+            info['force'] = True
+        elif get('force').lower() in FALSE_VALUES:
+            info['force'] = False
+        else:
+            raise ValueError(
+                f"\nInvalid force value '{get('force')}' for '{var}'. "
+                "It must be 'true' or 'false'.")
+
+    if info['type'].lower() in SERIES:
+        info[SERIES[info['type'].lower()]] = {
+            'name': get('series_name'),
+            'cell': get('series_cell'),
+            'read_along': get('series_along'),
+            'length': _to_int(get('series_length'), var, 'series length')
+        }
+
+    return var, info
+
+
+def rows_to_config(rows):
+    """
+    Convert the table rows to the configuration of the variables.
+
+    Parameters
+    ----------
+    rows: list
+        Rows with the KEYS.
+
+    Returns
+    -------
+    dict
+        Configuration of the variables.
+
+    Raises
+    ------
+    ValueError
+        If a row cannot be converted or a variable name is repeated.
+
+    """
+    config = {}
+    for row in rows:
+        var, info = row_to_info(row)
+        if var in config:
+            raise ValueError(f"\nThe variable '{var}' is repeated.")
+        config[var] = info
+
+    return config
+
+
+def parse_table(text):
+    """
+    Parse the rows pasted from a CSV file or a spreadsheet, where the
+    values are separated by tabs. If the first row has the column keys
+    or headers, they are used to assign the values, otherwise the
+    values are assigned in the order of the COLUMNS.
+
+    Parameters
+    ----------
+    text: str
+        Pasted text.
+
+    Returns
+    -------
+    list
+        The rows as dictionaries of strings with the KEYS.
+
+    """
+    lines = text.strip("\r\n")
+    delimiter = "\t" if "\t" in lines.split("\n", 1)[0] else ","
+    values = [
+        line for line in csv.reader(io.StringIO(lines), delimiter=delimiter)
+        if any(value.strip() for value in line)]
+    if not values:
+        return []
+
+    names = {
+        name.lower(): key for key, header in COLUMNS
+        for name in [key, header]}
+    header = [names.get(value.strip().lower()) for value in values[0]]
+    if all(header):
+        values = values[1:]
+    else:
+        header = KEYS
+
+    rows = []
+    for line in values:
+        row = dict.fromkeys(KEYS, "")
+        row.update(
+            (key, value.strip()) for key, value in zip(header, line))
+        rows.append(row)
+
+    return rows
+
+
+def check_row(row):
+    """
+    Check a table row without reading or writing any Excel file. The
+    configuration is validated and the cellranges are planned as in
+    execute.
+
+    Parameters
+    ----------
+    row: dict
+        Row with the KEYS.
+
+    Returns
+    -------
+    list
+        The error messages, empty if the row is valid.
+
+    """
+    try:
+        var, info = row_to_info(row)
+    except ValueError as err:
+        return [str(err).strip()]
+
+    errors = get_errors(var, info)
+    if errors:
+        return [f"{message} ({path})" for _, path, message in errors]
+
+    try:
+        obj = _create_object(var, info)
+        obj.get_vensim(loading=info.get('loading', 'DIRECT'))
+        obj._get_cellranges()
+    except Exception as err:
+        return [f"{type(err).__name__}: {str(err).strip()}"]
+
+    return []
+
+
+def check_rows(rows):
+    """
+    Check several table rows.
+
+    Parameters
+    ----------
+    rows: dict
+        Rows with the KEYS by their index.
+
+    Returns
+    -------
+    dict
+        The error messages of each row by its index.
+
+    """
+    return {index: check_row(row) for index, row in rows.items()}
+
+
+def _to_int(value, var, field):
+    """
+    Convert an integer value of a row.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"\nInvalid {field} '{value}' for '{var}'. "
+            "It must be an integer.")
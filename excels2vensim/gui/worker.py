@@ -0,0 +1,100 @@
+"""
+Background worker for running the heavy tasks of the GUI.
+"""
+import queue
+import threading
+
+from excels2vensim.utils.progress import CancelToken
+from excels2vensim.utils.profiler import Profiler
+
+
+class Worker():
+    """
+    Class to run a function in a background thread. The progress, the
+    result and the errors are put in a queue, which is read from the Tk
+    thread by polling with the poll method, e.g., using after. Thus,
+    the Tk main loop is never blocked.
+
+    Parameters
+    ----------
+    function: callable
+        Function to run.
+
+    *args
+        Arguments to pass to the function.
+
+    progress: bool (optional)
+        If True, the function is called with the progress and cancel
+        keyword arguments, as execute and load_from_json. Default is
+        False.
+
+    **kwargs
+        Keyword arguments to pass to the function.
+
+    """
+    def __init__(self, function, *args, progress=False, **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.token = CancelToken()
+        if progress:
+            self.kwargs.update(progress=self._progress, cancel=self.token)
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Start running the function.
+        """
+        self._thread.start()
+
+    def cancel(self):
+        """
+        Cancel the run. The function must accept a cancel token.
+        """
+        self.token.cancel()
+
+    def poll(self):
+        """
+        Get the messages sent by the worker since the last call.
+
+        Returns
+        -------
+        list
+            List of the (kind, value) messages, where kind is 'progress'
+            with a dictionary of the progress values, 'done' with the
+            result of the function or 'error' with the raised exception.
+
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def is_alive(self):
+        """
+        True if the function is running.
+        """
+        return self._thread.is_alive()
+
+    def _run(self):
+        """
+        Run the function and put the result or the error in the queue.
+        """
+        try:
+            with Profiler.thread():
+                result = self.function(*self.args, **self.kwargs)
+        except BaseException as err:
+            self._queue.put(('error', err))
+        else:
+            self._queue.put(('done', result))
+
+    def _progress(self, progress):
+        """
+        Put a copy of the progress in the queue, as the progress object
+        is updated in the worker thread.
+        """
+        self._queue.put(('progress', dict(vars(progress))))
@@ -0,0 +1,223 @@
+"""
+Cache manager class.
+"""
+import json
+import hashlib
+from pathlib import Path
+
+from .subscripts import Subscripts
+from .._version import __version__
+
+
+class Cache():
+    """
+    Class to cache on disk the results of each variable. The results are
+    saved under a key hashing the configuration of the variable, the
+    subscript ranges it uses and the library version. The Excel files
+    are also tracked, so the variables whose Excel files were modified
+    outside excels2vensim are executed again.
+    """
+    _directory = None
+    _workbooks = {}
+    _pending = []
+
+    @classmethod
+    def set_directory(cls, directory):
+        """
+        Set the cache directory. If None the cache is disabled.
+
+        Parameters
+        ----------
+        directory: str or pathlib.Path or None
+            Directory to save the cache files in. It will be created if
+            it does not exist.
+
+        """
+        cls._pending = []
+        if directory is None:
+            cls._directory = None
+            cls._workbooks = {}
+            return
+
+        cls._directory = Path(directory).resolve()
+        cls._directory.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(cls._directory / "workbooks.json") as file:
+                cls._workbooks = json.load(file)
+        except (OSError, ValueError):
+            cls._workbooks = {}
+
+    @classmethod
+    def key(cls, var, info, files):
+        """
+        Get the key of a variable. Returns None if the cache is disabled.
+
+        Parameters
+        ----------
+        var: str
+            Name of the variable.
+
+        info: dict
+            Configuration of the variable.
+
+        files: iterable
+            Excel files used by the variable.
+
+        Returns
+        -------
+        str or None
+            The key of the variable.
+
+        """
+        if cls._directory is None:
+            return None
+
+        return cls._hash(var, info, files)
+
+    @classmethod
+    def get(cls, key, files):
+        """
+        Get the cached results of a variable.
+
+        Parameters
+        ----------
+        key: str or None
+            Key of the variable.
+
+        files: iterable
+            Excel files used by the variable.
+
+        Returns
+        -------
+        dict or None
+            The 'equations' and the number of equations, 'n_equations',
+            if they are cached and the Excel files have not been modified
+            since they were written, None otherwise.
+
+        """
+        if key is None:
+            return None
+
+        for file in files:
+            if cls._workbooks.get(cls._path(file))\
+               != cls._signature(file):
+                return None
+
+        try:
+            with open(cls._entry(key)) as file:
+                entry = json.load(file)
+            return {key: entry[key] for key in ['equations', 'n_equations']}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def add(cls, key, var, equations, n_equations, cellranges, files):
+        """
+        Add the results of a variable. They will be saved when calling
+        commit, after saving the Excel files.
+
+        Parameters
+        ----------
+        key: str or None
+            Key of the variable.
+
+        var: str
+            Name of the variable.
+
+        equations: str
+            The equations of the variable.
+
+        n_equations: int
+            The number of equations of the variable.
+
+        cellranges: list
+            The list of (name, file, sheet, cellrange) written.
+
+        files: iterable
+            Excel files used by the variable.
+
+        """
+        if key is None:
+            return
+
+        cls._pending.append((key, {
+            'variable': var,
+            'equations': equations,
+            'n_equations': n_equations,
+            'cellranges': [list(cellrange) for cellrange in cellranges],
+            'files': sorted(files)
+        }))
+
+    @classmethod
+    def commit(cls):
+        """
+        Saves the added results and the current state of the written
+        Excel files.
+        """
+        if cls._directory is None:
+            return
+
+        for key, entry in cls._pending:
+            path = cls._entry(key)
+            path.parent.mkdir(exist_ok=True)
+            with open(path, 'w') as file:
+                json.dump(entry, file)
+
+            for excel in entry['files']:
+                cls._workbooks[cls._path(excel)] = cls._signature(excel)
+
+        if cls._pending:
+            with open(cls._directory / "workbooks.json", 'w') as file:
+                json.dump(cls._workbooks, file)
+
+        cls._pending = []
+
+    @classmethod
+    def discard(cls):
+        """
+        Discards the added results.
+        """
+        cls._pending = []
+
+    @classmethod
+    def _hash(cls, var, info, files):
+        """
+        Hash the configuration of a variable together with the
+        subscripts and the files it uses and the library version.
+        """
+        subscripts = {
+            dim: Subscripts._subscript_dict.get(dim.strip())
+            for dim in [*info.get('dims', []), *info.get('dimensions', {})]
+        }
+        # files are relative to the current working directory
+        files = sorted(cls._path(file) for file in files)
+
+        return hashlib.sha256(json.dumps(
+            [__version__, var, info, subscripts, files],
+            sort_keys=True, default=str).encode()).hexdigest()
+
+    @classmethod
+    def _entry(cls, key):
+        """
+        Path of the cache file of a key.
+        """
+        return cls._directory / key[:2] / (key + ".json")
+
+    @staticmethod
+    def _path(file):
+        """
+        Absolute path of a file as string.
+        """
+        return str(Path(file).resolve())
+
+    @staticmethod
+    def _signature(file):
+        """
+        Signature of a file, modification time and size or None if the
+        file does not exist.
+        """
+        try:
+            stat = Path(file).stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
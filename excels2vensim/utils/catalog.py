@@ -0,0 +1,231 @@
+"""
+SQLite catalog of the defined names of the Excel files.
+"""
+import sqlite3
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from openpyxl.utils.cell import column_index_from_string
+
+from .names import read_defined_names, parse_reference
+from .manifest import _hash_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workbooks (
+    file TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT);
+CREATE TABLE IF NOT EXISTS names (
+    file TEXT, scope TEXT, name TEXT, reference TEXT, sheet TEXT,
+    min_row INTEGER, min_col INTEGER, max_row INTEGER, max_col INTEGER);
+CREATE INDEX IF NOT EXISTS names_file ON names (file);
+CREATE INDEX IF NOT EXISTS names_sheet ON names (sheet COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS owners (
+    file TEXT, sheet TEXT, name TEXT, variable TEXT, config TEXT);
+CREATE INDEX IF NOT EXISTS owners_name ON owners (file, name);
+"""
+
+# columns returned by the queries
+QUERY_COLUMNS = ['file', 'scope', 'name', 'reference', 'variable', 'config']
+
+
+class Catalog():
+    """
+    Class to keep a SQLite catalog of the defined names of the Excel files
+    of a project and the variables of the configuration files that own
+    them. The catalog is updated incrementally, only the Excel files whose
+    content changed since the last update are read again.
+
+    Parameters
+    ----------
+    file: str or pathlib.Path
+        SQLite file of the catalog. It will be created if it does not
+        exist.
+
+    Examples
+    --------
+    >>> with Catalog('names.sqlite') as catalog:
+    ...     catalog.update(['inputs.xlsx', 'inputs2.xlsx'])
+    ...     catalog.query(sheet='Sheet1')
+
+    """
+    def __init__(self, file):
+        self.file = Path(file)
+        self.connection = sqlite3.connect(self.file)
+        self.connection.executescript(SCHEMA)
+
+    def update(self, files, workers=None):
+        """
+        Update the defined names of the Excel files. The files are read
+        in parallel. A file is only read again if its modification time
+        or size changed and its SHA-256 is different. The files that are
+        not given are removed from the catalog.
+
+        Parameters
+        ----------
+        files: iterable
+            Excel files of the project.
+
+        workers: int or None (optional)
+            Maximum number of files read at the same time. If None, the
+            default of concurrent.futures.ThreadPoolExecutor is used.
+            Default is None.
+
+        Returns
+        -------
+        dict
+            The 'read', 'unchanged' and 'removed' files.
+
+        """
+        files = sorted({str(Path(file).resolve()) for file in files})
+        stored = {
+            file: (mtime_ns, size, sha256)
+            for file, mtime_ns, size, sha256 in self.connection.execute(
+                "SELECT file, mtime_ns, size, sha256 FROM workbooks")}
+
+        with ThreadPoolExecutor(workers) as executor:
+            scanned = list(executor.map(
+                lambda file: self._scan(file, stored.get(file)), files))
+
+        result = {'read': [], 'unchanged': [], 'removed': []}
+        with self.connection:
+            for file, (mtime_ns, size, sha256, names) in zip(files,
+                                                             scanned):
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO workbooks VALUES (?, ?, ?, ?)",
+                    (file, mtime_ns, size, sha256))
+                if names is None:
+                    result['unchanged'].append(file)
+                    continue
+                result['read'].append(file)
+                self.connection.execute(
+                    "DELETE FROM names WHERE file = ?", (file,))
+                self.connection.executemany(
+                    "INSERT INTO names VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._row(file, *name) for name in names))
+
+            for file in sorted(set(stored).difference(files)):
+                self.connection.execute(
+                    "DELETE FROM workbooks WHERE file = ?", (file,))
+                self.connection.execute(
+                    "DELETE FROM names WHERE file = ?", (file,))
+                result['removed'].append(file)
+
+        return result
+
+    def set_owners(self, owners):
+        """
+        Replace the variables that own the names.
+
+        Parameters
+        ----------
+        owners: iterable
+            The (variable, name, file, sheet, config) of each planned
+            cellrange name, where config is the configuration file of
+            the variable.
+
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM owners")
+            self.connection.executemany(
+                "INSERT INTO owners VALUES (?, ?, ?, ?, ?)",
+                ((str(Path(file).resolve()), sheet, name, var, str(config))
+                 for var, name, file, sheet, config in owners))
+
+    def query(self, sheet=None, column=None, variable=None, name=None,
+              file=None):
+        """
+        Query the defined names. All the given conditions must be met.
+
+        Parameters
+        ----------
+        sheet: str or None (optional)
+            Sheet referenced by the names, not case sensitive.
+            Default is None.
+
+        column: str or None (optional)
+            Column referenced by the names, e.g., 'AB'. Default is None.
+
+        variable: str or None (optional)
+            Variable that owns the names. Default is None.
+
+        name: str or None (optional)
+            Name, not case sensitive. Default is None.
+
+        file: str or pathlib.Path or None (optional)
+            Excel file of the names. Default is None.
+
+        Returns
+        -------
+        list of dicts
+            The 'file', 'scope', 'name', 'reference', 'variable' and
+            'config' of each name. The variable and config are None for
+            the names not owned by any variable.
+
+        """
+        conditions, parameters = [], []
+        if sheet is not None:
+            conditions.append("n.sheet = ? COLLATE NOCASE")
+            parameters.append(sheet)
+        if column is not None:
+            conditions.append("n.min_col <= ? AND n.max_col >= ?")
+            parameters += [column_index_from_string(column.upper())] * 2
+        if variable is not None:
+            conditions.append("o.variable = ?")
+            parameters.append(variable)
+        if name is not None:
+            conditions.append("n.name = ? COLLATE NOCASE")
+            parameters.append(name)
+        if file is not None:
+            conditions.append("n.file = ?")
+            parameters.append(str(Path(file).resolve()))
+
+        sql = (
+            "SELECT n.file, n.scope, n.name, n.reference, o.variable, "
+            "o.config FROM names AS n LEFT JOIN owners AS o "
+            "ON o.file = n.file AND o.name = n.name "
+            "AND o.sheet = n.scope COLLATE NOCASE")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY n.file, n.scope, n.name"
+
+        return [dict(zip(QUERY_COLUMNS, row))
+                for row in self.connection.execute(sql, parameters)]
+
+    def close(self):
+        """
+        Close the catalog.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _scan(file, stored):
+        """
+        Get the signature of a file and its defined names, None if its
+        content did not change.
+        """
+        stat = Path(file).stat()
+        if stored is not None and stored[:2] == (stat.st_mtime_ns,
+                                                 stat.st_size):
+            return (*stored, None)
+        sha256 = _hash_file(file)
+        if stored is not None and stored[2] == sha256:
+            # only the modification time changed
+            return stat.st_mtime_ns, stat.st_size, sha256, None
+        return (stat.st_mtime_ns, stat.st_size, sha256,
+                read_defined_names(file))
+
+    @staticmethod
+    def _row(file, name, scope, reference):
+        """
+        Row of the names table of a defined name.
+        """
+        parsed = parse_reference(reference)
+        if parsed is None:
+            return (file, scope, name, reference, scope,
+                    None, None, None, None)
+        return (file, scope, name, reference, *parsed)
@@ -0,0 +1,92 @@
+"""
+Check of the cellrange names of the Excel files against the configuration.
+"""
+from pathlib import Path
+
+from .names import read_names, plan_names, parse_reference
+
+
+def check_names(vars_dict, workbooks=(), workers=None):
+    """
+    Check that the Excel files have the cellrange names planned by the
+    configuration, without writing any file. The defined names of each
+    Excel file are read in parallel without loading the files.
+
+    Parameters
+    ----------
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable.
+
+    workbooks: iterable (optional)
+        Other Excel files to look for extra names in, besides the ones
+        used by the configuration. Default is ().
+
+    workers: int or None (optional)
+        Maximum number of files whose names are read at the same time.
+        Default is None.
+
+    Returns
+    -------
+    dict
+        The 'missing' names, as (file, sheet, name, planned cellrange),
+        the 'moved' names, as (file, sheet, name, planned cellrange,
+        current reference), and the 'extra' sheet names that are not
+        planned, as (file, sheet, name, current reference). The missing
+        Excel files have all their names missing.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is not valid.
+
+    """
+    planned = {}
+    files = {str(workbook): None for workbook in workbooks}
+    for _, name, file, sheet, cellrange in plan_names(vars_dict):
+        planned[_key(file, sheet, name)] = (
+            str(file), sheet, name, cellrange)
+        files.setdefault(str(file))
+
+    current = {}
+    for file, names in read_names(
+            [file for file in files if Path(file).is_file()],
+            workers).items():
+        for name, scope, reference in names:
+            if scope is not None:
+                # excels2vensim does not write global names
+                current[_key(file, scope, name)] = (
+                    file, scope, name, reference)
+
+    diff = {'missing': [], 'moved': [], 'extra': []}
+    for key, (file, sheet, name, cellrange) in planned.items():
+        if key not in current:
+            diff['missing'].append((file, sheet, name, cellrange))
+        elif not _same_reference(current[key][3], cellrange, sheet):
+            diff['moved'].append(
+                (file, sheet, name, cellrange, current[key][3]))
+
+    diff['extra'] = [
+        values for key, values in current.items() if key not in planned]
+
+    return diff
+
+
+def _key(file, sheet, name):
+    """
+    Key of a name, the sheet and name are not case sensitive.
+    """
+    return str(Path(file).resolve()), sheet.lower(), name.lower()
+
+
+def _same_reference(reference, cellrange, sheet):
+    """
+    Check if the reference of a name points to the planned cellrange.
+    """
+    if "!" not in cellrange:
+        cellrange = f"{sheet}!{cellrange}"
+    parsed, planned = parse_reference(reference), parse_reference(cellrange)
+    if parsed is None or planned is None:
+        return reference == cellrange
+    return (parsed[0].lower(), *parsed[1:])\
+        == (planned[0].lower(), *planned[1:])
@@ -0,0 +1,174 @@
+"""
+Estimation of the size of the outputs before executing.
+"""
+import warnings
+
+from .subscripts import Subscripts
+from .validation import validate_config
+from ..excels2vensim import ExternalVariable, _validate_each
+
+
+# default maximum values for each variable before warning
+THRESHOLDS = {
+    'equations': 1000,
+    'names': 1000,
+    'workbooks': 10,
+    'bytes': 1000000,
+}
+
+# approximate length of the fixed parts of the equations and names
+EQUATION_LENGTH = {
+    # "{var}=\n\tGET_{loading}_CONSTANTS('{file}', '{sheet}', '{name}') ~~|\n"
+    'constants': 37,
+    # "{var}=\n\tGET_{loading}_LOOKUPS('{file}', '{sheet}', '{x}', '{name}')"
+    # " ~~|\n"
+    'lookups': 39,
+    # "{var}:=\n\tGET_{loading}_DATA('{file}', '{sheet}', '{time}', '{name}')"
+    # " ~~|\n"
+    'data': 37,
+}
+# "<definedName name="{name}" localSheetId="0">{sheet}!{cellrange}"
+# "</definedName>" with a cellrange like "$AB$10:$CD$100"
+NAME_LENGTH = 64
+
+
+def estimate(vars_dict, thresholds=None):
+    """
+    Estimate the number of equations, cellrange names, Excel files and
+    bytes of the outputs of each variable without planning the
+    cellranges or reading any Excel file. A warning is raised for each
+    variable that exceeds any of the thresholds.
+
+    Parameters
+    ----------
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable.
+
+    thresholds: dict or None (optional)
+        Maximum number of 'equations', 'names', 'workbooks' and 'bytes'
+        of each variable before warning. The missing values are taken
+        from the defaults, 1000 equations, 1000 names, 10 workbooks and
+        1000000 bytes. Use None to disable a threshold. Default is None.
+
+    Returns
+    -------
+    dict
+        The 'variables' with the number of 'equations', 'names',
+        'workbooks' and 'bytes' of each variable and the 'total' values,
+        where the workbooks are only counted once.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is not valid.
+
+    """
+    thresholds = {**THRESHOLDS, **(thresholds or {})}
+
+    if hasattr(vars_dict, 'items'):
+        validate_config(vars_dict)
+        vars_dict = vars_dict.items()
+    else:
+        vars_dict = _validate_each(vars_dict)
+
+    variables = {}
+    total = dict.fromkeys(['equations', 'names', 'workbooks', 'bytes'], 0)
+    workbooks = set()
+    for var, info in vars_dict:
+        values, files = _estimate_variable(var, info)
+        variables[var] = values
+        workbooks.update(files)
+        for key in ['equations', 'names', 'bytes']:
+            total[key] += values[key]
+
+        exceeded = [
+            f"{values[key]} {key} (> {threshold})"
+            for key, threshold in thresholds.items()
+            if threshold is not None and values.get(key, 0) > threshold]
+        if exceeded:
+            warnings.warn(
+                f"The variable '{var}' will generate "
+                + ", ".join(exceeded) + ".")
+
+    total['workbooks'] = len(workbooks)
+
+    return {'variables': variables, 'total': total}
+
+
+def _estimate_variable(var, info):
+    """
+    Estimate the outputs of a variable from the number of subscripts
+    of its dimensions.
+
+    Returns
+    -------
+    values: dict
+        The number of 'equations', 'names', 'workbooks' and 'bytes'.
+
+    files: list
+        The Excel files used by the variable.
+
+    """
+    var_type = info['type'].lower()
+    dimensions = {
+        dim.strip(): (list(along) + [1])[:2]
+        for dim, along in info['dimensions'].items()}
+    files, sheets = [info.get('file')], [info.get('sheet')]
+
+    # each element of the dimensions not read with step 1 splits the
+    # equations, the length of the parts that change is averaged
+    n_boxes = 1
+    subs_length = 0
+    name_length = len(ExternalVariable._clean_identifier(var))
+    for dim in info['dims']:
+        dim = dim.strip()
+        read_along, sep = dimensions[dim]
+        elements = Subscripts.get(dim)
+        if sep == 1:
+            subs_length += len(dim) + 2
+            continue
+
+        n_boxes *= len(elements)
+        subs_length += sum(map(len, elements)) / len(elements) + 2
+        if read_along == 'file':
+            files = sep
+        elif read_along == 'sheet':
+            sheets = sep
+        else:
+            name_length += sum(
+                len(ExternalVariable._clean_identifier(element)) + 1
+                for element in elements) / len(elements)
+
+    file_length = sum(map(len, files)) / len(files)
+    sheet_length = sum(map(len, sheets)) / len(sheets)
+
+    equation_length = EQUATION_LENGTH[var_type] + len(var.strip())\
+        + len(info.get('loading', 'DIRECT')) + subs_length\
+        + file_length + sheet_length + name_length
+    names_bytes = n_boxes * (NAME_LENGTH + name_length + sheet_length)
+    n_names = n_boxes
+
+    if var_type in ['lookups', 'data']:
+        series = info['x' if var_type == 'lookups' else 'time']
+        series_length = len(ExternalVariable._clean_identifier(
+            series['name']))
+        equation_length += series_length
+        # the series is written once in each sheet of each file
+        n_series = len(set(files)) * len(set(sheets))
+        n_names += n_series
+        names_bytes += n_series * (
+            NAME_LENGTH + series_length + sheet_length)
+
+    # units and description are only written once
+    equations_bytes = n_boxes * equation_length\
+        + len(info.get('units', '')) + len(info.get('description', '')) + 8
+
+    values = {
+        'equations': n_boxes,
+        'names': n_names,
+        'workbooks': len(set(files)),
+        'bytes': int(equations_bytes + names_bytes)
+    }
+
+    return values, set(files)
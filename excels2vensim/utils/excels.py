@@ -1,14 +1,44 @@
 """
 Excel files manager class.
 """
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
 from openpyxl import load_workbook
 
+from .stats import Stats
+
 
 class Excels():
     """
     Class to save the read Excel files and thus avoid double reading
     """
     _Excels = {}
+    _max_open = None
+
+    @classmethod
+    def set_max_open(cls, max_open):
+        """
+        Set the maximum number of Excel files kept open. When a new file
+        is read and the limit is reached, the least recently used file is
+        saved and closed, so the memory does not grow with the number of
+        Excel files. The saved files are not restored if the run fails or
+        it is cancelled later. If None, all the files are kept open until
+        calling save_and_close.
+
+        Parameters
+        ----------
+        max_open: int or None
+            Maximum number of Excel files kept open.
+
+        """
+        if max_open is not None and max_open < 1:
+            raise ValueError(
+                "\nThe maximum number of open Excel files must be at "
+                "least 1.")
+        cls._max_open = max_open
 
     @classmethod
     def read(cls, file):
@@ -16,19 +46,96 @@ class Excels():
         Read the Excel file using OpenPyXL or return the previously read one
         """
         if file in cls._Excels:
+            # keep the most recently used files at the end
+            cls._Excels[file] = cls._Excels.pop(file)
             return cls._Excels[file]
         else:
-            excel = load_workbook(file)
+            if cls._max_open is not None:
+                while len(cls._Excels) >= cls._max_open:
+                    cls._save_oldest()
+            with Stats.span('read', str(file)):
+                excel = load_workbook(file)
             cls._Excels[file] = excel
             return excel
 
     @classmethod
-    def save_and_close(cls):
+    def _save_oldest(cls):
+        """
+        Save and close the least recently used Excel file.
+        """
+        file = next(iter(cls._Excels))
+        wb = cls._Excels.pop(file)
+        temp_file = cls._temp_file(file)
+        try:
+            with Stats.span('save', str(file)):
+                wb.save(temp_file)
+            os.replace(temp_file, file)
+            Stats.count('workbooks_flushed')
+        except BaseException:
+            os.remove(temp_file)
+            raise
+        finally:
+            wb.close()
+
+    @classmethod
+    def save_and_close(cls, callback=None, cancel=None):
+        """
+        Saves and closes the Excel files. All the files are first saved
+        in temporary files in the same folders, which replace the
+        original ones once all of them have been saved. Thus, if the
+        saving fails or it is cancelled, no Excel file is modified.
+
+        Parameters
+        ----------
+        callback: callable or None (optional)
+            Function called after saving each Excel file with the name
+            of the file and the number of bytes written. Default is None.
+
+        cancel: CancelToken or None (optional)
+            Token checked before saving each Excel file. If it is
+            cancelled, Cancelled is raised and the Excel files are closed
+            without saving. Default is None.
+
+        """
+        temp_files = {}
+        try:
+            for file, wb in cls._Excels.items():
+                if cancel is not None:
+                    cancel.check()
+                temp_files[file] = cls._temp_file(file)
+                with Stats.span('save', str(file)):
+                    wb.save(temp_files[file])
+                if callback is not None:
+                    callback(file, os.path.getsize(temp_files[file]))
+
+            for file, temp_file in temp_files.items():
+                os.replace(temp_file, file)
+            temp_files = {}
+        finally:
+            for temp_file in temp_files.values():
+                os.remove(temp_file)
+            cls.close()
+
+    @staticmethod
+    def _temp_file(file):
+        """
+        Create a temporary file in the folder of the Excel file, with
+        the same permissions.
+        """
+        file = Path(file)
+        fd, temp_file = tempfile.mkstemp(
+            dir=file.parent, prefix=f".{file.stem}.", suffix=file.suffix)
+        os.close(fd)
+        if file.is_file():
+            shutil.copymode(file, temp_file)
+        return temp_file
+
+    @classmethod
+    def close(cls):
         """
-        Saves and closes the Excel files
+        Closes the Excel files without saving them
         """
-        for file, wb in cls._Excels.items():
-            wb.save(file)
+        for wb in cls._Excels.values():
             wb.close()
 
         cls._Excels = {}
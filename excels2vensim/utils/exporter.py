@@ -0,0 +1,158 @@
+"""
+Export of the values of the cellranges to a binary cache.
+"""
+import os
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .stats import Stats
+from .reader import read_cellranges
+from .manifest import _hash_file
+from .validation import validate_config
+from ..excels2vensim import _create_object, _validate_each
+from .._version import __version__
+
+
+def export(vars_dict, file, manifest_file=None):
+    """
+    Read the values of the planned cellranges of the variables and save
+    them in a compressed NumPy file (.npz) with a JSON manifest. The
+    values are read without writing any cellrange name, opening each
+    Excel file once and reading each sheet in a single pass. The
+    manifest includes the dimensions and coordinates of each variable
+    and the SHA-256 of each Excel file, so the values can be loaded with
+    load_export without reading the Excel files.
+
+    Parameters
+    ----------
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable.
+
+    file: str or pathlib.Path
+        File to save the values in, e.g., 'inputs.npz'. The key of the
+        array of each variable is given in the manifest.
+
+    manifest_file: str or pathlib.Path or None (optional)
+        File to save the manifest in. If None, it is saved next to the
+        values file with the .json suffix. Default is None.
+
+    Returns
+    -------
+    dict
+        The manifest.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is not valid.
+
+    """
+    file = Path(file)
+    if manifest_file is None:
+        manifest_file = file.with_suffix(".json")
+
+    if hasattr(vars_dict, 'items'):
+        validate_config(vars_dict)
+        vars_dict = vars_dict.items()
+    else:
+        vars_dict = _validate_each(vars_dict)
+
+    objects = {}
+    cellranges = []
+    for var, info in vars_dict:
+        with Stats.span('plan', var):
+            obj = _create_object(var, info)
+            obj.get_vensim(loading=info.get('loading', 'DIRECT'))
+            objects[var] = (info['type'].lower(), obj)
+            cellranges += [
+                (cr_file, sheet, cellrange)
+                for _, cr_file, sheet, cellrange in obj._get_cellranges()]
+
+    # read all the cellranges of each Excel file at once
+    values = read_cellranges(cellranges)
+
+    arrays = []
+    variables = {}
+    for var, (var_type, obj) in objects.items():
+        dims, coords, data = obj._get_array(values)
+        # the arrays are saved with the default keys of numpy, as the
+        # variable names may not be valid keyword arguments
+        variables[var] = {
+            'type': var_type, 'key': f"arr_{len(arrays)}",
+            'dims': dims, 'coords': coords}
+        arrays.append(data)
+
+    # save with a file object to avoid adding the .npz suffix
+    with open(file, 'wb') as out:
+        np.savez_compressed(out, *arrays)
+
+    manifest = {
+        'version': __version__,
+        # relative to the manifest, so both files can be moved together
+        'file': Path(os.path.relpath(
+            file.resolve(), Path(manifest_file).resolve().parent)
+        ).as_posix(),
+        'sources': {
+            str(Path(source).resolve()): _hash_file(source)
+            for source in sorted({str(source) for source, _, _ in values})
+        },
+        'variables': variables
+    }
+    with open(manifest_file, 'w') as out:
+        json.dump(manifest, out, indent=4)
+
+    return manifest
+
+
+def load_export(manifest_file, check=True):
+    """
+    Load the values saved with export.
+
+    Parameters
+    ----------
+    manifest_file: str or pathlib.Path
+        The manifest file saved with export. The values file is looked
+        for relative to it.
+
+    check: bool (optional)
+        If True, the SHA-256 of the Excel files are compared with the
+        ones in the manifest. Default is True.
+
+    Returns
+    -------
+    dict
+        The 'dims', 'coords' and 'data' of each variable.
+
+    Raises
+    ------
+    ValueError
+        If check is True and any of the Excel files has changed.
+
+    """
+    manifest_file = Path(manifest_file)
+    with open(manifest_file) as file:
+        manifest = json.load(file)
+
+    if check:
+        changed = [
+            source for source, sha256 in manifest['sources'].items()
+            if not Path(source).is_file() or _hash_file(source) != sha256]
+        if changed:
+            raise ValueError(
+                "\nThe following Excel files have changed since the "
+                "export:\n\t" + "\n\t".join(changed))
+
+    variables = {}
+    with np.load(manifest_file.parent.joinpath(manifest['file']))\
+         as arrays:
+        for var, info in manifest['variables'].items():
+            variables[var] = {
+                'dims': info['dims'],
+                'coords': info['coords'],
+                'data': arrays[info['key']]
+            }
+
+    return variables
@@ -0,0 +1,95 @@
+"""
+Garbage collection of the orphan cellrange names.
+"""
+from fnmatch import fnmatchcase
+
+from .excels import Excels
+from .stats import Stats
+from .checker import check_names
+
+
+def collect_garbage(vars_dict, workbooks=(), patterns=None, remove=False,
+                    workers=None):
+    """
+    Find the orphan cellrange names of the Excel files, i.e., the names
+    that are not planned by the current configuration, as the names of
+    the removed or renamed variables. The defined names are read without
+    loading the Excel files and only the sheet names are considered, as
+    excels2vensim does not write global names.
+
+    Parameters
+    ----------
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable.
+
+    workbooks: iterable (optional)
+        Other Excel files to look for orphan names in, besides the ones
+        used by the configuration. Default is ().
+
+    patterns: list or None (optional)
+        Shell-style patterns of the names, e.g., 'my_var_*'. Only the
+        names matching any of them are considered, not case sensitive.
+        If None, all the sheet names are considered. Default is None.
+
+    remove: bool (optional)
+        If True, the orphan names are removed, loading and saving each
+        Excel file with orphan names once. The patterns must be given to
+        remove the names. Default is False.
+
+    workers: int or None (optional)
+        Maximum number of files whose names are read at the same time.
+        Default is None.
+
+    Returns
+    -------
+    dict
+        The (sheet, name, reference) of the orphan names of each Excel
+        file with orphan names.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is not valid.
+
+    ValueError
+        If remove is True and no patterns are given.
+
+    """
+    if remove and not patterns:
+        # the names of other tools may also be unplanned
+        raise ValueError(
+            "\nThe patterns of the names must be given to remove them, "
+            "e.g., patterns=['my_var_*'].")
+
+    patterns = None if patterns is None else [
+        pattern.lower() for pattern in patterns]
+
+    orphans = {}
+    for file, sheet, name, reference in check_names(
+            vars_dict, workbooks, workers)['extra']:
+        if patterns is None or any(fnmatchcase(name.lower(), pattern)
+                                   for pattern in patterns):
+            orphans.setdefault(file, []).append((sheet, name, reference))
+
+    if remove and orphans:
+        _remove_names(orphans)
+
+    return orphans
+
+
+def _remove_names(orphans):
+    """
+    Remove the names of the Excel files and save them.
+    """
+    try:
+        for file, names in orphans.items():
+            wb = Excels.read(file)
+            with Stats.span('write', str(file)):
+                for sheet, name, _ in names:
+                    del wb[sheet].defined_names[name]
+                    Stats.count('names_removed')
+        Excels.save_and_close()
+    except BaseException:
+        Excels.close()
+        raise
@@ -0,0 +1,390 @@
+"""
+Generator of synthetic projects for scaling and stress tests.
+"""
+import json
+import argparse
+from pathlib import Path
+
+import numpy as np
+from openpyxl import Workbook
+
+from .validation import SERIES
+from ..excels2vensim import NDJSON_SUFFIXES
+
+
+CONTROL_SECTION = """
+********************************************************
+\t.Control
+********************************************************~
+\t\tSimulation Control Parameters
+\t|
+
+FINAL TIME  = {final_time}
+\t~\tYear
+\t~\tThe final time for the simulation.
+\t|
+
+INITIAL TIME  = 2000
+\t~\tYear
+\t~\tThe initial time for the simulation.
+\t|
+
+SAVEPER  = TIME STEP
+\t~\tYear [0,?]
+\t~\tThe frequency with which output is stored.
+\t|
+
+TIME STEP  = 1
+\t~\tYear [0,?]
+\t~\tThe time step for the simulation.
+\t|
+
+\\\\\\---/// Sketch information - do not modify anything except names
+V300  Do not put anything below this section - it will be ignored
+"""
+
+
+def generate_project(directory, n_vars=10, n_ranges=5, cardinality=(2, 6),
+                     n_subranges=0, n_files=1, n_sheets=1,
+                     var_types=('constants', 'data', 'lookups'),
+                     max_dims=3, layouts=('row', 'col', 'sheet', 'file'),
+                     series_length=10, config_file='config.json', seed=None):
+    """
+    Generate a synthetic project with a Vensim model with the subscripts,
+    the Excel files with the numeric data and the configuration file of
+    the variables.
+
+    The variables are distributed between the files and sheets and
+    placed one after the other along the rows. The first dimension of each
+    variable is read along rows and, for constants, the second one along
+    columns. The rest of dimensions are read along rows or columns with
+    a separation, or one of them along sheets or files, depending on
+    the chosen layout.
+
+    Parameters
+    ----------
+    directory: str or pathlib.Path
+        Directory to save the project files in. It will be created if
+        it does not exist.
+
+    n_vars: int (optional)
+        Number of variables. Default is 10.
+
+    n_ranges: int (optional)
+        Number of subscript ranges. Default is 5.
+
+    cardinality: int or tuple (optional)
+        Number of elements of each subscript range or (min, max) number
+        of elements. Default is (2, 6).
+
+    n_subranges: int (optional)
+        Number of subscript subranges, each one of a different range.
+        They are also used as dimensions of the variables. Default is 0.
+
+    n_files: int (optional)
+        Number of Excel files. Default is 1.
+
+    n_sheets: int (optional)
+        Number of sheets of each Excel file. Default is 1.
+
+    var_types: iterable (optional)
+        Types of variables to generate. Default is ('constants', 'data',
+        'lookups').
+
+    max_dims: int (optional)
+        Maximum number of dimensions of each variable. Default is 3.
+
+    layouts: iterable (optional)
+        Layouts to choose for the dimensions that are not read in the
+        first table, 'row', 'col', 'sheet' or 'file'. If a variable
+        cannot use the chosen layout, e.g., a dimension has more
+        elements than sheets, 'row' will be used. Data and lookups
+        variables use 'row' instead of 'col'. Default is ('row', 'col',
+        'sheet', 'file').
+
+    series_length: int (optional)
+        Length of the time and x series. Default is 10.
+
+    config_file: str (optional)
+        Name of the configuration file. If it ends with .ndjson or
+        .jsonl it will be saved as newline delimited JSON. Default is
+        'config.json'.
+
+    seed: int or None (optional)
+        Seed of the random number generator. Default is None.
+
+    Returns
+    -------
+    dict
+        The paths of the generated 'model', 'config' and 'workbooks'.
+
+    """
+    rng = np.random.default_rng(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    subscripts, subranges = _generate_subscripts(
+        rng, n_ranges, cardinality, n_subranges)
+    files = [f"inputs{i}.xlsx" for i in range(n_files)]
+    sheets = [f"Sheet{i}" for i in range(n_sheets)]
+    # values to write in each sheet {(file, sheet): {row: {col: value}}}
+    cells = {(file, sheet): {} for file in files for sheet in sheets}
+    # first free row of each sheet
+    next_rows = dict.fromkeys(cells, 0)
+
+    config = {}
+    for i in range(n_vars):
+        # names like "var1" are not valid as they are cell references
+        var = f"var_{i}"
+        var_type = str(rng.choice(var_types))
+        dims = _choose_dims(rng, subscripts, subranges, max_dims)
+        config[var] = _layout_variable(
+            rng, var, var_type, dims, subscripts, str(rng.choice(layouts)),
+            files, sheets, i, series_length, cells, next_rows)
+
+    model_file = directory / "model.mdl"
+    write_mdl(model_file, subscripts, 2000 + series_length - 1)
+
+    for file in files:
+        _write_workbook(
+            directory / file, sheets,
+            [cells[(file, sheet)] for sheet in sheets])
+
+    config_path = directory / config_file
+    with open(config_path, "w") as out:
+        if config_path.suffix.lower() in NDJSON_SUFFIXES:
+            for var, info in config.items():
+                out.write(json.dumps({var: info}) + "\n")
+        else:
+            json.dump(config, out, indent=4)
+
+    return {
+        'model': model_file,
+        'config': config_path,
+        'workbooks': [directory / file for file in files]
+    }
+
+
+def write_mdl(mdl_file, subscripts, final_time=2010):
+    """
+    Write a Vensim model file with the given subscripts and the control
+    variables. The simulation starts in 2000.
+
+    Parameters
+    ----------
+    mdl_file: str or pathlib.Path
+        Name of the file to write.
+
+    subscripts: dict
+        The subscripts dictionary.
+
+    final_time: int (optional)
+        The final time of the simulation. Default is 2010.
+
+    Returns
+    -------
+    None
+
+    """
+    with open(mdl_file, "w") as file:
+        file.write("{UTF-8}\n")
+        for dim, elements in subscripts.items():
+            file.write(f"{dim}:\n\t{', '.join(elements)}\n\t~\t\n\t~\t\t|\n\n")
+        file.write(CONTROL_SECTION.format(final_time=final_time))
+
+
+def _generate_subscripts(rng, n_ranges, cardinality, n_subranges):
+    """
+    Generate the subscript ranges and subranges.
+    """
+    if isinstance(cardinality, int):
+        cardinality = (cardinality, cardinality)
+
+    subscripts, subranges = {}, {}
+    for i in range(n_ranges):
+        n_elements = int(rng.integers(cardinality[0], cardinality[1] + 1))
+        subscripts[f"dim{i}"] = [f"dim{i}_el{j}" for j in range(n_elements)]
+
+    for i in range(min(n_subranges, n_ranges)):
+        elements = subscripts[f"dim{i}"]
+        # avoid subranges of one element when possible
+        low = min(2, len(elements))
+        n_elements = int(rng.integers(
+            low, max(len(elements) - 1, low), endpoint=True))
+        subrange = f"sub{i}"
+        subscripts[subrange] = elements[:n_elements]
+        subranges[subrange] = f"dim{i}"
+
+    return subscripts, subranges
+
+
+def _choose_dims(rng, subscripts, subranges, max_dims):
+    """
+    Choose the dimensions of a variable, a range and its subranges
+    are not used together.
+    """
+    n_dims = int(rng.integers(0, max_dims + 1))
+    dims, parents = [], set()
+    for dim in rng.permutation(list(subscripts)):
+        parent = subranges.get(dim, dim)
+        if len(dims) == n_dims:
+            break
+        elif parent not in parents:
+            dims.append(str(dim))
+            parents.add(parent)
+
+    return dims
+
+
+def _layout_variable(rng, var, var_type, dims, subscripts, layout,
+                     files, sheets, index, series_length, cells, next_rows):
+    """
+    Define the configuration of a variable and add its values to the
+    cells to write. The variable is placed in the first row that is
+    free in all the sheets it uses.
+
+    Returns
+    -------
+    info: dict
+        The configuration of the variable.
+
+    """
+    dimensions = {}
+    # size of the table along rows and columns
+    size = {'row': 1, 'col': series_length if var_type in SERIES else 1}
+    along_dims = dims[:1] if var_type in SERIES else dims[:2]
+    for dim, along in zip(along_dims, ['row', 'col']):
+        dimensions[dim] = [along, 1]
+        size[along] = len(subscripts[dim])
+
+    extra_dims = dims[len(along_dims):]
+    if layout == 'col' and var_type in SERIES:
+        layout = 'row'
+
+    # dimension along sheets or files
+    var_files = [files[index % len(files)]]
+    var_sheets = [sheets[(index // len(files)) % len(sheets)]]
+    if layout in ['sheet', 'file'] and extra_dims\
+       and len(subscripts[extra_dims[-1]])\
+       <= len({'sheet': sheets, 'file': files}[layout]):
+        dim = extra_dims.pop()
+        elements = {'sheet': sheets, 'file': files}[layout][
+            :len(subscripts[dim])]
+        dimensions[dim] = [layout, elements]
+        if layout == 'sheet':
+            var_sheets = elements
+        else:
+            var_files = elements
+
+    if layout in ['sheet', 'file']:
+        layout = 'row'
+
+    # dimensions along rows or columns with separation, leaving an
+    # empty row or column between the tables
+    for dim in extra_dims:
+        dimensions[dim] = [layout, size[layout] + 1]
+        size[layout] = (size[layout] + 1) * len(subscripts[dim]) - 1
+
+    used = [(file, sheet) for file in var_files for sheet in var_sheets]
+    row = max(next_rows[key] for key in used)
+    first_row = row + 1 if var_type in SERIES else row
+    info = {
+        "type": var_type,
+        "dims": dims,
+        "cell": f"B{first_row + 1}",
+        "description": f"Synthetic variable {var}",
+        "units": "dmnl",
+        "dimensions": dimensions,
+    }
+    if len(var_files) == 1:
+        info["file"] = var_files[0]
+    if len(var_sheets) == 1:
+        info["sheet"] = var_sheets[0]
+    if var_type in SERIES:
+        info[SERIES[var_type]] = {
+            "name": f"{SERIES[var_type]}_{var}",
+            "cell": f"B{row + 1}",
+            "read_along": "col",
+            "length": series_length
+        }
+
+    values = np.round(rng.random((size['row'], size['col'])) * 100, 3)
+    series = np.arange(2000, 2000 + series_length)
+    for key in used:
+        sheet_cells = cells[key]
+        if var_type in SERIES:
+            sheet_cells[row] = dict(enumerate(series.tolist(), 1))
+        for i, row_values in enumerate(values.tolist()):
+            sheet_cells[first_row + i] = dict(enumerate(row_values, 1))
+        # leave an empty row between variables
+        next_rows[key] = first_row + size['row'] + 1
+
+    return info
+
+
+def _write_workbook(file, sheets, sheets_cells):
+    """
+    Write an Excel file with the given cells.
+    """
+    wb = Workbook(write_only=True)
+    for sheet, sheet_cells in zip(sheets, sheets_cells):
+        ws = wb.create_sheet(sheet)
+        for row in range(max(sheet_cells, default=-1) + 1):
+            row_cells = sheet_cells.get(row, {})
+            ws.append([
+                row_cells.get(col)
+                for col in range(max(row_cells, default=-1) + 1)])
+    wb.save(file)
+
+
+def main(args=None):
+    """
+    Generate a synthetic project from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic excels2vensim project.",
+        prog="python -m excels2vensim.utils.generator")
+    parser.add_argument("directory", type=Path,
+                        help="directory to save the project in")
+    parser.add_argument("--n-vars", type=int, default=10,
+                        help="number of variables")
+    parser.add_argument("--n-ranges", type=int, default=5,
+                        help="number of subscript ranges")
+    parser.add_argument("--cardinality", type=int, nargs=2, default=(2, 6),
+                        metavar=("MIN", "MAX"),
+                        help="minimum and maximum number of elements of "
+                             "each subscript range")
+    parser.add_argument("--n-subranges", type=int, default=0,
+                        help="number of subscript subranges")
+    parser.add_argument("--n-files", type=int, default=1,
+                        help="number of Excel files")
+    parser.add_argument("--n-sheets", type=int, default=1,
+                        help="number of sheets of each Excel file")
+    parser.add_argument("--var-types", nargs="+",
+                        default=['constants', 'data', 'lookups'],
+                        choices=['constants', 'data', 'lookups'],
+                        help="types of variables")
+    parser.add_argument("--max-dims", type=int, default=3,
+                        help="maximum number of dimensions of a variable")
+    parser.add_argument("--layouts", nargs="+",
+                        default=['row', 'col', 'sheet', 'file'],
+                        choices=['row', 'col', 'sheet', 'file'],
+                        help="layouts of the separated dimensions")
+    parser.add_argument("--series-length", type=int, default=10,
+                        help="length of the time and x series")
+    parser.add_argument("--config-file", default="config.json",
+                        help="name of the configuration file, .json, "
+                             ".ndjson or .jsonl")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the random number generator")
+
+    options = parser.parse_args(args)
+    paths = generate_project(**vars(options))
+
+    print(f"Model: {paths['model']}")
+    print(f"Configuration: {paths['config']}")
+    print(f"Excel files: {', '.join(map(str, paths['workbooks']))}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,131 @@
+"""
+Manifest of the written cellrange names.
+"""
+import json
+import hashlib
+from pathlib import Path
+
+from .._version import __version__
+
+
+class Manifest():
+    """
+    Class to save a JSON manifest with the cellrange names written since
+    the manifest file was set. For each Excel file, sheet and name the
+    manifest gives the absolute cellrange, the variable and the
+    subscripts, together with the SHA-256 of each Excel file after saving
+    it. Thus, other tools can resolve the names without opening the Excel
+    files.
+    """
+    _file = None
+    _names = {}
+    _committed = {}
+
+    @classmethod
+    def set_file(cls, file):
+        """
+        Set the manifest file. If None the manifest is disabled.
+
+        Parameters
+        ----------
+        file: str or pathlib.Path or None
+            File to save the manifest in (.json).
+
+        """
+        cls._file = None if file is None else Path(file).resolve()
+        cls._names = {}
+        cls._committed = {}
+
+    @classmethod
+    def enabled(cls):
+        """
+        Check if the manifest is enabled.
+
+        Returns
+        -------
+        bool
+
+        """
+        return cls._file is not None
+
+    @classmethod
+    def add(cls, var, cellranges, subscripts):
+        """
+        Add the cellranges of a variable. They will be saved when calling
+        commit, after saving the Excel files.
+
+        Parameters
+        ----------
+        var: str
+            Name of the variable.
+
+        cellranges: list
+            The list of (name, file, sheet, cellrange) written.
+
+        subscripts: list
+            The subscripts of each cellrange, empty for the series.
+
+        """
+        if cls._file is None:
+            return
+
+        for (name, file, sheet, cellrange), subs in zip(cellranges,
+                                                        subscripts):
+            sheets = cls._names.setdefault(str(Path(file).resolve()), {})
+            sheets.setdefault(sheet, {})[name] = {
+                'cellrange': cellrange.rsplit("!", 1)[-1],
+                'variable': var,
+                'subscripts': [sub.strip() for sub in subs]
+            }
+
+    @classmethod
+    def commit(cls):
+        """
+        Save the manifest with the added cellranges and the SHA-256 of
+        their Excel files. The cellranges of the previous commits since
+        the manifest file was set are kept, so several calls to execute
+        give a single manifest.
+
+        Returns
+        -------
+        dict or None
+            The manifest, None if it is disabled.
+
+        """
+        if cls._file is None:
+            return None
+
+        for file, sheets in cls._names.items():
+            committed = cls._committed.setdefault(file, {})
+            for sheet, names in sheets.items():
+                committed.setdefault(sheet, {}).update(names)
+
+        manifest = {
+            'version': __version__,
+            'workbooks': {
+                file: _hash_file(file) for file in sorted(cls._committed)},
+            'names': cls._committed
+        }
+        with open(cls._file, 'w') as file:
+            json.dump(manifest, file, indent=4)
+
+        cls._names = {}
+        return manifest
+
+    @classmethod
+    def discard(cls):
+        """
+        Discards the cellranges added since the last commit.
+        """
+        cls._names = {}
+
+
+def _hash_file(file):
+    """
+    Get the SHA-256 of a file.
+    """
+    sha256 = hashlib.sha256()
+    with open(file, 'rb') as data:
+        for chunk in iter(lambda: data.read(2**20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
@@ -0,0 +1,178 @@
+"""
+Fast reading of the defined names of the Excel files.
+"""
+import re
+import zipfile
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree.ElementTree import iterparse
+
+from .stats import Stats
+from .reader import _boundaries
+from .validation import validate_config
+from ..excels2vensim import _create_object, _validate_each
+
+# namespaces of the Office Open XML files
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+# reference to a cell or a rectangular cellrange of a sheet
+REFERENCE = re.compile(
+    r"^(?:'(?P<quoted>(?:[^']|'')+)'|(?P<sheet>[^'!]+))!"
+    r"(?P<cells>\$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?)$")
+
+
+def read_defined_names(file):
+    """
+    Read the defined names of an Excel file without loading it. Only the
+    workbook part of the file is parsed, up to the end of the defined
+    names, so it is much faster than loading the file with openpyxl.
+
+    Parameters
+    ----------
+    file: str or pathlib.Path
+        Excel file (.xlsx, .xlsm).
+
+    Returns
+    -------
+    list of tuples
+        The (name, scope, reference) of each defined name, where scope
+        is the name of the sheet of the local names or None for the
+        global names and reference is the text of the name, e.g.,
+        'Sheet1!$B$3:$D$7'.
+
+    Raises
+    ------
+    ValueError
+        If the file is not an Office Open XML file.
+
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise ValueError(
+            f"\nCannot read the defined names of '{file}'. Only Office "
+            "Open XML files (.xlsx, .xlsm) are supported.")
+
+    sheets, names = [], []
+    with archive, archive.open(_workbook_part(archive)) as xml:
+        for _, element in iterparse(xml):
+            if element.tag == MAIN_NS + "sheet":
+                sheets.append(element.get("name"))
+            elif element.tag == MAIN_NS + "definedName":
+                names.append((element.get("name"),
+                              element.get("localSheetId"),
+                              element.text or ""))
+            elif element.tag == MAIN_NS + "definedNames":
+                # the rest of the workbook is not needed
+                break
+
+    return [
+        (name, None if local is None else sheets[int(local)], reference)
+        for name, local, reference in names]
+
+
+def read_names(files, workers=None):
+    """
+    Read the defined names of several Excel files in parallel.
+
+    Parameters
+    ----------
+    files: iterable
+        Excel files to read.
+
+    workers: int or None (optional)
+        Maximum number of files read at the same time. If None, the
+        default of concurrent.futures.ThreadPoolExecutor is used.
+        Default is None.
+
+    Returns
+    -------
+    dict
+        The defined names of each file, as returned by
+        read_defined_names.
+
+    """
+    files = list(dict.fromkeys(files))
+    with Stats.span('read', 'defined names'),\
+         ThreadPoolExecutor(workers) as executor:
+        return dict(zip(files, executor.map(read_defined_names, files)))
+
+
+def parse_reference(reference):
+    """
+    Parse the reference of a defined name.
+
+    Parameters
+    ----------
+    reference: str
+        The reference, e.g., 'Sheet1!$B$3:$D$7'.
+
+    Returns
+    -------
+    tuple or None
+        The (sheet, min_row, min_col, max_row, max_col) of the reference
+        or None if it is not a cell or a rectangular cellrange of a
+        sheet.
+
+    """
+    match = REFERENCE.match(reference.strip())
+    if match is None:
+        return None
+    if match.group("quoted") is not None:
+        sheet = match.group("quoted").replace("''", "'")
+    else:
+        sheet = match.group("sheet")
+    return (sheet, *_boundaries(match.group("cells").upper()))
+
+
+def plan_names(vars_dict):
+    """
+    Plan the cellrange names of the variables as execute, without
+    reading or writing any Excel file.
+
+    Parameters
+    ----------
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable.
+
+    Yields
+    ------
+    (str, str, str, str, str)
+        The variable, name, file, sheet and cellrange of each planned
+        cellrange name.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is not valid.
+
+    """
+    if hasattr(vars_dict, 'items'):
+        validate_config(vars_dict)
+        vars_dict = vars_dict.items()
+    else:
+        vars_dict = _validate_each(vars_dict)
+
+    for var, info in vars_dict:
+        with Stats.span('plan', var):
+            obj = _create_object(var, info)
+            obj.get_vensim(loading=info.get('loading', 'DIRECT'))
+        for name, file, sheet, cellrange in obj._get_cellranges():
+            yield var, name, file, sheet, cellrange
+
+
+def _workbook_part(archive):
+    """
+    Get the path of the workbook part in the archive of an Excel file.
+    """
+    try:
+        with archive.open("_rels/.rels") as xml:
+            for _, element in iterparse(xml):
+                if element.tag == RELS_NS + "Relationship"\
+                   and element.get("Type", "").endswith("/officeDocument"):
+                    return posixpath.normpath(
+                        element.get("Target").lstrip("/"))
+    except KeyError:
+        pass
+    return "xl/workbook.xml"
@@ -0,0 +1,172 @@
+"""
+Patching of the generated equations into a Vensim model file.
+"""
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+# line that starts the sketch information of the model
+SKETCH_MARKER = "\\\\\\---///"
+# separators that can be used in the Vensim names
+NAME_SEPARATORS = re.compile(r"[\s_]+")
+
+
+def patch_model(model_file, equations, output_file=None):
+    """
+    Patch the equations of the variables in a Vensim model file. The
+    equations of the variables already defined in the model replace the
+    existing ones, the rest are added after the last equation of the
+    model, before the sketch. The model is streamed in a single pass,
+    the rest of the file is kept unchanged. The patched model is saved
+    in a temporary file that replaces the original one at the end, so
+    the model is not modified if any error happens.
+
+    Parameters
+    ----------
+    model_file: str or pathlib.Path
+        Vensim model file (.mdl).
+
+    equations: str
+        The Vensim equations of the variables, as returned by execute.
+
+    output_file: str or pathlib.Path or None (optional)
+        File to save the patched model in. If None, the model file is
+        overwritten. Default is None.
+
+    Returns
+    -------
+    dict
+        The 'replaced' and 'added' variables.
+
+    """
+    model_file = Path(model_file)
+    output_file = Path(output_file) if output_file else model_file
+
+    # index the generated equations by variable name
+    new_blocks = {}
+    for name, lines in _iter_blocks(equations.splitlines(keepends=True)):
+        if name is not None:
+            new_blocks[_normalize(name)] = (
+                name.strip(), "".join(lines).rstrip("\r\n"))
+
+    replaced, added = [], []
+    fd, temp_file = tempfile.mkstemp(
+        dir=output_file.parent, prefix=f".{output_file.stem}.",
+        suffix=output_file.suffix)
+    try:
+        # the undecodable bytes are written back unchanged
+        with open(model_file, encoding="utf-8", errors="surrogateescape",
+                  newline="") as model,\
+             os.fdopen(fd, "w", encoding="utf-8", errors="surrogateescape",
+                       newline="") as out:
+            newline = _get_newline(model)
+            pending = dict(new_blocks)
+
+            def write_block(block):
+                out.write(block.replace("\r\n", "\n").replace(
+                    "\n", newline) + newline)
+
+            for name, lines in _iter_blocks(model):
+                key = _normalize(name) if name is not None else None
+                if key in new_blocks:
+                    if key in pending:
+                        write_block(pending.pop(key)[1])
+                        replaced.append(new_blocks[key][0])
+                    # the variable equations end with the block
+                    continue
+                if name is None and lines[0].startswith(SKETCH_MARKER):
+                    # add the new variables before the sketch
+                    for new_name, block in pending.values():
+                        write_block(block)
+                        out.write(newline)
+                        added.append(new_name)
+                    pending = {}
+                out.writelines(lines)
+
+            for new_name, block in pending.values():
+                # model without sketch
+                out.write(newline)
+                write_block(block)
+                added.append(new_name)
+
+        if model_file.is_file():
+            shutil.copymode(model_file, temp_file)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+    return {'replaced': replaced, 'added': added}
+
+
+def _iter_blocks(lines):
+    """
+    Split the lines of a model in blocks. Each equation block, from its
+    first line to the line ending with '|', is yielded with the name of
+    its variable. The rest of lines are yielded one by one without name.
+
+    Yields
+    ------
+    (str or None, list)
+        The name of the variable and the lines of the block.
+
+    """
+    block = []
+    in_macro = False
+    in_sketch = False
+    for line in lines:
+        stripped = line.strip()
+        if in_sketch or line.startswith(SKETCH_MARKER):
+            # the sketch has no equations
+            in_sketch = True
+            yield None, [line]
+            continue
+        if not block:
+            if not stripped or stripped.startswith(("{", "*", ":"))\
+               or in_macro:
+                # blank lines, encoding, groups and macros
+                if stripped.startswith(":MACRO:"):
+                    in_macro = True
+                elif stripped.startswith(":END OF MACRO:"):
+                    in_macro = False
+                yield None, [line]
+                continue
+
+        block.append(line)
+        if stripped.endswith("|") and not stripped.endswith("~~|"):
+            yield _get_name(block[0]), block
+            block = []
+
+    if block:
+        # unfinished block
+        yield None, block
+
+
+def _get_name(line):
+    """
+    Get the name of the variable from the first line of its block.
+    """
+    line = line.strip()
+    if line.startswith('"'):
+        return line[:line.index('"', 1) + 1]\
+            if '"' in line[1:] else line
+    return re.split(r"[\[\(=:~|]", line, maxsplit=1)[0]
+
+
+def _normalize(name):
+    """
+    Normalize a Vensim name, which is not case sensitive and where the
+    spaces and underscores are equivalent.
+    """
+    return NAME_SEPARATORS.sub(" ", name.strip()).lower()
+
+
+def _get_newline(file):
+    """
+    Get the line break of a file, the file is rewinded.
+    """
+    line = file.readline()
+    file.seek(0)
+    return "\r\n" if line.endswith("\r\n") else "\n"
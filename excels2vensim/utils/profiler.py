@@ -0,0 +1,95 @@
+"""
+Profiler class.
+"""
+import io
+import cProfile
+import pstats
+from pathlib import Path
+from contextlib import contextmanager
+
+
+class Profiler():
+    """
+    Class to profile a run with cProfile. When closing it, the stats
+    are saved in the given file and a text summary with the functions
+    with the largest cumulative time is saved next to it, adding the
+    .txt suffix to the file name. cProfile only profiles the thread
+    where it is enabled, the functions run in other threads while the
+    profiler is active can be profiled with the thread method.
+
+    Parameters
+    ----------
+    file: str or pathlib.Path
+        File to save the profile stats in, e.g., 'out.prof'. They can
+        be read with pstats or visualization tools like snakeviz.
+
+    top: int (optional)
+        Number of functions to include in the text summary. Default
+        is 30.
+
+    Examples
+    --------
+    >>> with Profiler('out.prof'):
+    ...     load_from_json('my_vars.json')
+
+    """
+    _active = None
+
+    def __init__(self, file, top=30):
+        self.file = Path(file)
+        self.summary_file = self.file.with_name(self.file.name + ".txt")
+        self.top = top
+        self._profile = cProfile.Profile()
+        self._thread_profiles = []
+
+    def __enter__(self):
+        Profiler._active = self
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profile.disable()
+        Profiler._active = None
+        self.save()
+
+    @classmethod
+    @contextmanager
+    def thread(cls):
+        """
+        Context manager to profile the code run in a thread other than
+        the one of the active profiler. The results are added to the
+        active profiler. It does nothing if there is no active profiler.
+        """
+        profiler = cls._active
+        if profiler is None:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # pragma: no cover
+            # since Python 3.12 the active profiler already profiles all
+            # the threads and only one profiler can be enabled
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            profiler._thread_profiles.append(profile)
+
+    def save(self):
+        """
+        Save the profile stats and the text summary.
+        """
+        summary = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=summary)
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        stats.dump_stats(self.file)
+
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        with open(self.summary_file, 'w') as file:
+            file.write(summary.getvalue())
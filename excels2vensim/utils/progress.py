@@ -0,0 +1,97 @@
+"""
+Progress and cancellation classes for long runs.
+"""
+import threading
+
+
+class Cancelled(Exception):
+    """
+    Error raised when a run is cancelled with a CancelToken.
+    """
+    def __init__(self):
+        super().__init__("\nThe execution has been cancelled.")
+
+
+class CancelToken():
+    """
+    Class to cancel a run from another thread. The run checks the token
+    between variables and between the saving of the Excel files. If it
+    is cancelled, the opened Excel files are closed without saving.
+
+    Examples
+    --------
+    >>> token = CancelToken()
+    >>> # in other thread, e.g., when pressing a button
+    >>> token.cancel()
+
+    """
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """
+        Cancel the run.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        """
+        True if the run has been cancelled.
+        """
+        return self._event.is_set()
+
+    def check(self):
+        """
+        Raise Cancelled if the run has been cancelled.
+        """
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class Progress():
+    """
+    Progress of a run, passed to the progress callbacks.
+
+    Attributes
+    ----------
+    phase: str
+        'execute' while executing the variables and 'save' while saving
+        the Excel files.
+
+    current: str or None
+        Name of the last executed variable or saved Excel file.
+
+    variables: int
+        Number of executed variables.
+
+    total_variables: int or None
+        Total number of variables, None if it is not known in advance,
+        e.g., when reading newline delimited JSON files.
+
+    workbooks: int
+        Number of saved Excel files.
+
+    total_workbooks: int or None
+        Total number of Excel files to save, None until the saving
+        starts.
+
+    bytes: int
+        Number of bytes written in the saved Excel files.
+
+    """
+    def __init__(self, total_variables=None):
+        self.phase = 'execute'
+        self.current = None
+        self.variables = 0
+        self.total_variables = total_variables
+        self.workbooks = 0
+        self.total_workbooks = None
+        self.bytes = 0
+
+    def __repr__(self):
+        return (
+            f"Progress(phase={self.phase!r}, current={self.current!r}, "
+            f"variables={self.variables}/{self.total_variables}, "
+            f"workbooks={self.workbooks}/{self.total_workbooks}, "
+            f"bytes={self.bytes})")
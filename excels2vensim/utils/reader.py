@@ -0,0 +1,123 @@
+"""
+Reading of the values of the cellranges.
+"""
+from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
+
+from .stats import Stats
+
+
+def read_cellranges(cellranges, single_pass=True):
+    """
+    Read the values of several cellranges. Each Excel file is opened
+    once in read-only mode.
+
+    Parameters
+    ----------
+    cellranges: iterable
+        The (file, sheet, cellrange) to read, where the cellrange is
+        given as in the cellrange names, e.g., 'Sheet1!$B$3:$D$7' or
+        '$B$3:$D$7'. The sheet names are not case sensitive, as in the
+        cellrange names.
+
+    single_pass: bool (optional)
+        If True, the region of each sheet that contains all its
+        cellranges is read in a single pass, which is faster for many
+        close cellranges. If False, only the cells of each cellrange are
+        read, which is faster for a few cellranges far apart, e.g.,
+        single cells. Default is True.
+
+    Returns
+    -------
+    dict
+        The values of each (file, sheet, cellrange) as a list of rows,
+        the empty cells are None.
+
+    Raises
+    ------
+    ValueError
+        If a sheet does not exist.
+
+    """
+    # group the boundaries of the cellranges by file and sheet
+    groups = {}
+    for file, sheet, cellrange in cellranges:
+        groups.setdefault(file, {}).setdefault(sheet, {})[cellrange] =\
+            _boundaries(cellrange)
+
+    values = {}
+    for file, sheets in groups.items():
+        with Stats.span('read', str(file)):
+            wb = load_workbook(file, read_only=True, data_only=True)
+            try:
+                for sheet, boundaries in sheets.items():
+                    worksheet = _get_sheet(wb, file, sheet)
+                    if single_pass:
+                        read = _read_region(worksheet, boundaries)
+                    else:
+                        read = {
+                            cellrange: _read_box(worksheet, *bounds)
+                            for cellrange, bounds in boundaries.items()}
+                    for cellrange, region in read.items():
+                        values[file, sheet, cellrange] = region
+            finally:
+                wb.close()
+
+    return values
+
+
+def _boundaries(cellrange):
+    """
+    Get the (min_row, min_col, max_row, max_col) of a cellrange, ignoring
+    its sheet.
+    """
+    min_col, min_row, max_col, max_row = range_boundaries(
+        cellrange.rsplit("!", 1)[-1].replace("$", ""))
+    return min_row, min_col, max_row, max_col
+
+
+def _get_sheet(wb, file, sheet):
+    """
+    Get a sheet of a workbook by its case insensitive name.
+    """
+    for sheet_name in wb.sheetnames:
+        if sheet_name.lower() == sheet.lower():
+            return wb[sheet_name]
+
+    raise ValueError(
+        f"\nThe sheet '{sheet}' does not exist in '{file}'.")
+
+
+def _read_region(worksheet, boundaries):
+    """
+    Read the region of a sheet containing all the given boundaries and
+    split it in the values of each cellrange.
+    """
+    min_row = min(bound[0] for bound in boundaries.values())
+    min_col = min(bound[1] for bound in boundaries.values())
+    max_row = max(bound[2] for bound in boundaries.values())
+    max_col = max(bound[3] for bound in boundaries.values())
+
+    rows = _read_box(worksheet, min_row, min_col, max_row, max_col)
+
+    return {
+        cellrange: [
+            list(row[col0-min_col:col1-min_col+1])
+            for row in rows[row0-min_row:row1-min_row+1]]
+        for cellrange, (row0, col0, row1, col1) in boundaries.items()
+    }
+
+
+def _read_box(worksheet, min_row, min_col, max_row, max_col):
+    """
+    Read the values of a rectangular region of a sheet as a list of rows.
+    """
+    width = max_col - min_col + 1
+    rows = [
+        list(row) + [None] * (width - len(row))
+        for row in worksheet.iter_rows(
+            min_row=min_row, max_row=max_row,
+            min_col=min_col, max_col=max_col, values_only=True)]
+    # the rows after the last one with values are not read
+    rows += [[None] * width for _ in range(max_row - min_row + 1 - len(rows))]
+    return rows
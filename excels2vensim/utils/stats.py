@@ -0,0 +1,368 @@
+"""
+Run statistics collector class.
+"""
+import sys
+import tracemalloc
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # not available in Windows
+    resource = None
+
+
+# phases in the order they are shown in the summary
+PHASES = {
+    'subscripts': "Read subscripts",
+    'validation': "Validate configuration",
+    'plan': "Plan variables",
+    'read': "Read Excel files",
+    'write': "Write cellranges",
+    'save': "Save Excel files",
+}
+# phases whose time is also shown for each label (the Excel file)
+LABELED_PHASES = ['read', 'write', 'save']
+
+# number of variables shown in the summary with the largest memory peak
+N_LARGEST = 10
+
+COUNTERS = {
+    'variables': "Variables",
+    'cache_hits': "Cached variables",
+    'equations': "Equations emitted",
+    'names_added': "Names added",
+    'names_skipped': "Names skipped",
+    'names_replaced': "Names replaced",
+    'names_removed': "Names removed",
+}
+
+
+class Stats():
+    """
+    Class to collect the time spent in each phase of a run and the
+    counters of the written cellrange names and equations. The
+    statistics are collected while the object is used as a context
+    manager. Each phase is also timed for each label, e.g., the Excel
+    file or the variable.
+
+    Parameters
+    ----------
+    memory: bool (optional)
+        If True, the peak of the memory allocated by Python during each
+        phase is also measured with tracemalloc, which makes the run
+        slower. The peak of a phase includes the peaks of the phases
+        run inside it. Default is False.
+
+    Examples
+    --------
+    >>> with Stats() as stats:
+    ...     load_from_json('my_vars.json')
+    >>> print(stats.summary())
+
+    """
+    _active = None
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.phases = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.total_time = 0
+        self.peak = 0
+        self.max_rss = None
+        self._previous = None
+        self._start = None
+        self._stop_tracing = False
+        # [memory at the start, maximum peak] of the running spans
+        self._memory_stack = []
+
+    def __enter__(self):
+        self._previous = Stats._active
+        Stats._active = self
+        if self.memory:
+            self._stop_tracing = not tracemalloc.is_tracing()
+            if self._stop_tracing:
+                tracemalloc.start()
+            self._memory_stack = [[tracemalloc.get_traced_memory()[0], 0]]
+            tracemalloc.reset_peak()
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.total_time += perf_counter() - self._start
+        if self.memory:
+            self.peak = max(self.peak, self._pop_memory())
+            if self._stop_tracing:
+                tracemalloc.stop()
+            self.max_rss = _get_max_rss()
+        Stats._active = self._previous
+        self._previous = None
+
+    @classmethod
+    def span(cls, phase, label=None):
+        """
+        Context manager to time a phase in the active collector. It
+        does nothing if there is no active collector.
+
+        Parameters
+        ----------
+        phase: str
+            Name of the phase.
+
+        label: str or None (optional)
+            Label of the timed element, e.g., the Excel file or the
+            variable name. Default is None.
+
+        Returns
+        -------
+        context manager
+
+        """
+        if cls._active is None:
+            return _NULL_SPAN
+        elif cls._active.memory:
+            return _MemorySpan(cls._active, phase, label)
+        return _Span(cls._active, phase, label)
+
+    @classmethod
+    def count(cls, counter, value=1):
+        """
+        Increase a counter of the active collector. It does nothing if
+        there is no active collector.
+
+        Parameters
+        ----------
+        counter: str
+            Name of the counter.
+
+        value: int (optional)
+            Value to add. Default is 1.
+
+        """
+        if cls._active is not None:
+            counters = cls._active.counters
+            counters[counter] = counters.get(counter, 0) + value
+
+    def to_dict(self):
+        """
+        Get the statistics as a dictionary that can be saved as JSON.
+
+        Returns
+        -------
+        dict
+            The 'total_time' in seconds, the 'phases' with the 'calls',
+            'time' and the same values for each of their 'labels' and
+            the 'counters'. If the memory is measured, the 'peak' in bytes
+            of the run, the phases and the labels and the 'max_rss' in
+            bytes of the process are also included.
+
+        """
+        stats = {
+            'total_time': self.total_time,
+            'phases': {
+                phase: {
+                    **{key: value for key, value in values.items()
+                       if key != 'labels'},
+                    'labels': {
+                        str(label): dict(label_values)
+                        for label, label_values in values['labels'].items()
+                    }
+                }
+                for phase, values in self.phases.items()
+            },
+            'counters': dict(self.counters)
+        }
+        if self.memory:
+            stats['peak'] = self.peak
+            stats['max_rss'] = self.max_rss
+
+        return stats
+
+    def summary(self):
+        """
+        Get the summary table of the statistics.
+
+        Returns
+        -------
+        str
+            The table with the time of each phase, the time of each
+            Excel file and the counters. If the memory is measured, the
+            table also includes the memory peaks and the variables with
+            the largest peaks.
+
+        """
+        width = 72 if self.memory else 60
+
+        def row(name, values):
+            line = f"{name:<32}{values['calls']:>8}{values['time']:>12.3f}"\
+                   f"{100*values['time']/total:>8.1f}"
+            if self.memory:
+                line += f"{_to_mb(values['peak']):>12.3f}"
+            return line
+
+        lines = [
+            f"{'Phase':<32}{'Calls':>8}{'Time (s)':>12}{'%':>8}"
+            + (f"{'Peak (MB)':>12}" if self.memory else ""),
+            "-" * width
+        ]
+        total = self.total_time or 1
+        phases = [phase for phase in PHASES if phase in self.phases]\
+            + [phase for phase in self.phases if phase not in PHASES]
+        for phase in phases:
+            values = self.phases[phase]
+            lines.append(row(PHASES.get(phase, phase), values))
+            if phase in LABELED_PHASES:
+                for label, label_values in values['labels'].items():
+                    lines.append(row(f"  {str(label)[-30:]}", label_values))
+
+        lines += [
+            "-" * width,
+            f"{'Total':<32}{'':>8}{self.total_time:>12.3f}"
+            + (f"{'':>8}{_to_mb(self.peak):>12.3f}" if self.memory else "")
+        ]
+
+        if self.memory:
+            if self.max_rss is not None:
+                lines.append(
+                    f"{'Maximum resident set size':<60}"
+                    f"{_to_mb(self.max_rss):>12.3f}")
+            variables = sorted(
+                self.phases.get('plan', {'labels': {}})['labels'].items(),
+                key=lambda item: item[1]['peak'], reverse=True)[:N_LARGEST]
+            if variables:
+                lines += [
+                    "",
+                    f"{'Variable':<60}{'Peak (MB)':>12}",
+                    "-" * width
+                ]
+                for var, values in variables:
+                    lines.append(f"{str(var)[-58:]:<60}"
+                                 f"{_to_mb(values['peak']):>12.3f}")
+
+        lines += [
+            "",
+            f"{'Counter':<32}{'Value':>8}",
+            "-" * 40,
+        ]
+        for counter, value in self.counters.items():
+            lines.append(f"{COUNTERS.get(counter, counter):<32}{value:>8}")
+
+        return "\n".join(lines)
+
+    def _add(self, phase, label, time, peak=None):
+        """
+        Add the time and the memory peak of a phase.
+        """
+        values = self.phases.setdefault(
+            phase, {'calls': 0, 'time': 0, 'labels': {}})
+        values['calls'] += 1
+        values['time'] += time
+        if peak is not None:
+            values['peak'] = max(values.get('peak', 0), peak)
+        if label is not None:
+            label_values = values['labels'].setdefault(
+                label, {'calls': 0, 'time': 0})
+            label_values['calls'] += 1
+            label_values['time'] += time
+            if peak is not None:
+                label_values['peak'] = max(label_values.get('peak', 0), peak)
+
+    def _push_memory(self):
+        """
+        Start measuring the memory peak of a span.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        # keep the peak reached until now by the parent span
+        self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+        self._memory_stack.append([current, current])
+        tracemalloc.reset_peak()
+
+    def _pop_memory(self):
+        """
+        Stop measuring the memory peak of a span.
+
+        Returns
+        -------
+        int
+            The peak of the memory allocated during the span over the
+            memory allocated at its start, in bytes.
+
+        """
+        start, peak = self._memory_stack.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if self._memory_stack:
+            # propagate the peak to the parent span
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+        return peak - start
+
+
+class _Span():
+    """
+    Context manager to time a phase.
+    """
+    __slots__ = ('stats', 'phase', 'label', 'start')
+
+    def __init__(self, stats, phase, label):
+        self.stats = stats
+        self.phase = phase
+        self.label = label
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats._add(self.phase, self.label, perf_counter() - self.start)
+
+
+class _MemorySpan(_Span):
+    """
+    Context manager to time a phase and measure its memory peak.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        self.stats._push_memory()
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        time = perf_counter() - self.start
+        self.stats._add(
+            self.phase, self.label, time, self.stats._pop_memory())
+
+
+class _NullSpan():
+    """
+    Context manager that does nothing, used when there is no active
+    collector.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _get_max_rss():
+    """
+    Get the maximum resident set size of the process in bytes, None if
+    it is not available.
+    """
+    if resource is None:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes in Linux and bytes in macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _to_mb(value):
+    """
+    Convert bytes to megabytes.
+    """
+    return (value or 0) / 2**20
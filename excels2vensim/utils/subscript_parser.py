@@ -1,7 +1,9 @@
 """
 Functions for parsing the subscript from a .mdl file using PySD.
 """
+import ast
 import json
+from pathlib import Path
 
 from pysd.translators.vensim.vensim_file import VensimFile
 from pysd.translators.vensim.vensim_element import SubscriptRange
@@ -74,3 +76,64 @@ def _translate_vensim(mdl_file):
                 subscripts.append(new_element.get_abstract_subscript_range())
 
     return SubscriptManager(subscripts, model.mdl_path).subscripts
+
+
+def get_python_subscripts(py_file):
+    """
+    Gets the subscripts from a PySD translated Python model file. The
+    model is not imported nor executed, the subscripts dictionary is
+    extracted from its syntax tree.
+
+    Parameters
+    ----------
+    py_file: str or pathlib.Path
+        File path of a PySD translated model.
+
+    Returns
+    -------
+    subscript_dict: dict
+        Dictionary of the subscripts.
+
+    Raises
+    ------
+    ValueError
+        If the subscripts dictionary cannot be found in the model.
+
+    """
+    py_file = Path(py_file)
+    with open(py_file, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=str(py_file))
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name)\
+               and target.id == "_subscript_dict":
+                try:
+                    return ast.literal_eval(node.value)
+                except ValueError:
+                    break
+            elif isinstance(target, ast.Tuple)\
+                and any(isinstance(element, ast.Name)
+                        and element.id == "_subscript_dict"
+                        for element in target.elts)\
+                and isinstance(node.value, ast.Call)\
+                    and len(node.value.args) == 2:
+                # models split in modules load the subscripts from a
+                # json file, i.e., load_model_data(_root, "model_name")
+                try:
+                    model_name = ast.literal_eval(node.value.args[1])
+                except ValueError:
+                    break
+                with open(py_file.parent.joinpath(
+                        f"_subscripts_{model_name}.json")) as file:
+                    return json.load(file)
+
+    raise ValueError(
+        f"\nThe subscripts dictionary could not be found in '{py_file}'. "
+        "It must be a PySD translated model.")
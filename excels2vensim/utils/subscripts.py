@@ -4,7 +4,8 @@ Subscript manager class.
 import json
 from pathlib import Path
 
-from .subscript_parser import get_subscripts
+from .subscript_parser import get_subscripts, get_python_subscripts
+from .stats import Stats
 
 
 class Subscripts():
@@ -16,23 +17,36 @@ class Subscripts():
     @classmethod
     def read(cls, file_name):
         """
-        Read the subscripts form a .mdl or .json file.
+        Read the subscripts form a .mdl, .py or .json file or a PySD
+        model. The PySD translated models (.py) are not translated
+        again nor imported.
 
         Parameters
         ----------
-        file_name: str
-            Full name of the .json or .mdl file.
+        file_name: str or pysd.py_backend.model.Model
+            Full name of the .json, .mdl or .py file or the PySD model
+            object.
 
         """
+        if hasattr(file_name, 'subscripts'):
+            # PySD model object
+            with Stats.span('subscripts', "model"):
+                cls.set(file_name.subscripts)
+            return
+
         file_name = Path(file_name)
-        if file_name.suffix.lower() == ".mdl":
-            cls.set(get_subscripts(
-                file_name, str(file_name.with_suffix(""))+"_subscripts.json"))
-        elif file_name.suffix.lower() == ".json":
-            with open(file_name) as file:
-                cls.set(json.load(file))
-        else:
-            pass
+        with Stats.span('subscripts', str(file_name)):
+            if file_name.suffix.lower() == ".py":
+                cls.set(get_python_subscripts(file_name))
+            elif file_name.suffix.lower() == ".mdl":
+                cls.set(get_subscripts(
+                    file_name,
+                    str(file_name.with_suffix(""))+"_subscripts.json"))
+            elif file_name.suffix.lower() == ".json":
+                with open(file_name) as file:
+                    cls.set(json.load(file))
+            else:
+                pass
 
     @classmethod
     def get(cls, key):
@@ -0,0 +1,346 @@
+"""
+Validation of the variables configuration.
+"""
+import re
+from pathlib import Path
+
+from .subscripts import Subscripts
+from .stats import Stats
+
+
+# valid values of the configuration fields
+TYPES = ['constants', 'lookups', 'data']
+LOADINGS = ['DIRECT', 'XLS']
+INTERPS = ['INTERPOLATE', 'RAW', 'HOLD BACKWARD', 'LOOK FORWARD']
+READ_ALONG = ['col', 'row', 'sheet', 'file']
+SERIES_READ_ALONG = ['col', 'row']
+
+# cell like strings, such as "A1", "b16", "AC19"...
+CELL_REGEX = re.compile(r"^[A-Za-z]{1,3}0*[1-9][0-9]*$")
+# keys that can be written in a JSON path with the dot notation
+KEY_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class ConfigError(ValueError):
+    """
+    Error raised when the configuration of the variables is not valid.
+
+    Parameters
+    ----------
+    errors: list
+        List of the (variable, JSON path, message) of each error.
+
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(
+            f"\nInvalid configuration, {len(errors)} error(s) found:"
+            + "".join(
+                f"\n {message} ({path})" for _, path, message in errors))
+
+
+def validate_config(vars_dict):
+    """
+    Validate the configuration of the variables against the current
+    subscripts without reading or writing any Excel file. All the
+    errors are reported together.
+
+    Parameters
+    ----------
+    vars_dict: dict or iterable
+        Python dictionary with the needed information or iterable of
+        (name, configuration) pairs of each variable.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigError
+        If the configuration of any variable is not valid.
+
+    """
+    if hasattr(vars_dict, 'items'):
+        vars_dict = vars_dict.items()
+
+    errors = []
+    with Stats.span('validation'):
+        for var, info in vars_dict:
+            errors += get_errors(var, info)
+
+    if errors:
+        raise ConfigError(errors)
+
+
+def get_errors(var, info):
+    """
+    Get the errors of the configuration of a variable.
+
+    Parameters
+    ----------
+    var: str
+        Name of the variable.
+
+    info: dict
+        Configuration of the variable.
+
+    Returns
+    -------
+    errors: list
+        List of the (variable, JSON path, message) of each error.
+
+    """
+    errors = []
+
+    def error(path, message):
+        errors.append((var, _json_path(var, *path), message))
+
+    if not isinstance(info, dict):
+        error((), f"The configuration of '{var}' must be an object.")
+        return errors
+
+    # check the type of the variable and the allowed fields
+    var_type = info.get('type')
+    if 'type' not in info:
+        error((), f"Missing 'type' for '{var}'.")
+    elif not isinstance(var_type, str) or var_type.lower() not in TYPES:
+        error(('type',),
+              f"Invalid type of variable '{var_type}' for '{var}'."
+              + " It must be 'constants', 'lookups' or 'data'.")
+        var_type = None
+    else:
+        var_type = var_type.lower()
+
+    for key in info:
+        if key not in FIELDS.get(var_type, ALL_FIELDS):
+            error((key,), f"Unknown field '{key}' for '{var}'.")
+
+    for key in REQUIRED_FIELDS.get(var_type, REQUIRED_FIELDS['constants']):
+        if key not in info:
+            error((), f"Missing '{key}' for '{var}'.")
+
+    # check the simple fields
+    for key, check in CHECKS.items():
+        if key in info:
+            message = check(info[key])
+            if message:
+                error((key,), message)
+
+    # check the dimensions
+    dims = info.get('dims', [])
+    valid_dims = []
+    dims_names = []
+    if isinstance(dims, (list, tuple)):
+        dims_names = [dim.strip() for dim in dims if isinstance(dim, str)]
+        for i, dim in enumerate(dims):
+            if not isinstance(dim, str):
+                error(('dims', i), "The dimensions must be strings.")
+            elif dim.strip() not in Subscripts._subscript_dict:
+                error(('dims', i),
+                      f"'{dim}' is not in the list of subscript ranges.")
+            elif dim.strip() in valid_dims:
+                error(('dims', i), f"'{dim}' is repeated.")
+            else:
+                valid_dims.append(dim.strip())
+
+    dimensions = info.get('dimensions', {})
+    along_visits = []
+    if var_type in ['lookups', 'data'] and isinstance(
+       info.get(SERIES[var_type]), dict):
+        # the series is read along a row or a column with step 1
+        along_visits.append(info[SERIES[var_type]].get('read_along'))
+
+    if isinstance(dimensions, dict):
+        for dim, along in dimensions.items():
+            path = ('dimensions', dim)
+            if dim.strip() not in Subscripts._subscript_dict:
+                error(path,
+                      f"'{dim}' is not in the list of subscript ranges.")
+                continue
+            if dim.strip() not in dims_names:
+                error(path, f"'{dim}' is not in dims.")
+            if not isinstance(along, (list, tuple))\
+               or len(along) not in [1, 2]:
+                error(path,
+                      "The dimension information must be a list with "
+                      "read_along and sep values.")
+                continue
+            read_along, sep = (list(along) + [1])[:2]
+            if read_along not in READ_ALONG:
+                error(path + (0,),
+                      "read_along must be 'row', 'col', 'sheet' or 'file'.")
+                continue
+
+            n_subs = len(Subscripts.get(dim.strip()))
+            if read_along in ['col', 'row']:
+                if not isinstance(sep, int) or isinstance(sep, bool)\
+                   or sep < 1:
+                    error(path + (1,),
+                          f"sep must be a positive integer when reading "
+                          f"along {read_along}.")
+                elif sep == 1:
+                    along_visits.append(read_along)
+            else:
+                along_visits.append(read_along)
+                if not isinstance(sep, (list, tuple))\
+                   or not all(isinstance(el, str) for el in sep):
+                    error(path + (1,),
+                          f"sep must be the list of {read_along}s when "
+                          f"reading along {read_along}.")
+                elif len(sep) != n_subs:
+                    error(path + (1,),
+                          f"The number of {read_along}s ({len(sep)}) "
+                          f"is different than the number of subscripts "
+                          f"of '{dim.strip()}' ({n_subs}).")
+                elif read_along == 'file':
+                    for i, file in enumerate(sep):
+                        if not Path(file).is_file():
+                            error(path + (1, i),
+                                  f"The file '{file}' does not exist.")
+
+        for dim in valid_dims:
+            if dim not in map(str.strip, dimensions):
+                error(('dimensions',),
+                      f"Missing dimension information for '{dim}'.")
+
+    for along in ['col', 'row']:
+        if along_visits.count(along) > 1:
+            error(('dimensions',),
+                  f"Two or more dimensions are defined along {along} "
+                  "with step 1.")
+
+    for along in ['sheet', 'file']:
+        if along_visits.count(along) > 1:
+            error(('dimensions',),
+                  f"Two or more dimensions are defined along {along}.")
+        elif along not in along_visits:
+            # the file or sheet must be given
+            value = info.get(along)
+            if not isinstance(value, str) or not value:
+                error((along,),
+                      f"The {along} must be given for '{var}' unless a "
+                      f"dimension is defined along {along}.")
+            elif along == 'file' and not Path(value).is_file():
+                error((along,), f"The file '{value}' does not exist.")
+
+    # check the series
+    if var_type in SERIES:
+        key = SERIES[var_type]
+        series = info.get(key)
+        if isinstance(series, dict):
+            for field in series:
+                if field not in SERIES_CHECKS:
+                    error((key, field), f"Unknown field '{field}'.")
+            for field, check in SERIES_CHECKS.items():
+                if field not in series:
+                    error((key,), f"Missing '{field}'.")
+                else:
+                    message = check(series[field])
+                    if message:
+                        error((key, field), message)
+        elif series is not None:
+            error((key,),
+                  f"{key} must be an object with name, cell, read_along "
+                  "and length.")
+
+    return errors
+
+
+def _json_path(*keys):
+    """
+    Get the JSON path of a configuration element.
+    """
+    path = "$"
+    for key in keys:
+        if isinstance(key, int):
+            path += f"[{key}]"
+        elif KEY_REGEX.match(key):
+            path += f".{key}"
+        else:
+            path += f"[{key!r}]"
+    return path
+
+
+def _check_str(value):
+    if not isinstance(value, str):
+        return "It must be a string."
+
+
+def _check_bool(value):
+    if not isinstance(value, bool):
+        return "It must be true or false."
+
+
+def _check_cell(value):
+    if not isinstance(value, str) or not CELL_REGEX.match(value):
+        return f"Invalid cell '{value}'."
+
+
+def _check_dims(value):
+    if not isinstance(value, (list, tuple)):
+        return "dims must be a list of subscript ranges."
+
+
+def _check_dimensions(value):
+    if not isinstance(value, dict):
+        return "dimensions must be an object."
+
+
+def _check_loading(value):
+    if not isinstance(value, str) or value.upper() not in LOADINGS:
+        return "loading must be 'DIRECT' or 'XLS'."
+
+
+def _check_interp(value):
+    if value is None:
+        return
+    if not isinstance(value, str)\
+       or value.strip().upper().replace('_', ' ') not in INTERPS:
+        return ("interp must be 'interpolate', 'raw', "
+                "'hold backward' or 'look forward'.")
+
+
+def _check_series_along(value):
+    if value not in SERIES_READ_ALONG:
+        return "read_along must be 'row' or 'col'."
+
+
+def _check_length(value):
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        return "length must be a positive integer."
+
+
+# fields allowed for each type of variable
+COMMON_FIELDS = ['type', 'dims', 'cell', 'description', 'units', 'file',
+                 'sheet', 'dimensions', 'force', 'loading']
+SERIES = {'lookups': 'x', 'data': 'time'}
+FIELDS = {
+    'constants': COMMON_FIELDS,
+    'lookups': COMMON_FIELDS + ['x'],
+    'data': COMMON_FIELDS + ['time', 'interp'],
+}
+ALL_FIELDS = COMMON_FIELDS + ['x', 'time', 'interp']
+REQUIRED_FIELDS = {
+    'constants': ['dims', 'cell', 'dimensions'],
+    'lookups': ['dims', 'cell', 'dimensions', 'x'],
+    'data': ['dims', 'cell', 'dimensions', 'time'],
+}
+
+# checks of the simple fields
+CHECKS = {
+    'dims': _check_dims,
+    'cell': _check_cell,
+    'description': _check_str,
+    'units': _check_str,
+    'dimensions': _check_dimensions,
+    'force': _check_bool,
+    'loading': _check_loading,
+    'interp': _check_interp,
+}
+SERIES_CHECKS = {
+    'name': _check_str,
+    'cell': _check_cell,
+    'read_along': _check_series_along,
+    'length': _check_length,
+}
@@ -0,0 +1,180 @@
+"""
+Watcher class for regenerating the equations when the inputs change.
+"""
+import sys
+import time
+from pathlib import Path
+from itertools import chain
+
+from .excels import Excels
+from .subscripts import Subscripts
+from .cache import Cache
+from .validation import validate_config
+from ..excels2vensim import read_config, _execute_variable, _get_files
+
+
+class Watcher():
+    """
+    Class to watch a model file, its configuration files and the Excel
+    files they use. Each run only regenerates the variables whose
+    configuration, subscripts or Excel files changed since the previous
+    run, the equations of the rest of variables are reused. If a Cache
+    directory is set it is also used for the first run.
+
+    The files are watched by polling their modification time and size.
+
+    Parameters
+    ----------
+    subscript_file: str or pathlib.Path
+        Vensim model (.mdl) or JSON (.json) file with the subscripts.
+
+    config_files: list
+        List of the configuration files.
+
+    interval: float (optional)
+        Polling interval in seconds. Default is 1.
+
+    """
+    def __init__(self, subscript_file, config_files, interval=1):
+        self.subscript_file = Path(subscript_file).resolve()
+        self.config_files = [Path(file).resolve() for file in config_files]
+        self.interval = interval
+        # signatures of the files at the end of the last run
+        self._signatures = {}
+        # signatures of the Excel files at the end of the last run
+        self._workbooks = {}
+        # (config file, variable) -> (key, equations)
+        self._results = {}
+        # variables executed in the last run
+        self.executed = []
+
+    def changed(self):
+        """
+        Check if any of the watched files changed since the last run.
+
+        Returns
+        -------
+        bool
+            True if any file changed or if it has not been run yet.
+
+        """
+        files = [self.subscript_file, *self.config_files, *self._workbooks]
+        return any(
+            self._signatures.get(file) != self._signature(file)
+            for file in files
+        )
+
+    def run(self):
+        """
+        Regenerate the equations of the variables that changed and
+        write their cellranges in the Excel files.
+
+        Returns
+        -------
+        str
+            The equations of all the variables, to copy in the Vensim
+            model file.
+
+        """
+        if self._signatures.get(self.subscript_file)\
+           != self._signature(self.subscript_file):
+            Subscripts.read(self.subscript_file)
+
+        changed_workbooks = {
+            file for file, signature in self._workbooks.items()
+            if self._signature(file) != signature}
+
+        results, workbooks, self.executed = {}, set(), []
+        eqs = []
+        try:
+            # validate all the configuration before writing any file
+            validate_config(chain.from_iterable(
+                read_config(config_file)
+                for config_file in self.config_files))
+
+            for config_file in self.config_files:
+                for var, info in read_config(config_file):
+                    var_files = _get_files(info)
+                    key = Cache._hash(var, info, var_files)
+                    files = {Path(file).resolve() for file in var_files}
+                    cached = self._results.get((config_file, var))
+
+                    if cached is None or cached[0] != key\
+                       or files & changed_workbooks\
+                       or not files.issubset(self._workbooks):
+                        cached = (key, _execute_variable(var, info))
+                        self.executed.append(var)
+
+                    results[(config_file, var)] = cached
+                    workbooks.update(files)
+                    eqs.append(cached[1])
+        except BaseException:
+            # do not keep partially modified Excel files for future calls
+            Excels.close()
+            Cache.discard()
+            # avoid running again until the files are modified
+            self._update_signatures()
+            raise
+
+        # save changes and close Excel files
+        Excels.save_and_close()
+        Cache.commit()
+
+        self._results = results
+        self._workbooks = {
+            file: self._signature(file) for file in workbooks}
+        self._update_signatures()
+
+        return '\n'.join(eqs)
+
+    def watch(self, callback):
+        """
+        Run each time that any of the watched files changes. The errors
+        are printed and the watching continues. It can be stopped with
+        a KeyboardInterrupt.
+
+        Parameters
+        ----------
+        callback: callable
+            Function to call with the equations after each run.
+
+        Returns
+        -------
+        None
+
+        """
+        while True:
+            if self.changed():
+                try:
+                    eqs = self.run()
+                except Exception as err:
+                    print(f"{type(err).__name__}: {err}", file=sys.stderr)
+                else:
+                    callback(eqs)
+                    print(
+                        f"Regenerated {len(self.executed)} variable(s), "
+                        "watching for changes...", file=sys.stderr)
+
+            time.sleep(self.interval)
+
+    def _update_signatures(self):
+        """
+        Save the signatures of the watched files.
+        """
+        self._signatures = {
+            file: self._signature(file)
+            for file in [self.subscript_file, *self.config_files,
+                         *self._workbooks]
+        }
+
+    @staticmethod
+    def _signature(file):
+        """
+        Signature of a file, modification time and size or None if the
+        file does not exist.
+        """
+        try:
+            stat = Path(file).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
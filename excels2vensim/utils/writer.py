@@ -0,0 +1,87 @@
+"""
+Equations writer class.
+"""
+
+
+class EquationsWriter():
+    """
+    Class to write the Vensim equations of each variable as soon as
+    they are generated. The equations are buffered and written in
+    chunks, consecutive equations are separated by a line break.
+
+    Parameters
+    ----------
+    file: str or pathlib.Path or file object
+        File to write the equations in. If it is a file object, e.g.
+        sys.stdout, it will not be closed when closing the writer.
+
+    buffer_size: int (optional)
+        Number of characters to buffer before writing them in the file.
+        Default is 65536.
+
+    Examples
+    --------
+    >>> with EquationsWriter('my_vars.txt') as writer:
+    ...     load_from_json('my_vars.json', writer=writer)
+
+    """
+    def __init__(self, file, buffer_size=65536):
+        if hasattr(file, 'write'):
+            self.file = file
+            self._close_file = False
+        else:
+            self.file = open(file, 'w')
+            self._close_file = True
+
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+        self.n_variables = 0
+
+    def write(self, equations):
+        """
+        Write the equations of a variable.
+
+        Parameters
+        ----------
+        equations: str
+            The equations of a variable.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.n_variables:
+            self._buffer.append('\n')
+        self._buffer.append(equations)
+        self._buffered += len(equations) + 1
+        self.n_variables += 1
+
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered equations in the file.
+        """
+        if self._buffer:
+            self.file.write(''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+        self.file.flush()
+
+    def close(self):
+        """
+        Write the buffered equations and close the file.
+        """
+        self.flush()
+        if self._close_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,7 +1,9 @@
 """
 Tests for the argument parser
 """
+import re
 import subprocess
+from argparse import ArgumentTypeError
 
 import pytest
 
@@ -19,8 +21,8 @@ def test_help():
             "my_file.mwl",
             parser.check_file,
             "when parsing 'my_file.mwl'"
-            "\nThe subscript file name must be Vensim model (.mdl)"
-            " or JSON (.json) file..."
+            "\nThe subscript file name must be Vensim model (.mdl),"
+            " PySD model (.py) or JSON (.json) file..."
         ),
         (
             "my_file.json",
@@ -32,7 +34,8 @@ def test_help():
             "my_file.mwl",
             parser.check_config,
             "when parsing 'my_file.mwl'"
-            "\nThe config file name must be a JSON (.json) file..."
+            "\nThe config file name must be a JSON (.json) or newline "
+            "delimited JSON (.ndjson, .jsonl) file..."
         ),
         (
             "my_file.json",
@@ -44,10 +47,36 @@ def test_help():
     ids=["check_file_invalid_suffix", "check_file_inexistent",
          "check_config_invalid_suffix", "check_config_inexistent"]
 )
-def test_parser_errors(capsys, string, function, error_message):
-    with pytest.raises(SystemExit) as pytest_wrapped_e:
+def test_parser_errors(string, function, error_message):
+    with pytest.raises(ArgumentTypeError, match=re.escape(error_message)):
         function(string)
 
+
+@pytest.mark.parametrize(
+    "command,args",
+    [
+        ("excels2vensim", ["my_file.mwl", "my_file.json"]),
+        ("excels2vensim estimate", ["my_file.mwl", "my_file.json"]),
+        ("excels2vensim export", ["-o", "out.npz", "my_file.mwl",
+                                  "my_file.json"]),
+        ("excels2vensim gc", ["my_file.mwl", "my_file.json"]),
+        ("excels2vensim check", ["my_file.mwl", "my_file.json"]),
+    ],
+    ids=["main", "estimate", "export", "gc", "check"]
+)
+def test_command_errors(capsys, command, args):
+    # each command reports the errors with its own usage
+    command_parser = {
+        "excels2vensim": parser.parser,
+        "excels2vensim estimate": parser.estimate_parser,
+        "excels2vensim export": parser.export_parser,
+        "excels2vensim gc": parser.gc_parser,
+        "excels2vensim check": parser.check_parser,
+    }[command]
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        command_parser.parse_args(args)
+
     assert pytest_wrapped_e.value.code == 2
     captured = capsys.readouterr()
-    assert error_message in captured.err
+    assert f"{command}: error: argument subscript_file: when parsing "\
+        "'my_file.mwl'" in captured.err
@@ -381,3 +381,1232 @@ def test_force(tmp_path, _root):
     assert "my_var" in ws.defined_names
     assert ws.defined_names.get("my_var").attr_text == 'Region1!$B$34:$B$34'
     wb.close()
+
+
+def test_watcher(tmp_path, _root):
+    """
+    Test for the Watcher class
+    """
+    import json
+    from openpyxl import load_workbook
+
+    os.chdir(_root / "tmp_dir")
+    # copy original file without data
+    shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                 "inputs_watch.xlsx")
+
+    subs_file = tmp_path / "subscripts.json"
+    with open(subs_file, "w") as file:
+        json.dump({'source': ['Gas', 'Oil', 'Coal']}, file)
+
+    config = {
+        "var_a": {
+            "type": "constants",
+            "force": True,
+            "dims": ["source"],
+            "cell": "A10",
+            "file": "inputs_watch.xlsx",
+            "sheet": "Region1",
+            "dimensions": {"source": ["col", 1]}
+        },
+        "var_b": {
+            "type": "constants",
+            "force": True,
+            "dims": [],
+            "cell": "A12",
+            "file": "inputs_watch.xlsx",
+            "sheet": "Region2",
+            "dimensions": {}
+        }}
+    config_file = tmp_path / "config.json"
+    with open(config_file, "w") as file:
+        json.dump(config, file)
+    config2 = {
+        "var_c": {
+            "type": "constants",
+            "force": True,
+            "dims": [],
+            "cell": "A14",
+            "file": "inputs_watch.xlsx",
+            "sheet": "Region2",
+            "dimensions": {}
+        }}
+    config_file2 = tmp_path / "config2.json"
+    with open(config_file2, "w") as file:
+        json.dump(config2, file)
+
+    watcher = e2v.Watcher(subs_file, [config_file, config_file2],
+                          interval=0)
+
+    assert watcher.changed()
+    out = watcher.run()
+    assert watcher.executed == ["var_a", "var_b", "var_c"]
+    assert "var_a[source]=" in out and "var_b=" in out
+    # the configuration files are separated as the variables
+    assert "\t|\n\nvar_c=" in out
+    assert not watcher.changed()
+
+    # nothing changed
+    assert watcher.run() == out
+    assert watcher.executed == []
+
+    # change the configuration of one variable
+    config["var_b"]["cell"] = "B12"
+    with open(config_file, "w") as file:
+        json.dump(config, file)
+
+    assert watcher.changed()
+    out = watcher.run()
+    assert watcher.executed == ["var_b"]
+    assert "var_a[source]=" in out
+
+    wb = load_workbook("inputs_watch.xlsx")
+    assert wb["Region2"].defined_names.get("var_b").attr_text\
+        == 'Region2!$B$12:$B$12'
+    wb.close()
+
+    # change the subscripts
+    with open(subs_file, "w") as file:
+        json.dump({'source': ['Gas', 'Oil']}, file)
+
+    assert watcher.changed()
+    watcher.run()
+    assert watcher.executed == ["var_a"]
+
+    # replace the Excel file
+    shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                 "inputs_watch.xlsx")
+
+    assert watcher.changed()
+    watcher.run()
+    assert watcher.executed == ["var_a", "var_b", "var_c"]
+
+    wb = load_workbook("inputs_watch.xlsx")
+    assert "var_a" in wb["Region1"].defined_names
+    assert "var_b" in wb["Region2"].defined_names
+    assert "var_c" in wb["Region2"].defined_names
+    wb.close()
+
+
+def test_cache(tmp_path, _root, mocker):
+    """
+    Test for the Cache class
+    """
+    from openpyxl import load_workbook
+
+    os.chdir(_root / "tmp_dir")
+    # copy original file without data
+    shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                 "inputs_cache.xlsx")
+
+    e2v.Subscripts.set({'source': ['Gas', 'Oil', 'Coal']})
+    element_dict = {
+        "var_a": {
+            "type": "constants",
+            "dims": ["source"],
+            "cell": "A10",
+            "file": "inputs_cache.xlsx",
+            "sheet": "Region1",
+            "dimensions": {"source": ["row", 2]}
+        },
+        "var_b": {
+            "type": "constants",
+            "dims": [],
+            "cell": "A12",
+            "file": "inputs_cache.xlsx",
+            "sheet": "Region1",
+            "dimensions": {}
+        }}
+
+    e2v.Cache.set_directory(tmp_path / "cache")
+    try:
+        spy = mocker.spy(e2v.excels2vensim, "_create_object")
+        out = e2v.execute(element_dict)
+        assert spy.call_count == 2
+
+        # all the variables are cached
+        stats = e2v.Stats()
+        with stats:
+            assert e2v.execute(element_dict) == out
+        assert spy.call_count == 2
+        # the number of equations is also cached
+        assert stats.counters['cache_hits'] == 2
+        assert stats.counters['equations'] == 4
+
+        # only the modified variable is executed
+        element_dict["var_b"]["units"] = "m"
+        out = e2v.execute(element_dict)
+        assert spy.call_count == 3
+        assert "var_b=\n\tGET_DIRECT_CONSTANTS" in out
+
+        # the cache is persistent
+        e2v.Cache.set_directory(tmp_path / "cache")
+        e2v.execute(element_dict)
+        assert spy.call_count == 3
+
+        # modified subscripts
+        e2v.Subscripts.set({'source': ['Gas', 'Oil']})
+        out = e2v.execute(element_dict)
+        assert spy.call_count == 4
+        assert "Coal" not in out
+
+        # the Excel file is replaced
+        shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                     "inputs_cache.xlsx")
+        e2v.execute(element_dict)
+        assert spy.call_count == 6
+
+        wb = load_workbook("inputs_cache.xlsx")
+        assert "var_a_Oil" in wb["Region1"].defined_names
+        assert "var_b" in wb["Region1"].defined_names
+        wb.close()
+    finally:
+        e2v.Cache.set_directory(None)
+
+
+def test_ndjson(tmp_path, _root):
+    """
+    Test for newline delimited JSON configuration files
+    """
+    os.chdir(_root / "tmp_dir")
+    # copy original file without cellranges
+    shutil.copy2(_root / 'original_files' / 'inputs_data2.xlsx',
+                 _root / 'tmp_dir' / 'inputs_ndjson.xlsx')
+
+    subs_dir = str(_root / "subscripts" / "data_subscripts.json")
+    conf_dir = _root / "jsons" / "dimensionless.ndjson"
+
+    # test command line with a file
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim",
+        subs_dir, str(conf_dir)], capture_output=True)
+
+    stdout = out.stdout.decode(encoding_stdout)
+
+    for var in ["population_lookup", "population_data",
+                "population_constant"]:
+        assert var in stdout
+
+    # test command line with the standard input
+    with open(conf_dir, "rb") as file:
+        out = subprocess.run([
+            "python3", "-m", "excels2vensim",
+            subs_dir, "-"], input=file.read(), capture_output=True)
+
+    assert out.stdout.decode(encoding_stdout) == stdout
+
+    # execute an iterable of (name, info) pairs
+    e2v.Subscripts.read(subs_dir)
+    os.chdir(_root / "subscripts")
+    pairs = e2v.read_config(conf_dir)
+    assert not isinstance(pairs, dict)
+    result = e2v.execute(pairs)
+    assert result in stdout
+
+    # non valid line
+    conf_file = tmp_path / "non_valid.ndjson"
+    with open(conf_file, "w") as file:
+        file.write('{"var": {}}\n\n{"var2": {\n')
+
+    with pytest.raises(ValueError, match=r"Invalid JSON in line 3 of"):
+        list(e2v.read_config(conf_file))
+
+
+def test_max_open(tmp_path):
+    """
+    Test the limit of the open Excel files
+    """
+    import json
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=3, n_sheets=2, seed=4)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    with pytest.raises(ValueError, match="must be at least 1"):
+        e2v.Excels.set_max_open(0)
+
+    n_open = []
+    stats = e2v.Stats()
+    e2v.Excels.set_max_open(1)
+    try:
+        with stats:
+            eqs = e2v.execute(
+                iter(config.items()),
+                progress=lambda state: n_open.append(len(e2v.Excels._Excels)))
+    finally:
+        e2v.Excels.set_max_open(None)
+
+    assert max(n_open) == 1
+    assert stats.counters['workbooks_flushed'] > 0
+    # all the names are written and the equations do not change
+    diff = e2v.check_names(config)
+    assert not diff['missing'] and not diff['moved']
+    assert e2v.execute(config) == eqs
+
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "--max-workbooks", "0",
+        str(paths['model']), str(paths['config'])], capture_output=True)
+    assert out.returncode == 2
+    assert "must be at least 1" in out.stderr.decode()
+
+
+def test_writer(tmp_path, _root):
+    """
+    Test for the EquationsWriter class
+    """
+    import io
+
+    os.chdir(_root / "tmp_dir")
+    # copy original file without data
+    shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                 "inputs_writer.xlsx")
+
+    e2v.Subscripts.set({'source': ['Gas', 'Oil', 'Coal']})
+    element_dict = {
+        f"var_{i}": {
+            "type": "constants",
+            "dims": ["source"],
+            "cell": f"A{i+10}",
+            "file": "inputs_writer.xlsx",
+            "sheet": "Region1",
+            "dimensions": {"source": ["col", 1]}
+        } for i in range(5)}
+
+    expected = e2v.execute(element_dict)
+
+    # write to a file object
+    stream = io.StringIO()
+    with e2v.EquationsWriter(stream, buffer_size=100) as writer:
+        assert e2v.execute(element_dict, writer=writer) is None
+        # written in chunks before closing
+        assert stream.getvalue()
+        assert writer.n_variables == 5
+
+    assert stream.getvalue() == expected
+    assert not stream.closed
+
+    # write to a file in several calls
+    with e2v.EquationsWriter(tmp_path / "eqs.txt") as writer:
+        e2v.execute(dict(list(element_dict.items())[:2]), writer=writer)
+        e2v.execute(dict(list(element_dict.items())[2:]), writer=writer)
+
+    with open(tmp_path / "eqs.txt") as file:
+        assert file.read() == expected
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_generated_project(tmp_path, seed):
+    """
+    Test the equations of synthetic projects with PySD
+    """
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3,
+        seed=seed)
+
+    # same seed, same project
+    paths2 = generate_project(tmp_path / "copy", n_vars=20, n_subranges=2,
+                              n_files=2, n_sheets=3, seed=seed)
+    with open(paths['config']) as file, open(paths2['config']) as file2:
+        assert file.read() == file2.read()
+
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    eqs = e2v.load_from_json(paths['config'])
+    assert eqs.count("Synthetic variable") == 20
+
+    # add the equations to the model and run it
+    with open(paths['model']) as file:
+        model = file.read().replace("{UTF-8}\n", "{UTF-8}\n" + eqs + "\n")
+    with open(tmp_path / "full_model.mdl", "w") as file:
+        file.write(model)
+
+    result = read_vensim(str(tmp_path / "full_model.mdl")).run()
+    assert not result.isna().any().any()
+
+
+def test_stats(tmp_path, _root):
+    """
+    Test for the Stats collector
+    """
+    import json
+
+    os.chdir(_root / "tmp_dir")
+    # copy original file without data
+    shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                 "inputs_stats.xlsx")
+
+    e2v.Subscripts.set({'source': ['Gas', 'Oil', 'Coal']})
+    element_dict = {
+        f"var_{i}": {
+            "type": "constants",
+            "dims": ["source"],
+            "cell": f"A{i+10}",
+            "file": "inputs_stats.xlsx",
+            "sheet": "Region1",
+            "dimensions": {"source": ["col", 1]}
+        } for i in range(3)}
+
+    # nothing is collected without an active collector
+    e2v.execute(element_dict)
+    assert e2v.Stats._active is None
+
+    with e2v.Stats() as stats:
+        element_dict["var_0"]["cell"] = "A20"
+        element_dict["var_0"]["force"] = True
+        e2v.execute(element_dict)
+
+    assert e2v.Stats._active is None
+    assert stats.counters["variables"] == 3
+    assert stats.counters["equations"] == 3
+    assert stats.counters["names_replaced"] == 1
+    assert stats.counters["names_skipped"] == 2
+    assert stats.counters["names_added"] == 0
+
+    stats_dict = stats.to_dict()
+    for phase in ["validation", "plan", "read", "write", "save"]:
+        assert stats_dict["phases"][phase]["time"] <= stats.total_time
+    assert stats_dict["phases"]["read"]["calls"] == 1
+    assert list(stats_dict["phases"]["plan"]["labels"]) == list(element_dict)
+    assert "inputs_stats.xlsx" in stats_dict["phases"]["save"]["labels"]
+
+    summary = stats.summary()
+    assert "Save Excel files" in summary
+    assert "inputs_stats.xlsx" in summary
+    assert "Names replaced" in summary
+
+    # command line
+    shutil.copy2(_root / 'original_files' / 'inputs_data2.xlsx',
+                 _root / 'tmp_dir' / 'inputs_ndjson.xlsx')
+    subs_dir = str(_root / "subscripts" / "data_subscripts.json")
+    conf_dir = str(_root / "jsons" / "dimensionless.ndjson")
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "--stats",
+        "--stats-file", str(tmp_path / "stats.json"),
+        subs_dir, conf_dir], capture_output=True)
+
+    assert out.returncode == 0
+    assert "Names added" in out.stderr.decode(encoding_stderr)
+    with open(tmp_path / "stats.json") as file:
+        stats_dict = json.load(file)
+    assert stats_dict["counters"]["variables"] == 3
+    assert "subscripts" in stats_dict["phases"]
+
+
+def test_profile(tmp_path, _root):
+    """
+    Test for profiling the command line runs
+    """
+    import pstats
+
+    os.chdir(_root / "tmp_dir")
+    shutil.copy2(_root / 'original_files' / 'inputs_data2.xlsx',
+                 _root / 'tmp_dir' / 'inputs_ndjson.xlsx')
+    subs_dir = str(_root / "subscripts" / "data_subscripts.json")
+    conf_dir = str(_root / "jsons" / "dimensionless.ndjson")
+
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim",
+        "--profile", str(tmp_path / "out.prof"),
+        subs_dir, conf_dir], capture_output=True)
+
+    assert out.returncode == 0
+    stats = pstats.Stats(str(tmp_path / "out.prof"))
+    functions = [function for _, _, function in stats.stats]
+    for function in ["read", "execute", "save_and_close"]:
+        assert function in functions
+
+    with open(tmp_path / "out.prof.txt") as file:
+        summary = file.read()
+    assert "cumulative" in summary
+    assert "load_from_json" in summary
+
+
+def test_estimate(tmp_path):
+    """
+    Test the estimation against the planned cellranges
+    """
+    import json
+    from excels2vensim.excels2vensim import _create_object
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=30, n_subranges=2, n_files=3, n_sheets=3,
+        max_dims=4, seed=4)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    with pytest.warns(UserWarning, match=r"will generate \d+ equations"):
+        estimation = e2v.estimate(config, {"equations": 10})
+
+    n_bytes = 0
+    for var, info in config.items():
+        obj = _create_object(var, info)
+        eqs = obj.get_vensim()
+        cellranges = obj._get_cellranges()
+        values = estimation["variables"][var]
+        assert values["equations"] == eqs.count("~~|") + 1
+        assert values["names"] == len(cellranges)
+        assert values["workbooks"] == len({cr[1] for cr in cellranges})
+        n_bytes += len(eqs) + sum(
+            64 + len(name) + len(cellrange) - 15
+            for name, _, _, cellrange in cellranges)
+
+    total = estimation["total"]
+    assert total["workbooks"] == 3
+    assert total["equations"] == sum(
+        values["equations"] for values in estimation["variables"].values())
+    assert abs(total["bytes"] - n_bytes) < 0.1 * n_bytes
+
+    # command line
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "estimate",
+        "--max-names", "10", "-o", str(tmp_path / "estimate.json"),
+        str(paths['model']), str(paths['config'])], capture_output=True)
+
+    assert out.returncode == 0
+    stdout = out.stdout.decode(encoding_stdout)
+    assert "var_29" in stdout and "Total" in stdout
+    assert "names (> 10)" in out.stderr.decode(encoding_stderr)
+    with open(tmp_path / "estimate.json") as file:
+        assert json.load(file) == estimation
+    # no Excel file is modified
+    assert not e2v.Excels._Excels
+
+
+def test_progress_and_cancel(tmp_path):
+    """
+    Test the progress callback and the cancellation of the runs
+    """
+    import json
+    import hashlib
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=10, n_files=2, n_sheets=2, seed=1)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    def digests():
+        return {
+            file.name: hashlib.sha256(file.read_bytes()).hexdigest()
+            for file in tmp_path.iterdir() if file.is_file()}
+
+    original = digests()
+
+    # cancel between variables
+    token = e2v.CancelToken()
+
+    def cancel_variables(progress):
+        if progress.variables == 3:
+            token.cancel()
+
+    with pytest.raises(e2v.Cancelled):
+        e2v.execute(config, progress=cancel_variables, cancel=token)
+
+    assert token.cancelled
+    assert not e2v.Excels._Excels
+    assert digests() == original
+
+    # cancel while saving, no workbook is modified
+    token = e2v.CancelToken()
+
+    def cancel_saving(progress):
+        if progress.phase == "save":
+            token.cancel()
+
+    with pytest.raises(e2v.Cancelled):
+        e2v.execute(config, progress=cancel_saving, cancel=token)
+
+    assert digests() == original
+
+    # complete run
+    reports = []
+
+    def report(progress):
+        reports.append((progress.phase, progress.current, progress.variables,
+                        progress.total_variables, progress.workbooks,
+                        progress.total_workbooks, progress.bytes))
+
+    e2v.load_from_json(paths['config'], progress=report)
+    # unknown total of variables when reading from a file
+    assert reports[0] == ("execute", "var_0", 1, None, 0, None, 0)
+    assert reports[9][:3] == ("execute", "var_9", 10)
+    assert [report[0] for report in reports[10:]] == ["save", "save"]
+    assert reports[-1][4:6] == (2, 2)
+    assert reports[-1][6] == sum(
+        os.path.getsize(file) for file in paths['workbooks'])
+
+    modified = digests()
+    for file in paths['workbooks']:
+        assert modified[file.name] != original[file.name]
+    # no temporary files are left
+    assert set(modified) == set(original)
+
+
+def test_gui_worker(tmp_path):
+    """
+    Test the background worker used by the GUI
+    """
+    import json
+    import time
+    import threading
+    from excels2vensim.gui.worker import Worker
+    from excels2vensim.utils.generator import generate_project
+
+    def wait(worker):
+        messages = []
+        while worker.is_alive():
+            messages += worker.poll()
+            time.sleep(0.01)
+        return messages + worker.poll()
+
+    paths = generate_project(tmp_path, n_vars=5, seed=2)
+
+    # read the subscripts in the background
+    worker = Worker(e2v.Subscripts.read, paths['model'])
+    worker.start()
+    assert wait(worker) == [('done', None)]
+    assert e2v.Subscripts.get_ranges()
+
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    # execute reporting the progress
+    worker = Worker(e2v.execute, config, progress=True)
+    worker.start()
+    messages = wait(worker)
+    kinds = [kind for kind, _ in messages]
+    assert kinds == ['progress'] * 6 + ['done']
+    assert messages[0][1]['variables'] == 1
+    assert messages[0][1]['total_variables'] == 5
+    assert messages[5][1]['phase'] == 'save'
+    assert messages[-1][1].count('GET_DIRECT_') >= 5
+
+    # cancel the execution from the main thread
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_progress_execute(config, progress, cancel):
+        def wait_progress(state):
+            started.set()
+            release.wait()
+            progress(state)
+        return e2v.execute(config, progress=wait_progress, cancel=cancel)
+
+    worker = Worker(blocking_progress_execute, config, progress=True)
+    worker.start()
+    started.wait()
+    worker.cancel()
+    release.set()
+    messages = wait(worker)
+    assert messages[-1][0] == 'error'
+    assert isinstance(messages[-1][1], e2v.Cancelled)
+
+    # errors are sent to the main thread
+    worker = Worker(e2v.Subscripts.read, str(tmp_path / "missing.mdl"))
+    worker.start()
+    kind, err = wait(worker)[-1]
+    assert kind == 'error'
+    assert isinstance(err, Exception)
+
+
+@pytest.mark.parametrize("seed", [1, 4])
+def test_export(tmp_path, seed):
+    """
+    Test the export of the values with the ones read by PySD
+    """
+    import json
+    import xarray as xr
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3,
+        seed=seed)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    eqs = e2v.execute(config)
+    manifest = e2v.export(config, tmp_path / "values.npz")
+    assert set(manifest['sources']) == {
+        str(file.resolve()) for file in paths['workbooks']}
+    # the cellranges are not written again
+    assert not e2v.Excels._Excels
+
+    with open(paths['model']) as file:
+        model = file.read().replace("{UTF-8}\n", "{UTF-8}\n" + eqs + "\n")
+    with open(tmp_path / "full_model.mdl", "w") as file:
+        file.write(model)
+    model = read_vensim(str(tmp_path / "full_model.mdl"))
+
+    values = e2v.load_export(tmp_path / "values.json")
+    assert list(values) == list(config)
+    for var, exported in values.items():
+        exported = xr.DataArray(
+            exported['data'], dims=exported['dims'],
+            coords=exported['coords'])
+        if config[var]['type'] == 'constants':
+            expected = xr.DataArray(model[var])
+        else:
+            expected = model.get_series_data(var)
+        expected = expected.transpose(*exported.dims)
+        assert exported.dims == expected.dims
+        for dim in exported.dims:
+            assert list(exported.coords[dim].values)\
+                == list(expected.coords[dim].values)
+        assert np.allclose(exported.values, expected.values)
+
+    # command line with newline delimited json
+    with open(tmp_path / "config.ndjson", "w") as file:
+        for var, info in config.items():
+            file.write(json.dumps({var: info}) + "\n")
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "export",
+        "-o", str(tmp_path / "cli.npz"), "-m", str(tmp_path / "cli.json"),
+        str(paths['model']), str(tmp_path / "config.ndjson")],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert "Exported 20 variables from 2 Excel files" in out.stdout.decode()
+    cli_values = e2v.load_export(tmp_path / "cli.json")
+    for var, exported in values.items():
+        assert np.array_equal(
+            exported['data'], cli_values[var]['data'], equal_nan=True)
+
+    # the Excel files have changed
+    e2v.Subscripts.read(paths['model'])
+    config['new_var'] = dict(config['var_0'], force=True)
+    e2v.execute({'new_var': config['new_var']})
+    with pytest.raises(ValueError, match="have changed since the export"):
+        e2v.load_export(tmp_path / "values.json")
+    assert len(e2v.load_export(tmp_path / "values.json", check=False)) == 20
+
+    # move the values and the manifest together
+    (tmp_path / "moved").mkdir()
+    shutil.move(tmp_path / "values.npz", tmp_path / "moved" / "values.npz")
+    shutil.move(tmp_path / "values.json", tmp_path / "moved" / "values.json")
+    moved = e2v.load_export(tmp_path / "moved" / "values.json", check=False)
+    for var, exported in values.items():
+        assert np.array_equal(
+            exported['data'], moved[var]['data'], equal_nan=True)
+
+
+def test_patch_model(tmp_path):
+    """
+    Test the patching of the equations in the model
+    """
+    import json
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3, seed=2)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+    eqs = e2v.execute(config)
+
+    # a previous definition of a variable in the model
+    with open(paths['model']) as file:
+        original = file.read()
+    old = "var 0 = 3\n\t~\t\n\t~\told definition\n\t|\n\n"
+    with open(paths['model'], "w") as file:
+        file.write(original.replace("{UTF-8}\n", "{UTF-8}\n" + old))
+    sketch = original[original.index("\\\\\\---///"):]
+
+    patched = e2v.patch_model(paths['model'], eqs)
+    # the spaces and underscores are equivalent
+    assert patched['replaced'] == ["var_0"]
+    assert len(patched['added']) == 19
+    with open(paths['model']) as file:
+        model = file.read()
+    assert "old definition" not in model
+    assert model.endswith(sketch)
+    assert model.count("Synthetic variable") == 20
+    result = read_vensim(str(paths['model'])).run()
+    assert not result.isna().any().any()
+
+    # patching again only replaces the equations
+    patched = e2v.patch_model(paths['model'], eqs)
+    assert len(patched['replaced']) == 20 and not patched['added']
+    with open(paths['model']) as file:
+        assert file.read() == model
+
+    # command line, the equations are also saved
+    with open(tmp_path / "model2.mdl", "w") as file:
+        file.write(original)
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "--patch-model",
+        "-o", str(tmp_path / "eqs.txt"),
+        str(tmp_path / "model2.mdl"), str(paths['config'])],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert "Patched model: 0 replaced, 20 added" in out.stderr.decode()
+    with open(tmp_path / "eqs.txt") as file:
+        assert file.read().count("Synthetic variable") == 20
+    with open(tmp_path / "model2.mdl") as file:
+        assert file.read().count("Synthetic variable") == 20
+
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "--patch-model", "--watch",
+        str(tmp_path / "model2.mdl"), str(paths['config'])],
+        capture_output=True)
+    assert out.returncode != 0
+    assert "cannot be patched when watching" in out.stderr.decode()
+
+
+def test_manifest(tmp_path):
+    """
+    Test the manifest of the written cellrange names
+    """
+    import json
+    from openpyxl import load_workbook
+    from excels2vensim.utils.generator import generate_project
+    from excels2vensim.utils.manifest import _hash_file
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3, seed=3)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    e2v.Manifest.set_file(tmp_path / "names.json")
+    e2v.Cache.set_directory(tmp_path / "cache")
+    try:
+        e2v.execute(config)
+        with open(tmp_path / "names.json") as file:
+            manifest = json.load(file)
+
+        # the cached variables are also included
+        e2v.execute(config)
+        with open(tmp_path / "names.json") as file:
+            assert json.load(file) == manifest
+    finally:
+        e2v.Manifest.set_file(None)
+        e2v.Cache.set_directory(None)
+
+    assert set(manifest['workbooks']) == {
+        str(file.resolve()) for file in paths['workbooks']}
+    n_names = 0
+    for file, sheets in manifest['names'].items():
+        assert manifest['workbooks'][file] == _hash_file(file)
+        wb = load_workbook(file)
+        for sheet, names in sheets.items():
+            defined = wb[sheet].defined_names
+            assert set(names) == set(defined)
+            for name, info in names.items():
+                assert defined[name].attr_text.endswith(
+                    "!" + info['cellrange'])
+                assert info['variable'] in config
+                n_names += 1
+        wb.close()
+
+    # the subscripts of the equations
+    eqs = e2v.execute({"var_0": config["var_0"]})
+    obj = e2v.excels2vensim._create_object("var_0", config["var_0"])
+    obj.get_vensim()
+    for (name, file, sheet, _), subs in zip(obj._get_cellranges(),
+                                            obj._get_subscripts()):
+        info = manifest['names'][str(tmp_path / file)][sheet][name]
+        assert info['subscripts'] == subs
+        if subs:
+            assert f"var_0[{', '.join(subs)}]" in eqs
+
+    # command line
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "--manifest",
+        str(tmp_path / "cli.json"), "-o", str(tmp_path / "eqs.txt"),
+        str(paths['model']), str(paths['config'])],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    with open(tmp_path / "cli.json") as file:
+        assert json.load(file)['names'] == manifest['names']
+
+    # the names of all the configuration files are kept
+    configs = []
+    for i, names in enumerate([list(config)[:10], list(config)[10:]]):
+        configs.append(str(tmp_path / f"config_{i}.json"))
+        with open(configs[-1], 'w') as file:
+            json.dump({var: config[var] for var in names}, file)
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "--manifest",
+        str(tmp_path / "cli.json"), "-o", str(tmp_path / "eqs.txt"),
+        str(paths['model']), *configs],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    with open(tmp_path / "cli.json") as file:
+        assert json.load(file)['names'] == manifest['names']
+
+
+def test_index(tmp_path):
+    """
+    Test the catalog of the defined names
+    """
+    import json
+    from openpyxl import load_workbook
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3, seed=3)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+    e2v.execute(config)
+
+    command = ["python3", "-m", "excels2vensim", "index",
+               "-d", str(tmp_path / "names.sqlite")]
+    out = subprocess.run(
+        command + [str(paths['model']), str(paths['config'])],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert "Indexed 2 Excel files, 0 unchanged" in out.stderr.decode()
+
+    with e2v.Catalog(tmp_path / "names.sqlite") as catalog:
+        names = catalog.query()
+        expected = []
+        for file in paths['workbooks']:
+            wb = load_workbook(file)
+            for ws in wb.worksheets:
+                expected += [
+                    (str(file.resolve()), ws.title, name, value.attr_text)
+                    for name, value in ws.defined_names.items()]
+            wb.close()
+        assert sorted(
+            (row['file'], row['scope'], row['name'], row['reference'])
+            for row in names) == sorted(expected)
+        # all the names are owned by the configuration
+        assert all(row['variable'] in config for row in names)
+        assert {row['config'] for row in names} == {str(paths['config'])}
+
+        rows = catalog.query(variable="var_0")
+        assert rows and all("var_0" in row['name'] for row in rows)
+        rows = catalog.query(sheet="sheet1")
+        assert rows and all("Sheet1!" in row['reference'] for row in rows)
+        rows = catalog.query(column="C", sheet="Sheet1")
+        assert rows and len(rows) < len(catalog.query(sheet="Sheet1"))
+
+    # only the modified files are read again
+    config['new_var'] = dict(config['var_0'], force=True)
+    e2v.execute({'new_var': config['new_var']})
+    with open(paths['config'], "w") as file:
+        json.dump(config, file)
+    os.utime(paths['workbooks'][1])
+    out = subprocess.run(
+        command + [str(paths['model']), str(paths['config'])],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert "Indexed 1 Excel files, 1 unchanged" in out.stderr.decode()
+
+    # query from the command line
+    out = subprocess.run(command + ["--variable", "new_var"],
+                         capture_output=True)
+    assert out.returncode == 0, out.stderr
+    lines = out.stdout.decode(encoding_stdout).splitlines()
+    assert lines and all(line.split("\t")[-1] == "new_var"
+                         for line in lines)
+
+    out = subprocess.run(command, capture_output=True)
+    assert out.returncode != 0
+    assert "the model or a query must be given" in out.stderr.decode()
+
+
+def test_gc(tmp_path):
+    """
+    Test the garbage collection of the orphan names
+    """
+    import json
+    from openpyxl import load_workbook
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3, seed=3)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+    e2v.execute(config)
+
+    # rename a variable
+    config['renamed'] = config.pop('var_0')
+    e2v.execute({'renamed': config['renamed']})
+    with open(paths['config'], "w") as file:
+        json.dump(config, file)
+
+    orphans = e2v.collect_garbage(config)
+    names = [name for file_names in orphans.values()
+             for _, name, _ in file_names]
+    assert names and all("var_0" in name for name in names)
+    # the series names
+    series = e2v.collect_garbage(config, patterns=["X_*"])
+    assert sorted(name for file_names in series.values()
+                  for _, name, _ in file_names)\
+        == sorted(name for name in names if name.startswith("x_"))
+
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "gc",
+        str(paths['model']), str(paths['config'])], capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert f"Found {len(names)} orphan names" in out.stderr.decode()
+    assert len(out.stdout.decode(encoding_stdout).splitlines())\
+        == len(names)
+
+    # remove them, the patterns are needed
+    with pytest.raises(ValueError, match="patterns of the names"):
+        e2v.collect_garbage(config, remove=True)
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "gc", "--remove",
+        str(paths['model']), str(paths['config'])], capture_output=True)
+    assert out.returncode == 2
+    assert "only be removed with --pattern" in out.stderr.decode()
+    assert len(e2v.collect_garbage(config)) == len(orphans)
+
+    stats = e2v.Stats()
+    with stats:
+        e2v.collect_garbage(config, patterns=["var_0*", "x_var_0*"],
+                            remove=True)
+    assert stats.counters['names_removed'] == len(names)
+    assert not e2v.collect_garbage(config)
+    for file, file_names in orphans.items():
+        wb = load_workbook(file)
+        for sheet, name, _ in file_names:
+            assert name not in wb[sheet].defined_names
+        wb.close()
+    # the planned names are kept
+    stats = e2v.Stats()
+    with stats:
+        e2v.execute(config)
+    assert stats.counters['names_added'] == 0
+
+
+def test_check(tmp_path):
+    """
+    Test the check of the names of the Excel files
+    """
+    import json
+    from excels2vensim.utils.generator import generate_project
+    from excels2vensim.utils.names import parse_reference
+
+    paths = generate_project(
+        tmp_path, n_vars=20, n_subranges=2, n_files=2, n_sheets=3, seed=3)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    with open(paths['config']) as file:
+        config = json.load(file)
+
+    command = ["python3", "-m", "excels2vensim", "check",
+               "-o", str(tmp_path / "diff.json"),
+               str(paths['model']), str(paths['config'])]
+
+    # nothing written
+    diff = e2v.check_names(config)
+    assert diff['missing'] and not diff['moved'] and not diff['extra']
+    out = subprocess.run(command, capture_output=True)
+    assert out.returncode == 1
+
+    e2v.execute(config)
+    assert not any(e2v.check_names(config).values())
+    out = subprocess.run(command, capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert "0 missing, 0 moved, 0 extra names" in out.stderr.decode()
+    assert out.stdout.decode(encoding_stdout) == ""
+
+    # drift between the configuration and the Excel files
+    config['renamed'] = config.pop('var_0')
+    config['var_2']['cell'] = "C2"
+    with open(paths['config'], "w") as file:
+        json.dump(config, file)
+    diff = e2v.check_names(config)
+    assert diff['missing'] and diff['extra']
+    assert all("renamed" in name for _, _, name, _ in diff['missing'])
+    assert all("var_0" in name for _, _, name, _ in diff['extra'])
+    # the series cellrange is not moved
+    assert diff['moved'] and all(
+        name.startswith("var_2") for _, _, name, _, _ in diff['moved'])
+    for _, _, _, cellrange, reference in diff['moved']:
+        planned, current = parse_reference(cellrange),\
+            parse_reference(reference)
+        assert planned[2] == current[2] + 1 and planned[4] == current[4] + 1
+
+    out = subprocess.run(command, capture_output=True)
+    assert out.returncode == 1
+    lines = out.stdout.decode(encoding_stdout).splitlines()
+    assert len(lines) == sum(len(names) for names in diff.values())
+    assert sum(line.startswith("~ ") for line in lines)\
+        == len(diff['moved'])
+    with open(tmp_path / "diff.json") as file:
+        assert json.load(file) == json.loads(json.dumps(diff))
+
+    out = subprocess.run(command[:4] + ["--ignore-extra"] + command[4:],
+                         capture_output=True)
+    assert f"{len(diff['missing'])} missing, {len(diff['moved'])} moved, "\
+        "0 extra names" in out.stderr.decode()
+
+
+def test_write_values(tmp_path, mocker):
+    """
+    Test the writing of the values in empty workbooks
+    """
+    import json
+    import pandas as pd
+    import xarray as xr
+    from openpyxl import Workbook, load_workbook
+    from excels2vensim.utils.generator import generate_project
+    from excels2vensim.excels2vensim import _create_object
+
+    paths = generate_project(
+        tmp_path / "original", n_vars=20, n_subranges=2, n_files=3,
+        n_sheets=2, seed=6)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path / "original")
+    with open(paths['config']) as file:
+        config = json.load(file)
+    eqs = e2v.execute(config)
+    values = {
+        var: _create_object(var, info).read()
+        for var, info in config.items()}
+
+    # write the values in empty workbooks
+    new_dir = tmp_path / "new"
+    new_dir.mkdir()
+    os.chdir(new_dir)
+    for file in paths['workbooks']:
+        Workbook().save(file.name)
+
+    spy = mocker.spy(e2v.utils.excels, "load_workbook")
+    progress = []
+    new_eqs = e2v.write_values(
+        config, values, progress=lambda state: progress.append(state.phase))
+    # each workbook is loaded and saved once
+    assert spy.call_count == 3
+    assert progress == ["execute"] * 20 + ["save"] * 3
+    assert new_eqs == eqs
+
+    for var, info in config.items():
+        array = _create_object(var, info).read()
+        assert array.dims == values[var].dims
+        for dim in array.dims:
+            assert list(array.coords[dim].values)\
+                == list(values[var].coords[dim].values)
+        assert np.array_equal(array.values, values[var].values,
+                              equal_nan=True)
+
+    # the cellrange names are the same
+    for file in paths['workbooks']:
+        original = load_workbook(file)
+        new = load_workbook(file.name)
+        for sheet in original.sheetnames:
+            assert {
+                name: value.attr_text
+                for name, value in original[sheet].defined_names.items()
+            } == {
+                name: value.attr_text
+                for name, value in new[sheet].defined_names.items()}
+
+    # pandas objects and arrays with a single variable
+    e2v.Subscripts.set({"dim": ["A", "B"], "dim2": ["X", "Y", "Z"]})
+    obj = e2v.Data("var", ["dim"], "B3", file=paths['workbooks'][0].name,
+                   sheet="New")
+    obj.add_time("time", "B2", "col", 3)
+    obj.add_dimension("dim", "row")
+    frame = pd.DataFrame(
+        [[1, 2], [3, 4], [5, np.nan]],
+        columns=pd.Index(["B", "A"], name="dim"),
+        index=pd.Index([2000, 2005, 2010], name="time"))
+    assert "GET_DIRECT_DATA" in obj.write(frame)
+    array = obj.read()
+    assert list(array.coords["time"].values) == [2000, 2005, 2010]
+    assert np.array_equal(array.sel(dim="A").values, [2, 4, np.nan],
+                          equal_nan=True)
+
+    obj = e2v.Constants("var", ["dim2", "dim"], "B3",
+                        file=paths['workbooks'][0].name, sheet="Other")
+    obj.add_dimension("dim", "row")
+    obj.add_dimension("dim2", "col")
+    obj.write(np.arange(6).reshape(3, 2))
+    assert np.array_equal(obj.read().values, np.arange(6).reshape(3, 2))
+    assert load_workbook(paths['workbooks'][0].name)["Other"]["C4"].value\
+        == 3
+
+    # errors
+    with pytest.raises(ValueError, match="The shape of the values"):
+        obj.write(np.zeros((2, 3)))
+    with pytest.raises(ValueError, match="The dimensions of the values"):
+        obj.write(xr.DataArray(np.zeros((3, 2)), dims=["dim2", "other"]))
+    with pytest.raises(ValueError, match=r"Missing subscripts \['Z'\]"):
+        obj.write(xr.DataArray(
+            np.zeros((2, 2)), dims=["dim2", "dim"],
+            coords={"dim2": ["X", "Y"]}))
+    e2v.Subscripts.read(paths['model'])
+    with pytest.raises(ValueError, match="Missing values for the var"):
+        e2v.write_values(config, {})
+
+
+def test_python_subscripts(tmp_path, _root, mocker):
+    """
+    Test the reading of the subscripts from PySD models
+    """
+    import json
+
+    shutil.copy2(_root / "subscripts" / "data.mdl", tmp_path / "data.mdl")
+    model = read_vensim(str(tmp_path / "data.mdl"))
+    e2v.Subscripts.read(tmp_path / "data.mdl")
+    expected = dict(e2v.Subscripts._subscript_dict)
+
+    # the model is not translated again
+    spy = mocker.spy(e2v.utils.subscript_parser, "_translate_vensim")
+    e2v.Subscripts.set({})
+    e2v.Subscripts.read(tmp_path / "data.py")
+    assert e2v.Subscripts._subscript_dict == expected
+    e2v.Subscripts.set({})
+    e2v.Subscripts.read(model)
+    assert e2v.Subscripts._subscript_dict == expected
+    assert spy.call_count == 0
+
+    # the model is not executed
+    with open(tmp_path / "static.py", "w") as file:
+        file.write("raise RuntimeError()\n"
+                   "_subscript_dict = {'dim': ['A', 'B']}\n")
+    e2v.Subscripts.read(tmp_path / "static.py")
+    assert e2v.Subscripts._subscript_dict == {'dim': ['A', 'B']}
+
+    # model split in modules
+    with open(tmp_path / "split.py", "w") as file:
+        file.write("_subscript_dict, _modules = load_model_data(\n"
+                   "    _root, 'split')\n")
+    with open(tmp_path / "_subscripts_split.json", "w") as file:
+        json.dump({'dim2': ['C']}, file)
+    e2v.Subscripts.read(tmp_path / "split.py")
+    assert e2v.Subscripts._subscript_dict == {'dim2': ['C']}
+
+    with open(tmp_path / "other.py", "w") as file:
+        file.write("x = 1\n")
+    with pytest.raises(ValueError, match="could not be found"):
+        e2v.Subscripts.read(tmp_path / "other.py")
+
+    # command line
+    shutil.copy2(_root / "original_files" / "inputs.xlsx",
+                 tmp_path / "inputs.xlsx")
+    with open(tmp_path / "config.json", "w") as file:
+        json.dump({"var": {
+            "type": "constants", "dims": ["GENDER"], "cell": "B2",
+            "file": "inputs.xlsx", "sheet": "Region1",
+            "dimensions": {"GENDER": ["row", 1]}}}, file)
+    out = subprocess.run([
+        "python3", "-m", "excels2vensim", "estimate",
+        str(tmp_path / "data.py"), str(tmp_path / "config.json")],
+        capture_output=True)
+    assert out.returncode == 0, out.stderr
+    assert "Total" in out.stdout.decode(encoding_stdout)
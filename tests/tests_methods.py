@@ -244,3 +244,408 @@ def test_load_from_json(_root):
     # invalid var name
     with pytest.raises(ValueError, match=expected):
         e2v.load_from_json(_root / 'jsons' / 'non_valid.json')
+
+
+def test_validate_config(tmp_path):
+    """
+    Test for the validation of the configuration
+    """
+    os.chdir(tmp_path)
+    with open("inputs.xlsx", "w"):
+        pass
+
+    e2v.Subscripts.set({
+        'source': ['Gas', 'Oil', 'Coal'],
+        'sector': ['A', 'B'],
+        'region': ['R1', 'R2']
+        })
+
+    valid = {
+        "var_c": {
+            "type": "constants",
+            "dims": ["source", "region"],
+            "cell": "B3",
+            "file": "inputs.xlsx",
+            "dimensions": {
+                "source": ["row", 1],
+                "region": ["sheet", ["R1", "R2"]]
+            }
+        },
+        "var_d": {
+            "type": "Data",
+            "dims": ["source"],
+            "cell": "B3",
+            "file": "inputs.xlsx",
+            "sheet": "Sheet1",
+            "interp": "hold_backward",
+            "dimensions": {"source": ["row", 2]},
+            "time": {"name": "time", "cell": "B2",
+                     "read_along": "col", "length": 5}
+        }}
+
+    e2v.validate_config(valid)
+    e2v.validate_config(valid.items())
+
+    # the loading is not case sensitive
+    valid["var_c"]["loading"] = "xls"
+    e2v.validate_config(valid)
+    obj = e2v.excels2vensim._create_object("var_c", valid["var_c"])
+    assert "GET_XLS_CONSTANTS" in obj.get_vensim(loading="xls")
+    del valid["var_c"]["loading"]
+
+    non_valid = {
+        "var_c": {
+            "type": "constants",
+            "dims": ["source", "sector", "regions"],
+            "cell": "B0",
+            "file": "inputs.xlsx",
+            "dimensions": {
+                "source": ["row", 1],
+                "sector": ["row", 1],
+                "region": ["sheet", ["R1"]]
+            }
+        },
+        "var d": {
+            "type": "data",
+            "dims": ["source"],
+            "cell": "B3",
+            "file": "inputs2.xlsx",
+            "sheet": "Sheet1",
+            "intrep": "raw",
+            "dimensions": {"source": ["along", 2]},
+            "time": {"name": "time", "cell": "B2", "read_along": "sheet"}
+        },
+        "var_l": {"type": "lookup"}}
+
+    with pytest.raises(e2v.ConfigError) as err:
+        e2v.validate_config(non_valid)
+
+    errors = [(var, path) for var, path, _ in err.value.errors]
+    assert errors == [
+        ("var_c", "$.var_c.cell"),
+        ("var_c", "$.var_c.dims[2]"),
+        ("var_c", "$.var_c.dimensions.region"),
+        ("var_c", "$.var_c.dimensions.region[1]"),
+        ("var_c", "$.var_c.dimensions"),
+        ("var d", "$['var d'].intrep"),
+        ("var d", "$['var d'].dimensions.source[0]"),
+        ("var d", "$['var d'].file"),
+        ("var d", "$['var d'].time.read_along"),
+        ("var d", "$['var d'].time"),
+        ("var_l", "$.var_l.type"),
+        ("var_l", "$.var_l"),
+        ("var_l", "$.var_l"),
+        ("var_l", "$.var_l"),
+        ("var_l", "$.var_l.sheet"),
+        ("var_l", "$.var_l.file"),
+    ]
+    assert "Invalid cell 'B0'. ($.var_c.cell)" in str(err.value)
+    assert "Two or more dimensions are defined along row with step 1."\
+        in str(err.value)
+
+    # the dictionaries are validated before writing any file
+    with pytest.raises(e2v.ConfigError):
+        e2v.execute(non_valid)
+
+    assert e2v.Excels._Excels == {}
+
+
+def test_stats_memory():
+    """
+    Stats memory peaks test
+    """
+    import tracemalloc
+
+    with e2v.Stats(memory=True) as stats:
+        with e2v.Stats.span("outer", "a"):
+            with e2v.Stats.span("inner", "b"):
+                data = bytearray(2**20)
+            del data
+            data = bytearray(2**18)
+        del data
+
+    assert not tracemalloc.is_tracing()
+    stats_dict = stats.to_dict()
+    inner = stats_dict["phases"]["inner"]
+    outer = stats_dict["phases"]["outer"]
+    # the peak of the inner span is propagated to the outer one
+    assert 2**20 <= inner["peak"] < 2**20 + 2**17
+    assert inner["peak"] <= outer["peak"] < 2**20 + 2**18
+    assert outer["labels"]["a"]["peak"] == outer["peak"]
+    assert stats_dict["peak"] >= outer["peak"]
+    assert "Peak (MB)" in stats.summary()
+
+    # memory is not measured by default
+    with e2v.Stats() as stats:
+        with e2v.Stats.span("outer"):
+            pass
+    assert "peak" not in stats.to_dict()
+    assert "peak" not in stats.to_dict()["phases"]["outer"]
+
+
+def test_search_index():
+    """
+    Test the subscripts search index of the GUI
+    """
+    from excels2vensim.gui.search import SearchIndex
+
+    names = ["Subregion", "region", "Age", "REGIONS", "stage", "sector"]
+    index = SearchIndex(names)
+
+    assert len(index) == 6
+    assert index.search("") == names
+    # case insensitive, prefix matches first in the original order
+    assert index.search("reg") == ["region", "REGIONS", "Subregion"]
+    # narrowing the previous results
+    assert index.search("regions") == ["REGIONS"]
+    assert index.search("regionsx") == []
+    # new search
+    assert index.search("age") == ["Age", "stage"]
+    assert index.search("s") == ["Subregion", "stage", "sector", "REGIONS"]
+    assert index.search("se") == ["sector"]
+    # excluding the selected names
+    assert index.search("reg", exclude=["region"]) == ["REGIONS", "Subregion"]
+    assert index.search("", exclude=names[1:]) == ["Subregion"]
+
+    # same results as the plain filter with many names
+    names = [f"dim{i}_{j}" for i in range(100) for j in range(50)]
+    index = SearchIndex(names)
+    for term in ["d", "dim1", "dim1_", "dim1_1", "9_4", "1_", "x"]:
+        expected = [name for name in names if name.startswith(term)]\
+            + [name for name in names
+               if term in name and not name.startswith(term)]
+        assert index.search(term) == expected
+
+
+def test_table_rows(tmp_path):
+    """
+    Test the conversion of the configuration to the table editor rows
+    """
+    from excels2vensim.gui.table import (
+        config_to_rows, row_to_info, rows_to_config, parse_table,
+        check_row, KEYS)
+    from excels2vensim.utils.generator import generate_project
+
+    paths = generate_project(tmp_path, n_vars=20, n_files=2, seed=3)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path)
+    config = dict(e2v.read_config(paths['config']))
+
+    # round trip
+    rows = config_to_rows(config)
+    assert len(rows) == 20
+    assert all(set(row) == set(KEYS) for row in rows)
+    assert rows_to_config(rows) == config
+
+    # paste with and without header, separated by tabs or commas
+    text = "\n".join(
+        "\t".join(row[key] for key in KEYS) for row in rows[:3])
+    assert parse_table(text) == rows[:3]
+    text = "Name,Type,Cell,Dims,Dimensions\n"\
+        + "var,constants,B3,,\n\n"\
+        + "\"var, 2\",constants,B4,,\n"
+    pasted = parse_table(text)
+    assert [row['name'] for row in pasted] == ["var", "var, 2"]
+    assert pasted[1]['cell'] == "B4"
+    assert pasted[1]['file'] == ""
+    assert parse_table("\n") == []
+
+    # conversion errors
+    with pytest.raises(ValueError, match="name must be given"):
+        row_to_info({'type': "constants"})
+    with pytest.raises(ValueError, match="dim:read_along:sep"):
+        row_to_info({'name': "var", 'dimensions': "dim0 row"})
+    with pytest.raises(ValueError, match="It must be an integer"):
+        row_to_info({'name': "var", 'dimensions': "dim0:row:a"})
+    with pytest.raises(ValueError, match="force"):
+        row_to_info({'name': "var", 'force': "maybe"})
+    with pytest.raises(ValueError, match="is repeated"):
+        rows_to_config(rows[:2] + rows[:1])
+
+    # the rows are validated and planned as in execute
+    assert all(check_row(row) == [] for row in rows)
+    row = dict(rows[0], cell="1A")
+    assert "Invalid cell" in check_row(row)[0]
+    row = dict(rows[0], type="other")
+    assert "Invalid type of variable 'other'" in check_row(row)[0]
+    assert check_row(dict(rows[0], name="")) == [
+        "The variable name must be given."]
+
+
+def test_preview(tmp_path, mocker):
+    """
+    Test the preview of the GUI and the reading of the cellranges
+    """
+    from openpyxl import Workbook
+    from excels2vensim.utils.reader import read_cellranges
+    from excels2vensim.gui.preview import get_preview, format_preview
+
+    file = tmp_path / "inputs.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    for row in range(1, 5):
+        for col in range(1, 4):
+            ws.cell(row=row, column=col, value=10*row+col)
+    wb.create_sheet("Other")["B2"] = "b2"
+    wb.save(file)
+
+    cellranges = [
+        (file, "sheet1", "Sheet1!$A$1:$B$2"),
+        (file, "Sheet1", "$C$4"),
+        (file, "Sheet1", "$B$3:$C$6"),
+        (file, "Other", "$B$2")]
+    values = read_cellranges(cellranges)
+    # reading each cellrange gives the same values
+    assert read_cellranges(cellranges, single_pass=False) == values
+    assert values[file, "sheet1", "Sheet1!$A$1:$B$2"] == [[11, 12], [21, 22]]
+    assert values[file, "Sheet1", "$C$4"] == [[43]]
+    # empty cells after the last row
+    assert values[file, "Sheet1", "$B$3:$C$6"] == [
+        [32, 33], [42, 43], [None, None], [None, None]]
+    assert values[file, "Other", "$B$2"] == [["b2"]]
+    with pytest.raises(ValueError, match="The sheet 'Missing' does not"):
+        read_cellranges([(file, "Missing", "$A$1")])
+
+    e2v.Subscripts.set({"dim": ["A", "B", "C"], "dim2": ["X", "Y"]})
+    os.chdir(tmp_path)
+    info = {
+        "type": "constants", "dims": ["dim", "dim2"], "cell": "A1",
+        "file": "inputs.xlsx", "sheet": "Sheet1",
+        "dimensions": {"dim": ["row", 1], "dim2": ["col", 2]}}
+
+    preview = get_preview("var", info, n=1)
+    assert preview['n_equations'] == preview['n_cellranges'] == 2
+    assert preview['cellranges'] == [
+        ("var_X", "inputs.xlsx", "Sheet1", "Sheet1!$A$1:$A$3")]
+    assert preview['corners'] == [(11, 31)]
+    # only the corner cells are read
+    spy = mocker.spy(e2v.utils.reader, "_read_box")
+    get_preview("var", info, n=1)
+    assert [call.args[1:] for call in spy.call_args_list] == [
+        (1, 1, 1, 1), (3, 1, 3, 1)]
+    assert preview['equations'][0].startswith("var[dim, X]")
+    text = format_preview(preview)
+    assert "Equations (1 of 2)" in text
+    assert "var_X: 'inputs.xlsx' Sheet1!$A$1:$A$3 [11 ... 31]" in text
+
+    # the values are not read
+    assert 'corners' not in get_preview("var", info, values=False)
+    # error when reading the values
+    preview = get_preview("var", dict(info, sheet="Missing"))
+    assert preview['n_cellranges'] == 2
+    assert "does not exist" in preview['values_error']
+    assert "Cannot read the values" in format_preview(preview)
+
+
+def test_read(tmp_path):
+    """
+    Test the reading of the values of the variables
+    """
+    import json
+    import numpy as np
+    from openpyxl import Workbook
+    from excels2vensim.utils.generator import generate_project
+
+    os.chdir(tmp_path)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "S1"
+    ws.append(["time", 2000, 2001, 2002])
+    ws.append(["A", 1, 2, 3])
+    ws.append(["B", 4, None, 6])
+    wb.create_sheet("S2").append([None, 10, 20])
+    wb["S2"].append([None, 30, "text"])
+    wb.save("inputs.xlsx")
+
+    e2v.Subscripts.set({"dim": ["A", "B"], "dim2": ["X", "Y"]})
+
+    # series along col, dim along row
+    obj = e2v.Data("var", ["dim"], "B2", units="m", file="inputs.xlsx",
+                   sheet="S1")
+    obj.add_time("time", "B1", "col", 3)
+    obj.add_dimension("dim", "row")
+    array = obj.read()
+    assert array.name == "var" and array.attrs["units"] == "m"
+    assert array.dims == ("time", "dim")
+    assert list(array.coords["time"].values) == [2000, 2001, 2002]
+    assert list(array.coords["dim"].values) == ["A", "B"]
+    assert np.array_equal(
+        array.values, [[1, 4], [2, np.nan], [3, 6]], equal_nan=True)
+
+    # transposed constants
+    obj = e2v.Constants("var", ["dim2", "dim"], "B2", file="inputs.xlsx",
+                        sheet="S1")
+    obj.add_dimension("dim", "row")
+    obj.add_dimension("dim2", "col")
+    array = obj.read()
+    assert array.dims == ("dim2", "dim")
+    assert np.array_equal(array.sel(dim="A").values, [1, 2])
+
+    # dimension along sheets with separated cells
+    obj = e2v.Constants("var", ["dim", "dim2"], "B1", file="inputs.xlsx")
+    obj.add_dimension("dim", "sheet", ["S1", "S2"])
+    obj.add_dimension("dim2", "row", 2)
+    assert np.array_equal(obj.read().values, [[2000, 4], [10, np.nan]],
+                          equal_nan=True)
+
+    # series along sheets with different values
+    obj = e2v.Data("var", ["dim"], "B2", file="inputs.xlsx")
+    obj.add_time("time", "B1", "col", 2)
+    obj.add_dimension("dim", "sheet", ["S1", "S2"])
+    with pytest.raises(ValueError, match="series 'time' of 'var' are"):
+        obj.read()
+
+    obj = e2v.Constants("var", ["dim"], "B2", file="inputs.xlsx",
+                        sheet="S2")
+    obj.add_dimension("dim", "col")
+    with pytest.raises(ValueError, match="Non-numeric values"):
+        obj.read()
+
+    # same values as the export
+    paths = generate_project(tmp_path / "project", n_vars=15, n_files=2,
+                             n_sheets=2, n_subranges=1, seed=5)
+    e2v.Subscripts.read(paths['model'])
+    os.chdir(tmp_path / "project")
+    with open(paths['config']) as file:
+        config = json.load(file)
+    e2v.export(config, "values.npz")
+    values = e2v.load_export("values.json")
+    for var, info in config.items():
+        array = e2v.excels2vensim._create_object(var, info).read()
+        assert list(array.dims) == values[var]['dims']
+        assert np.array_equal(array.values, values[var]['data'])
+
+
+def test_read_defined_names(tmp_path):
+    """
+    Test the reading of the defined names without openpyxl
+    """
+    from openpyxl import Workbook
+    from openpyxl.workbook.defined_name import DefinedName
+    from excels2vensim.utils.names import parse_reference
+
+    wb = Workbook()
+    wb.active.title = "S1"
+    wb.create_sheet("My sheet")
+    wb["S1"].defined_names.add(
+        DefinedName("local1", attr_text="S1!$B$3:$D$7", localSheetId=0))
+    wb["My sheet"].defined_names.add(
+        DefinedName("local2", attr_text="'My sheet'!$A$1", localSheetId=1))
+    wb.defined_names.add(DefinedName("global", attr_text="S1!$AB$2:$AC$9"))
+    wb.save(tmp_path / "names.xlsx")
+
+    assert sorted(e2v.read_defined_names(tmp_path / "names.xlsx")) == [
+        ("global", None, "S1!$AB$2:$AC$9"),
+        ("local1", "S1", "S1!$B$3:$D$7"),
+        ("local2", "My sheet", "'My sheet'!$A$1")]
+
+    assert parse_reference("S1!$B$3:$D$7") == ("S1", 3, 2, 7, 4)
+    assert parse_reference("'It''s'!A1") == ("It's", 1, 1, 1, 1)
+    assert parse_reference("S1!$B$3,S1!$C$3") is None
+    assert parse_reference("#REF!") is None
+
+    with open(tmp_path / "names.xls", "w") as file:
+        file.write("not a zip file")
+    with pytest.raises(ValueError, match="Only Office Open XML"):
+        e2v.read_defined_names(tmp_path / "names.xls")